@@ -11,72 +11,333 @@ This is the beezeebot_cli module that handles command-line argument parsing and
 """
 
 import argparse
+import math
+import os
+import time
 
-from components.xcode import Xcode
-from components.brew import Brew
-from components.asdf import Asdf
+from components.registry import ComponentRegistry
 
-# Homebrew
-def get_brew_version_msg():
-    """Get the version of the Homebrew utility."""
-    result = Brew.get_homebrew_version()
-    if result['success']:
-        msg = "version: " + result['stdout']
+# Version
+def get_version_msg(app, refresh=False, cwd=None):
+    """Get the version of the specified utility or application. 'cwd' is the directory whose asdf versions apply."""
+    if app.startswith("asdf:"):
+        return get_plugin_version_msg(app, refresh, cwd)
+    if not ComponentRegistry.is_registered(app):
+        return f"Version function for '{app}' is not supported."
+    component = ComponentRegistry.get(app)
+    result = component.check_version(refresh)
+    if result.success:
+        msg = "version: " + result.stdout
     else:
-        msg = "Homebrew is not installed. \nInstall using this command: beezeebot_cli.py -i brew"
+        msg = component.NOT_INSTALLED_MSG
     return msg
 
-def install_brew():
-    """Install the Homebrew utility."""
-    print("Installing foo... (this is pseudocode for the installation process)")
-
-# Xcode Command-Line Tools
-def get_xcode_select_version_msg():
-    """Get the version of the Xcode command-line interface tools utility."""
-    result = Xcode.get_command_line_tools_version()
-    if result['success']:
-        msg = "version: " + result['stdout']
-    else:
-        msg = "Xcode command-line tools are not installed. \nInstall using this command: beezeebot_cli.py -i xcode-select"
+def get_plugin_version_msg(target, refresh=False, cwd=None):
+    """
+    Gets the installed and current versions of an asdf plugin and the newest version it can install, for a target such as
+    'asdf:python' or 'asdf:python@latest:3.12'. The current version is the one that applies in 'cwd' (default: the
+    current directory).
+    """
+    plugin_name, _, spec = target[len("asdf:"):].partition("@")
+    spec = spec or "latest"
+    asdf = ComponentRegistry.get("asdf")
+    if plugin_name not in asdf.PLUGINS:
+        return f"Version function for '{target}' is not supported."
+    installed = asdf.get_plugin_versions(plugin_name, refresh)
+    current = asdf.get_current_versions([plugin_name], cwd)[plugin_name]
+    current_fields = current.stdout.splitlines()[-1].split() if current.success and current.stdout else []
+    available = asdf.get_available_version(plugin_name, spec, refresh)
+    lines = [
+        "installed: " + (", ".join(installed.stdout.split()) if installed.success and installed.stdout else "none"),
+        "current: " + (current_fields[1] if len(current_fields) > 1 else "none"),
+        f"available ({spec}): " + (available.stdout if available.success else available.stderr),
+    ]
+    msg = "\n".join(lines)
     return msg
 
-def install_xcode_select():
-    """Install the Xcode command-line interface tools utility."""
-    print("Installing Xcode command-line interface tools... (this is pseudocode for the installation process)")
+# Install
+def install_targets(targets):
+    """
+    Installs the specified utilities and applications along with their prerequisites.
+    Independent steps run in parallel; a failed step only stops the steps that depend on it.
+    Install output is shown live, prefixed with the step name, and the full output of each step is kept in the log directory.
+    Steps that fail with a network error are retried. If the run is interrupted or a step fails, the next run of the same
+    targets skips the steps this one completed (see InstallJournal).
+    asdf plugin targets may name a version spec, e.g. 'asdf:python@latest:3.12' (see Asdf.install_plugin()).
+    """
+    # Imported here so that other commands do not pay for loading the scheduler.
+    from components.install_journal import InstallJournal
+    from components.install_scheduler import InstallScheduler
+    from components.utils.probe_cache import ProbeCache
 
-def get_asdf_version_msg(): 
-    """Get the version of the asdf programming language version manager."""
-    result = Asdf.get_asdf_version()
-    if result['success']:
-        msg = "version: asdf " + result['stdout']
+    versions = {}
+    for index, target in enumerate(targets):
+        name, _, spec = target.partition("@")
+        if spec:
+            if not name.startswith("asdf:"):
+                print(f"Versions can only be chosen for asdf plugins, not for '{name}'.")
+                return
+            versions[name] = spec
+            targets[index] = name
+
+    log_dir = os.path.join(ProbeCache.cache_dir(), "logs")
+    try:
+        results = InstallScheduler.run(
+            targets,
+            steps=InstallScheduler.default_steps(
+                on_output=lambda name, line: print(f"[{name}] {line}", flush=True),
+                log_dir=log_dir,
+                versions=versions
+            ),
+            on_status=lambda name, status: print(f"  {name}: {status}"),
+            journal=InstallJournal()
+        )
+    except ValueError as e:
+        print(e)
+        return
+    failed = [name for name, result in results.items() if result['status'] in (InstallScheduler.FAILED, InstallScheduler.TIMED_OUT)]
+    for name in failed:
+        print(f"Installation of '{name}' failed. Error: {results[name]['stderr']}")
+    if failed:
+        print(f"Full install logs are in {log_dir}")
+
+# Manifest
+def get_plan_msg(path):
+    """
+    Lists the install steps a manifest needs, prerequisites included, and which of them are already satisfied.
+    Checks read versions from disk or the probe cache, so nothing is installed or booted.
+    """
+    from components.manifest import Manifest
+
+    try:
+        manifest = Manifest.load(path)
+        planned = manifest.plan()
+    except ValueError as e:
+        return str(e)
+    pending = [name for name, action, _ in planned if action == Manifest.INSTALL]
+    if pending:
+        header = f"{len(pending)} of {len(planned)} steps to run for {path}:"
     else:
-        msg = "asdf is not installed. \nInstall using this command: beezeebot_cli.py -i asdf"
+        header = f"Nothing to do: all {len(planned)} steps of {path} are satisfied."
+    lines = [header] + [f"  {action:<8} {name}: {reason}" for name, action, reason in planned]
+    msg = "\n".join(lines)
     return msg
 
-def install_asdf():
-    """Install the asdf programming language version manager."""
-    print("Installing asdf... (this is pseudocode for the installation process)")
-    
-# MacOS version
-def get_macos_version_msg():
-    """Get the version of the macOS operating system."""
-    print("Getting macOS version... (this is pseudocode for the version check)")
+def converge_manifest(path):
+    """Installs the steps of a manifest that are not satisfied yet; satisfied steps only cost their check."""
+    from components.manifest import Manifest
+
+    try:
+        manifest = Manifest.load(path)
+    except ValueError as e:
+        print(e)
+        return
+    install_targets(manifest.install_targets())
+
+# Plugins
+def install_plugins(app, plugins):
+    """
+    Installs several plugins of a utility at once (e.g. Homebrew plugins with a single 'brew install' command,
+    asdf plugins in parallel). Prints the outcome for each plugin.
+    """
+    if not ComponentRegistry.is_registered(app):
+        print(f"Installation function for '{app}' is not supported.")
+        return
+    results = ComponentRegistry.get(app).install_plugins(
+        plugins,
+        on_output=lambda name, line: print(f"[{name}] {line}", flush=True)
+    )
+    for plugin, result in results.items():
+        if result.success:
+            print(f"  {app} {plugin}: installed")
+        else:
+            print(f"  {app} {plugin}: failed ({result.stderr.splitlines()[-1] if result.stderr else 'unknown error'})")
 
 # Options
 def get_options_msg():
     """Lists the options of which utilities and applications are available."""
-    options = [
-        "  brew: Homebrew package manager",
-        "  xcode-select: Xcode command-line tools",
-        "  asdf: programming language version manager"
-    ]
-    msg = "Available options for --version and --install parameters:\n" + "\n".join(options)
+    options = [f"  {name}: {ComponentRegistry.description(name)}" for name in ComponentRegistry.names()]
+    msg = (
+        "Available options for --version and --install parameters:\n" + "\n".join(options)
+        + "\nPlugins are installed with --plugin APPLICATION PLUGIN, or as install targets such as 'asdf:python'."
+    )
     return msg
 
 # Scan
-def scan():
-    """Scans the computer for installed utilities and applications."""
-    print("Scanning for applications... (this is pseudocode for scanning)")
+def get_scan_msg(refresh=False, diff=False):
+    """
+    Scans the computer for installed utilities and applications, probing all of them at the same time.
+    With 'diff', only the changes since the previous scan are listed.
+    """
+    from components.scanner import Scanner
+    from components.inventory_snapshot import InventorySnapshot
+
+    previous = InventorySnapshot.load() if diff else None
+    inventory = Scanner.scan(refresh=refresh)
+    if diff:
+        return get_diff_msg(previous, InventorySnapshot.load())
+    lines = ["Scan results:"]
+    for name, result in inventory.items():
+        if result.success:
+            # Only the first line of output is shown, e.g. 'Homebrew 4.4.24'.
+            lines.append(f"  {name}: {result.first_line() or 'installed'}")
+        elif result.timed_out:
+            lines.append(f"  {name}: timed out")
+        else:
+            lines.append(f"  {name}: not found ({result.stderr})")
+    msg = "\n".join(lines)
+    return msg
+
+def get_diff_msg(previous, current):
+    """Lists the changes between two inventory snapshots, e.g. '  brew: Homebrew 4.4.23 -> Homebrew 4.4.24'."""
+    if previous is None:
+        return "No previous scan to compare with; run --scan --diff again later to see what changed."
+    from components.inventory_snapshot import InventorySnapshot
+
+    since = time.strftime("%Y-%m-%d %H:%M", time.localtime(previous.created))
+    changes = InventorySnapshot.diff(previous, current) if current is not None else []
+    if not changes:
+        return f"No changes since the scan of {since}."
+    lines = [f"Changes since the scan of {since}:"]
+    for name, before, after in changes:
+        if before is None:
+            lines.append(f"+ {name}: {after}")
+        elif after is None:
+            lines.append(f"- {name}: {before}")
+        else:
+            lines.append(f"  {name}: {before} -> {after}")
+    msg = "\n".join(lines)
+    return msg
+
+# Software updates
+def format_age(seconds):
+    """Returns a rough age such as 'just now', '5 minutes ago' or '2 days ago'."""
+    for unit, size in (("day", 86400), ("hour", 3600), ("minute", 60)):
+        if seconds >= size:
+            count = int(seconds // size)
+            return f"{count} {unit}{'s' if count > 1 else ''} ago"
+    return "just now"
+
+def get_updates_msg(refresh=False):
+    """
+    Lists the available macOS software updates from the last background check, saying how old it is.
+    A new check starts in the background when the result is older than a day (or with 'refresh'), so this never waits.
+    """
+    from components.software_updates import SoftwareUpdates
+
+    result = SoftwareUpdates().check(refresh)
+    if result is None:
+        return "Could not start a software update check."
+    if "checked" not in result:
+        if result["running"]:
+            lines = ["Checking for software updates in the background; run --updates again in a few minutes."]
+        else:
+            lines = ["No software update check has succeeded yet."]
+    else:
+        freshness = "checked " + format_age(result["age"]) + (", a new check is running" if result["running"] else "")
+        updates = result["updates"]
+        if not updates:
+            lines = [f"No software updates available ({freshness})."]
+        else:
+            lines = [f"{len(updates)} software updates available ({freshness}):"]
+            for update in updates:
+                details = [update["version"] or "unknown version"]
+                if update["size_kib"]:
+                    details.append(f"{update['size_kib'] / 1024 / 1024:.1f} GiB" if update["size_kib"] >= 1024 * 1024 else f"{update['size_kib'] // 1024} MiB")
+                if update["recommended"]:
+                    details.append("recommended")
+                if update["restart"]:
+                    details.append("restart required")
+                lines.append(f"  {update['title']} ({', '.join(details)})")
+    if result.get("error") and result.get("failed", 0) >= result.get("checked", 0):
+        lines.append(f"The last check failed {format_age(time.time() - result['failed'])}: {result['error']}")
+        if not result["running"]:
+            # A failed check is not retried automatically before SoftwareUpdates.RETRY_AFTER_FAILURE has passed.
+            minutes = math.ceil((result["failed"] + SoftwareUpdates.RETRY_AFTER_FAILURE - time.time()) / 60)
+            retry = f"The next check starts automatically in {minutes} minute{'s' if minutes > 1 else ''}; " if minutes > 0 else ""
+            lines.append(retry + "run --updates --refresh to check now.")
+    msg = "\n".join(lines)
+    return msg
+
+# Fleet
+def get_ingest_msg(paths, store_path=None):
+    """Loads scan snapshots of many machines into the fleet store."""
+    from components.fleet_store import FleetStore
+
+    store = FleetStore(store_path)
+    errors = []
+    try:
+        counts = store.ingest(paths, errors=errors)
+        hosts = store.host_count()
+    finally:
+        store.close()
+    msg = f"Ingested {counts['ingested']} snapshots ({counts['skipped']} older or duplicate, {counts['invalid']} invalid); the store has {hosts} hosts."
+    msg = "\n".join(errors + [msg])
+    return msg
+
+def get_query_msg(query, store_path=None):
+    """Answers a query about the fleet store, e.g. 'hosts asdf:python < 3.11' or 'histogram brew'."""
+    from components.fleet_store import FleetStore
+
+    store = FleetStore(store_path)
+    try:
+        kind, rows = store.query(query)
+    finally:
+        store.close()
+    if not rows:
+        return "No matching hosts."
+    if kind == "histogram":
+        width = max(len(version) for version, _ in rows)
+        largest = max(count for _, count in rows)
+        lines = [f"{version:<{width}} {count:>6} {'#' * max(1, round(40 * count / largest))}" for version, count in rows]
+    else:
+        width = max(len(host) for host, _ in rows)
+        lines = [f"{host:<{width}} {value or ''}".rstrip() for host, value in rows]
+    msg = "\n".join(lines)
+    return msg
+
+# Daemon
+def daemon_handlers():
+    """Returns the commands the daemon answers, as a dictionary of command name to a function of the request arguments."""
+    return {
+        # The current asdf versions depend on the client's directory, which the daemon does not share.
+        "version": lambda args: get_version_msg(args["app"], args.get("refresh", False), args.get("cwd")),
+        "options": lambda args: get_options_msg(),
+        "scan": lambda args: get_scan_msg(args.get("refresh", False), args.get("diff", False)),
+        "updates": lambda args: get_updates_msg(args.get("refresh", False)),
+    }
+
+def ask_daemon(command, args=None):
+    """
+    Returns the daemon's answer to a command, or None if no daemon answered and the command must run in-process.
+    Set BEEZEEBOT_NO_DAEMON=1 to always run in-process.
+    """
+    if os.environ.get("BEEZEEBOT_NO_DAEMON"):
+        return None
+    from components.daemon import Daemon
+    return Daemon.request(command, args)
+
+def get_daemon_msg(action):
+    """Runs ('run'), stops or reports the status of the daemon."""
+    from components.daemon import Daemon
+
+    if action == "status":
+        pid = Daemon.request("ping", timeout=Daemon.CONNECT_TIMEOUT)
+        return f"The daemon is running (pid {pid}) on {Daemon.socket_path()}." if pid else "The daemon is not running."
+    if action == "stop":
+        return "The daemon stopped." if Daemon.stop() else "The daemon is not running."
+    daemon = Daemon(daemon_handlers())
+    try:
+        daemon.bind()
+    except OSError as e:
+        return f"Cannot start the daemon: {e}"
+    print(f"Listening on {daemon.path}; stop with --daemon stop.", flush=True)
+    try:
+        daemon.serve()
+    except KeyboardInterrupt:
+        pass
+    msg = "The daemon stopped."
+    return msg
 
 # Command-line argument parsing
 def parse_command_line_args():
@@ -85,11 +346,12 @@ def parse_command_line_args():
     
     Supported command-line arguments:
       -h, --help                 : Displays this help message.
-      -i, --install APPLICATION  : Installs the specified utility or application.
+      -i, --install APPLICATION [APPLICATION ...]
+                                 : Installs the specified utilities or applications and their prerequisites.
       -v, --version APPLICATION  : Retrieves the version of the specified utility or application.
       -l, --list TYPE            : Lists either 'installed' utilities / applications, or the 'options' of which are available.
       -p, --plugin APPLICATION 
-                   PLUGIN        : Installs the specified utility or app plugin.
+                   PLUGIN [PLUGIN ...] : Installs the specified utility or app plugins.
     """
     parser = argparse.ArgumentParser(
         description="BeeZeeBot is an AI utility and application configurator. If you have ever tried to install an Ollama model and run a chat interface for the first time on your Mac, you know that it's a multi-step process with configuration and some technical decisions. Rather than all that hassle, BeeZeeBot will handle all the dependencies for you so you don't have to type in 15 command-line instructions just to get something installed and ready to use. Whether you're an experienced developer or you have no idea how to use the command line, BeeZeeBot is here to help you get set up with AI apps, data science tools, and it will even configure a software development environment for Python, Ruby, or C++ using VS Code."
@@ -100,19 +362,30 @@ def parse_command_line_args():
 
     group.add_argument(
         '-i', '--install',
+        nargs='+',
         metavar='APPLICATION',
-        help='Install the specified utility or application.'
+        help='Install the specified utilities or applications, along with their prerequisites.'
     )
     group.add_argument(
         '-v', '--version',
         metavar='APPLICATION',
-        help='Get the version of the specified utility or application.'
+        help="Get the version of the specified utility or application. For asdf plugins such as 'asdf:python@latest:3.12', also show the newest version that can be installed."
     )
     group.add_argument(
         '-p', '--plugin',
-        nargs=2,
+        nargs='+',
         metavar=('APPLICATION', 'PLUGIN'),
-        help='Install the plugin for the specified utility or application.'
+        help='Install one or more plugins for the specified utility or application, e.g. -p asdf python nodejs.'
+    )
+    group.add_argument(
+        '--plan',
+        metavar='MANIFEST',
+        help='Compare a TOML manifest of components, plugins and asdf versions with this computer and list the install steps still needed.'
+    )
+    group.add_argument(
+        '--converge',
+        metavar='MANIFEST',
+        help='Install what a TOML manifest asks for that this computer is missing, skipping the steps already satisfied.'
     )
     group.add_argument(
         '-o', '--options',
@@ -124,47 +397,140 @@ def parse_command_line_args():
         action='store_true',
         help='Scans the computer for installed utilities and applications.'
     )
+    group.add_argument(
+        '-u', '--updates',
+        action='store_true',
+        help='List the available macOS software updates found by the last background check, which runs again when older than a day.'
+    )
+    group.add_argument(
+        '--daemon',
+        choices=['run', 'stop', 'status'],
+        help='Run a resident daemon that answers --version, --scan, --options and --updates in milliseconds, stop it, or show whether it is running.'
+    )
+    group.add_argument(
+        '--ingest',
+        nargs='+',
+        metavar='PATH',
+        help='Load scan snapshots of other machines (snapshot.json files, JSON-lines files, directories of them, or - for standard input) into the fleet store.'
+    )
+    group.add_argument(
+        '--query',
+        nargs='+',
+        metavar='WORD',
+        help="Query the fleet store: 'hosts COMPONENT [OP VERSION]', 'missing COMPONENT' or 'histogram COMPONENT', e.g. --query hosts asdf:python '<' 3.11."
+    )
     
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Ignore cached version results and query every utility again (used with --version and --scan), or start a new software update check (used with --updates).'
+    )
+
+    parser.add_argument(
+        '--diff',
+        action='store_true',
+        help='List only what changed since the previous scan (used with --scan).'
+    )
+
+    parser.add_argument(
+        '--no-daemon',
+        action='store_true',
+        help='Run the command in this process even if a daemon is running.'
+    )
+
+    parser.add_argument(
+        '--store',
+        metavar='FILE',
+        help='The fleet store database used by --ingest and --query (default: fleet.sqlite3 in the beezeebot cache directory).'
+    )
+
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        metavar='SECONDS',
+        help='Stop every command that is still running after this many seconds (applies to the whole run).'
+    )
+
+    parser.add_argument(
+        '--trace',
+        metavar='FILE',
+        help='Write a timing span for every command and install step to FILE as Chrome trace JSON (open it in ui.perfetto.dev).'
+    )
+
+    parser.add_argument(
+        '--timings',
+        action='store_true',
+        help='Print the time, CPU time and peak memory used by each command when done.'
+    )
+
     args = parser.parse_args()
-    
-    # Route the command to the proper functions.
+    if args.timeout is not None:
+        from components.utils.subproc import Subproc
+        Subproc.set_deadline(args.timeout)
+
+    tracing = args.trace is not None or args.timings
+    if tracing:
+        from components.utils.tracing import Tracer
+        Tracer.enable()
+    try:
+        route_command(parser, args)
+    finally:
+        if tracing:
+            Tracer.disable()
+            if args.trace:
+                Tracer.write_chrome_trace(args.trace)
+            if args.timings:
+                print(Tracer.format_timings())
+
+def route_command(parser, args):
+    """
+    Routes the parsed command-line arguments to the proper functions.
+    --version, --options, --scan and --updates are answered by the daemon if one is running, unless the run is timed, traced or
+    bounded by --timeout, which only apply to commands run in this process.
+    """
+    use_daemon = not (args.no_daemon or args.timeout is not None or args.trace is not None or args.timings)
     if args.install:
-        app = args.install.lower()
-        if app == 'brew':
-            install_brew()
-        elif app == 'xcode-select':
-            install_xcode_select()
-        else:
-            print(f"Installation function for '{app}' is not supported.")
+        install_targets([app.lower() for app in args.install])
     
     elif args.version:
         app = args.version.lower()
-        if app == 'brew':
-            print(get_brew_version_msg())
-        elif app == 'xcode-select':
-            print(get_xcode_select_version_msg())
-        elif app == 'asdf':
-            get_asdf_version_msg()
-        elif app == 'macos':
-            get_macos_version_msg()
-        else:
-            print(f"Version function for '{app}' is not supported.")
+        output = ask_daemon("version", {"app": app, "refresh": args.refresh, "cwd": os.getcwd()}) if use_daemon else None
+        print(output if output is not None else get_version_msg(app, args.refresh))
 
     elif args.plugin:
-        app = args.plugin[0].lower()
-        plugin = args.plugin[1].lower()
-        if app == 'brew':
-            install_brew_plugin(plugin)
-        if app == 'asdf':
-            install_brew_plugin(plugin)
-        else:
-            print(f"Installation function for '{app}' is not supported.")
+        if len(args.plugin) < 2:
+            parser.error("argument -p/--plugin: expected an APPLICATION followed by at least one PLUGIN")
+        install_plugins(args.plugin[0].lower(), [plugin.lower() for plugin in args.plugin[1:]])
     
+    elif args.plan:
+        print(get_plan_msg(args.plan))
+
+    elif args.converge:
+        converge_manifest(args.converge)
+
     elif args.options:
-            print(get_options_msg())
+        output = ask_daemon("options") if use_daemon else None
+        print(output if output is not None else get_options_msg())
 
     elif args.scan:
-            scan()        
+        output = ask_daemon("scan", {"refresh": args.refresh, "diff": args.diff}) if use_daemon else None
+        print(output if output is not None else get_scan_msg(args.refresh, args.diff))
+
+    elif args.updates:
+        output = ask_daemon("updates", {"refresh": args.refresh}) if use_daemon else None
+        print(output if output is not None else get_updates_msg(args.refresh))
+
+    elif args.daemon:
+        print(get_daemon_msg(args.daemon))
+
+    elif args.ingest:
+        print(get_ingest_msg(args.ingest, args.store))
+
+    elif args.query:
+        try:
+            print(get_query_msg(" ".join(args.query), args.store))
+        except ValueError as e:
+            parser.error(f"argument --query: {e}")
 
     else:
         parser.print_help()
@@ -0,0 +1,48 @@
+# -*- mode: python ; coding: utf-8 -*-
+#
+# Fast-start build: 'pyinstaller beezeebot_cli_onedir.spec' writes dist/beezeebot_cli/.
+# Unlike the --onefile build, nothing is unpacked to a temporary directory on every run, and UPX is off so the
+# shared libraries do not have to be decompressed at launch.
+
+
+a = Analysis(
+    ['beezeebot_cli.py'],
+    pathex=[],
+    binaries=[],
+    datas=[],
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=['tkinter', 'unittest', 'pydoc', 'doctest'],
+    noarchive=False,
+    optimize=2,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='beezeebot_cli',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    console=True,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='beezeebot_cli',
+)
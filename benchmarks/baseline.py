@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the benchmarks.baseline module that summarizes timings and compares benchmark results with a saved baseline.
+
+A result is a dictionary of metric name to summary. A summary holds 'median_ms' for timings or 'peak_kib' for memory;
+a metric regresses when that value exceeds the baseline by the tolerance (a fraction) plus a small absolute slack
+that keeps very fast metrics from flagging noise.
+"""
+
+import json
+import platform
+import statistics
+
+DEFAULT_TOLERANCE = 0.25
+
+# Absolute slack per compared value, added on top of the relative tolerance.
+SLACK = {
+    "median_ms": 5.0,
+    "peak_kib": 256.0,
+}
+
+def summarize(times):
+    """Returns the median and 90th percentile of a list of timings in milliseconds."""
+    ordered = sorted(times)
+    return {
+        "median_ms": round(statistics.median(ordered), 2),
+        "p90_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))], 2),
+        "runs": len(ordered),
+    }
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Returns a list of messages for the metrics that regressed against the baseline."""
+    regressions = []
+    for name, summary in results.items():
+        reference = baseline.get("metrics", {}).get(name)
+        if reference is None:
+            continue
+        for key, slack in SLACK.items():
+            if key not in summary or key not in reference:
+                continue
+            limit = reference[key] * (1 + tolerance) + slack
+            if summary[key] > limit:
+                regressions.append(f"{name}: {key} {summary[key]:.1f} > limit {limit:.1f} (baseline {reference[key]:.1f})")
+    return regressions
+
+def load(path):
+    """Returns the saved baseline, or None if the file does not exist."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except OSError:
+        return None
+
+def save(path, results, **details):
+    """Writes the results as a baseline, together with the Python version, the platform and any details given."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            **details,
+            "metrics": results,
+        }, f, indent=2)
+        f.write("\n")
+
+def print_table(results):
+    """Prints the results as a table of metric name and summary values."""
+    for name, summary in results.items():
+        values = "  ".join(f"{key} {value}" for key, value in summary.items())
+        print(f"{name:<16} {values}")
+
+def report(results, path, save_baseline=False, check=False, tolerance=DEFAULT_TOLERANCE, **details):
+    """
+    Prints the results, optionally saves them as the baseline and checks them against it.
+
+    Returns:
+        The exit status: 1 if a check found a regression or no baseline, otherwise 0.
+    """
+    print_table(results)
+    if save_baseline:
+        save(path, results, **details)
+        print(f"Baseline saved to {path}")
+    if not check:
+        return 0
+    baseline = load(path)
+    if baseline is None:
+        print(f"No baseline at {path}; run with --save-baseline first.")
+        return 1
+    regressions = compare(results, baseline, tolerance)
+    for message in regressions:
+        print("REGRESSION", message)
+    if regressions:
+        return 1
+    print("No regressions against the baseline.")
+    return 0
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the benchmarks.bench_startup module that measures the cold-start cost of the CLI.
+
+Metrics (each one is the wall time of a fresh process, repeated and summarized as median and p90):
+    - interpreter: 'python -c pass', the floor that no change to beezeebot can lower.
+    - import: 'python -c "import beezeebot_cli"' from the source tree.
+    - help: '<cli> -h', the time until argparse has printed the help text.
+    - first_probe: '<cli> -v brew --refresh' against a stub 'brew' on PATH that answers instantly.
+
+The CLI under test defaults to 'python beezeebot_cli.py' and can be any build, e.g. --cli dist/beezeebot_cli or
+--cli dist/beezeebot_cli.pyz. Results can be saved as a baseline and later checked against it:
+
+    python benchmarks/bench_startup.py --save-baseline
+    python benchmarks/bench_startup.py --check
+"""
+
+import argparse
+import os
+import shlex
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks import baseline
+
+DEFAULT_BASELINE = os.path.join(PROJECT_ROOT, "benchmarks", "startup_baseline.json")
+
+def time_command(command, runs, env=None):
+    """Runs the command 'runs' times (after one warm-up run) and returns the wall times in milliseconds."""
+    subprocess.run(command, env=env, cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, env=env, cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+def make_probe_env(temp_dir):
+    """Returns an environment with an instant stub 'brew' first on PATH and an empty beezeebot cache."""
+    bin_dir = os.path.join(temp_dir, "bin")
+    os.makedirs(bin_dir)
+    stub = os.path.join(bin_dir, "brew")
+    with open(stub, "w") as f:
+        f.write("#!/bin/sh\necho 'Homebrew 4.4.24'\n")
+    os.chmod(stub, 0o755)
+    env = dict(os.environ)
+    env["PATH"] = bin_dir + os.pathsep + env.get("PATH", "")
+    env["BEEZEEBOT_CACHE_DIR"] = os.path.join(temp_dir, "cache")
+    env["HOMEBREW_REPOSITORY"] = os.path.join(temp_dir, "no-homebrew-repository")
+    return env
+
+def run_benchmarks(cli, runs):
+    """Measures every metric and returns a dictionary of metric name to summary."""
+    python = [sys.executable]
+    results = {
+        "interpreter": baseline.summarize(time_command(python + ["-c", "pass"], runs)),
+        "import": baseline.summarize(time_command(python + ["-c", "import beezeebot_cli"], runs)),
+        "help": baseline.summarize(time_command(cli + ["-h"], runs)),
+    }
+    with tempfile.TemporaryDirectory() as temp_dir:
+        results["first_probe"] = baseline.summarize(time_command(cli + ["-v", "brew", "--refresh"], runs, make_probe_env(temp_dir)))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the cold-start cost of the beezeebot CLI.")
+    parser.add_argument('--cli', default=None, help="The CLI command to measure (default: the Python interpreter running beezeebot_cli.py).")
+    parser.add_argument('--runs', type=int, default=20, help="Timed runs per metric (default: 20).")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="The baseline file (default: benchmarks/startup_baseline.json).")
+    parser.add_argument('--save-baseline', action='store_true', help="Save the results as the new baseline.")
+    parser.add_argument('--check', action='store_true', help="Exit with status 1 if a metric regressed against the baseline.")
+    parser.add_argument('--tolerance', type=float, default=baseline.DEFAULT_TOLERANCE, help="Allowed slowdown as a fraction of the baseline (default: 0.25).")
+    args = parser.parse_args()
+
+    cli = shlex.split(args.cli) if args.cli else [sys.executable, os.path.join(PROJECT_ROOT, "beezeebot_cli.py")]
+    results = run_benchmarks(cli, args.runs)
+    return baseline.report(results, args.baseline, args.save_baseline, args.check, args.tolerance,
+                           cli=args.cli or "python beezeebot_cli.py")
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the benchmarks.bench_toolchain module that measures the component modules against a fake toolchain
+(see benchmarks.fake_toolchain), so real processes are spawned on any POSIX machine.
+
+Metrics:
+    - scan_cold: Scanner.scan(refresh=True), every probe runs a stub.
+    - scan_warm: Scanner.scan() after a cold scan, so cacheable probes come from the probe cache.
+    - install_plan: InstallScheduler.run() of every default step; nothing is installed yet, so each plugin installs.
+    - memory: the peak of Python allocations (tracemalloc) during one scan and one install plan.
+The report also lists the stub processes spawned per scan and per install plan, and the install throughput in steps per second.
+
+    python benchmarks/bench_toolchain.py --latency 0.05 --output-bytes 65536
+    python benchmarks/bench_toolchain.py --save-baseline
+    python benchmarks/bench_toolchain.py --check
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from benchmarks import baseline
+from benchmarks.fake_toolchain import FakeToolchain
+from components.install_scheduler import InstallScheduler
+from components.scanner import Scanner
+
+DEFAULT_BASELINE = os.path.join(PROJECT_ROOT, "benchmarks", "toolchain_baseline.json")
+
+def time_call(function, runs):
+    """Calls the function 'runs' times and returns the wall times in milliseconds."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+def install_all():
+    """Runs every default install step and returns the results."""
+    steps = InstallScheduler.default_steps()
+    return InstallScheduler.run(list(steps), steps)
+
+def count_calls(toolchain, function):
+    """Returns the number of stub processes spawned by one call of the function."""
+    toolchain.reset_calls()
+    function()
+    return len(toolchain.calls())
+
+def peak_memory_kib(function):
+    """Returns the peak of Python allocations in KiB during one call of the function."""
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+def run_benchmarks(toolchain, runs):
+    """Measures every metric against an active fake toolchain and returns a dictionary of metric name to summary."""
+    scan_cold = lambda: Scanner.scan(refresh=True)
+    scan_warm = lambda: Scanner.scan()
+
+    # One warm-up scan fills the probe cache for scan_warm.
+    scan_warm()
+    results = {
+        "scan_cold": baseline.summarize(time_call(scan_cold, runs)),
+        "scan_warm": baseline.summarize(time_call(scan_warm, runs)),
+        "install_plan": baseline.summarize(time_call(install_all, runs)),
+    }
+    results["scan_cold"]["processes"] = count_calls(toolchain, scan_cold)
+    results["scan_warm"]["processes"] = count_calls(toolchain, scan_warm)
+    steps = len(InstallScheduler.default_steps())
+    results["install_plan"]["processes"] = count_calls(toolchain, install_all)
+    results["install_plan"]["steps_per_second"] = round(steps / (results["install_plan"]["median_ms"] / 1000), 1)
+    results["memory_scan"] = {"peak_kib": peak_memory_kib(scan_cold)}
+    results["memory_install"] = {"peak_kib": peak_memory_kib(install_all)}
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure scan latency, install throughput and memory against a fake toolchain.")
+    parser.add_argument('--runs', type=int, default=10, help="Timed runs per metric (default: 10).")
+    parser.add_argument('--latency', type=float, default=0.02, help="Seconds every stub call sleeps (default: 0.02).")
+    parser.add_argument('--output-bytes', type=int, default=4096, help="Output size of installs (default: 4096).")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="Probability that a stub call fails (default: 0).")
+    parser.add_argument('--brew-packages', type=int, default=200, help="Installed formulae reported by 'brew info' (default: 200).")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="The baseline file (default: benchmarks/toolchain_baseline.json).")
+    parser.add_argument('--save-baseline', action='store_true', help="Save the results as the new baseline.")
+    parser.add_argument('--check', action='store_true', help="Exit with status 1 if a metric regressed against the baseline.")
+    parser.add_argument('--tolerance', type=float, default=baseline.DEFAULT_TOLERANCE, help="Allowed slowdown as a fraction of the baseline (default: 0.25).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        toolchain = FakeToolchain(root, args.latency, args.output_bytes, args.failure_rate, args.brew_packages)
+        with toolchain.activate():
+            results = run_benchmarks(toolchain, args.runs)
+
+    return baseline.report(results, args.baseline, args.save_baseline, args.check, args.tolerance,
+                           latency=args.latency, output_bytes=args.output_bytes,
+                           failure_rate=args.failure_rate, brew_packages=args.brew_packages)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the benchmarks.fake_toolchain module that puts stub 'brew', 'asdf', 'xcode-select' and 'softwareupdate'
+executables on PATH, so the component modules spawn real processes on any POSIX machine (including Linux).
+
+Each stub is a /bin/sh script that:
+    - sleeps for the configured latency,
+    - fails with exit status 1 at the configured failure rate,
+    - answers the commands beezeebot runs with realistic output ('--version', 'info --json=v2 --installed', ...),
+    - prints 'output_bytes' of progress lines for installs and other commands,
+    - appends its command line to calls.log, so a benchmark can count the processes it spawned.
+
+Usage:
+    with FakeToolchain(root, latency=0.05, output_bytes=4096).activate():
+        Scanner.scan(refresh=True)
+"""
+
+import contextlib
+import json
+import os
+import shlex
+
+class FakeToolchain:
+    TOOLS = ["brew", "asdf", "xcode-select", "softwareupdate"]
+
+    SOFTWARE_UPDATE_HISTORY = (
+        "Display Name                                       Version    Date                  \n"
+        "------------                                       -------    ----                  \n"
+        "Command Line Tools for Xcode                       16.2       12/30/2024, 14:14:11  \n"
+        "macOS Sequoia 15.3.1                               15.3.1     02/20/2025, 02:19:30  \n"
+    )
+
+    def __init__(self, root, latency=0.0, output_bytes=0, failure_rate=0.0, brew_packages=0, installed=None):
+        """
+        Parameters:
+            root: the directory that receives the stubs (bin/), their canned output (data/) and calls.log.
+            latency: seconds every stub sleeps before answering.
+            output_bytes: approximate size of the output of installs and unrecognized commands.
+            failure_rate: the probability (0.0 to 1.0) that a stub call fails.
+            brew_packages: the number of extra installed formulae in 'brew info --json=v2 --installed'.
+            installed: names of Homebrew formulae reported as installed (default: none, so plugins get installed).
+        """
+        self.root = os.path.abspath(root)
+        self.latency = latency
+        self.output_bytes = output_bytes
+        self.failure_rate = failure_rate
+        self.brew_packages = brew_packages
+        self.installed = list(installed or [])
+        self.bin_dir = os.path.join(self.root, "bin")
+        self.data_dir = os.path.join(self.root, "data")
+        self.calls_log = os.path.join(self.root, "calls.log")
+
+    # Canned output
+
+    def progress_output(self, tool):
+        """Returns about 'output_bytes' of install-style progress lines."""
+        lines = []
+        size = 0
+        while size < self.output_bytes:
+            line = f"==> {tool}: step {len(lines) + 1} " + "." * 60
+            lines.append(line)
+            size += len(line) + 1
+        return "\n".join(lines)
+
+    def brew_info_json(self):
+        """Returns 'brew info --json=v2 --installed' output for the installed and filler formulae."""
+        names = self.installed + [f"fake-formula-{index}" for index in range(self.brew_packages)]
+        formulae = [{
+            "name": name,
+            "full_name": name,
+            "aliases": [],
+            "oldnames": [],
+            "versions": {"stable": "1.0.0"},
+            "installed": [{"version": "1.0.0"}],
+            "linked_keg": "1.0.0",
+            "outdated": False,
+        } for name in names]
+        return json.dumps({"formulae": formulae, "casks": []}, indent=2)
+
+    def responses(self):
+        """
+        Returns a dictionary of tool name to a list of (case pattern, output) pairs, in match order.
+        A pattern is a shell 'case' pattern matched against the stub's arguments joined by spaces.
+        """
+        progress = {tool: self.progress_output(tool) for tool in FakeToolchain.TOOLS}
+        return {
+            "brew": [
+                ('"--version"', "Homebrew 4.4.24"),
+                ('"info --json=v2 --installed"', self.brew_info_json()),
+                ('"outdated --json=v2"', json.dumps({"formulae": [], "casks": []})),
+                ('"list --versions "*', ""),
+                ('*', progress["brew"]),
+            ],
+            "asdf": [
+                ('"--version"', "v0.14.1"),
+                ('*" list"', "  3.12.1"),
+                ('*', progress["asdf"]),
+            ],
+            "xcode-select": [
+                ('"--version"', "xcode-select version 2409."),
+                ('*', progress["xcode-select"]),
+            ],
+            "softwareupdate": [
+                ('"--list"|"-l"', "Software Update Tool\n\nFinding available software\nNo new software available."),
+                ('"--history"', FakeToolchain.SOFTWARE_UPDATE_HISTORY),
+                ('*', progress["softwareupdate"]),
+            ],
+        }
+
+    # Stubs
+
+    def stub_script(self, tool, responses):
+        """Returns the /bin/sh source of the stub for a tool, whose canned outputs are data/<tool>-<index>.out."""
+        lines = [
+            "#!/bin/sh",
+            f"echo \"{tool} $*\" >> {shlex.quote(self.calls_log)}",
+        ]
+        if self.latency > 0:
+            lines.append(f"sleep {self.latency:g}")
+        if self.failure_rate > 0:
+            threshold = int(self.failure_rate * 65536)
+            lines += [
+                f"if [ \"$(od -An -N2 -tu2 /dev/urandom | tr -d ' ')\" -lt {threshold} ]; then",
+                f"    echo \"Error: simulated {tool} failure\" >&2",
+                "    exit 1",
+                "fi",
+            ]
+        lines.append('case "$*" in')
+        for index, (pattern, _) in enumerate(responses):
+            output = shlex.quote(os.path.join(self.data_dir, f"{tool}-{index}.out"))
+            lines.append(f"    {pattern}) cat {output} ;;")
+        lines.append("esac")
+        return "\n".join(lines) + "\n"
+
+    def create(self):
+        """Writes the stubs and their canned output under the root directory and returns self."""
+        os.makedirs(self.bin_dir, exist_ok=True)
+        os.makedirs(self.data_dir, exist_ok=True)
+        for tool, responses in self.responses().items():
+            for index, (_, output) in enumerate(responses):
+                with open(os.path.join(self.data_dir, f"{tool}-{index}.out"), "w", encoding="utf-8") as f:
+                    f.write(output + "\n" if output else "")
+            stub = os.path.join(self.bin_dir, tool)
+            with open(stub, "w", encoding="utf-8") as f:
+                f.write(self.stub_script(tool, responses))
+            os.chmod(stub, 0o755)
+        return self
+
+    def env(self, base=None):
+        """
+        Returns a copy of the environment ('base', default os.environ) with the stubs first on PATH, a private
+        beezeebot cache, and Homebrew and asdf locations that do not exist, so versions are probed by running the
+        stubs rather than read from disk.
+        """
+        env = dict(os.environ if base is None else base)
+        env["PATH"] = self.bin_dir + os.pathsep + env.get("PATH", "")
+        env["BEEZEEBOT_CACHE_DIR"] = os.path.join(self.root, "cache")
+        env["HOMEBREW_REPOSITORY"] = os.path.join(self.root, "no-homebrew-repository")
+        env["ASDF_DIR"] = os.path.join(self.root, "no-asdf")
+        env["ASDF_DATA_DIR"] = os.path.join(self.root, "no-asdf")
+        return env
+
+    @contextlib.contextmanager
+    def activate(self):
+        """Creates the stubs if needed and applies env() to os.environ for the duration of the block."""
+        if not os.path.isdir(self.bin_dir):
+            self.create()
+        saved = dict(os.environ)
+        os.environ.update(self.env())
+        try:
+            yield self
+        finally:
+            os.environ.clear()
+            os.environ.update(saved)
+
+    def calls(self):
+        """Returns the logged stub command lines, oldest first."""
+        try:
+            with open(self.calls_log, "r", encoding="utf-8") as f:
+                return f.read().splitlines()
+        except OSError:
+            return []
+
+    def reset_calls(self):
+        """Clears the call log."""
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.calls_log)
@@ -10,57 +10,190 @@ LICENSE file in the root directory of this source tree.
 This is the components.brew module that handles Homebrew actions. 
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from components.asdf_catalog import AsdfCatalog
+from components.brew import Brew
+from components.utils.artifact_cache import ArtifactCache
+from components.utils.command_result import CommandResult
+from components.utils.installable_component import InstallableComponent
 from components.utils.subproc import Subproc
+from components.utils.version_index import VersionIndex
+from components.version_files import VersionFiles
 
-class Asdf:
+class Asdf(InstallableComponent):
     # asdf plugins
     PLUGINS = ["python", "nodejs", "ruby"]
 
+    NOT_INSTALLED_MSG = "asdf is not installed. \nInstall using this command: beezeebot_cli.py -i asdf"
+
+    # Maximum number of plugins installed at the same time; language builds are CPU and disk heavy.
+    MAX_PARALLEL_INSTALLS = 3
+
+    def install(self, on_line=None, log_path=None):
+        """Install asdf, which is distributed as a Homebrew formula."""
+        return Brew.install_plugin("asdf", on_line, log_path)
+
+    def uninstall(self):
+        """Uninstalling asdf is not supported."""
+        return InstallableComponent.not_supported("Uninstalling asdf")
+
+    def check_version(self, refresh=False):
+        """Check the asdf version. See get_asdf_version()."""
+        return Asdf.get_asdf_version(refresh)
+
+    @staticmethod
+    def get_probes():
+        """
+        Returns the read-only commands used by the scanner to inventory asdf and its plugins as a list of
+        (name, command, timeout) tuples. A timeout of None means the scanner default is used.
+        """
+        probes = [("asdf", ["asdf", "--version"], None)]
+        for plugin_name in Asdf.PLUGINS:
+            probes.append((f"asdf:{plugin_name}", ["asdf", plugin_name, "list"], None))
+        return probes
+
     @staticmethod
-    def get_asdf_version():
+    def get_asdf_version(refresh=False):
         """
-        Executes the 'asdf --version' command and returns a dictionary with:
+        Executes the 'asdf --version' command and returns a CommandResult with:
             - success: True if command succeeds, False otherwise.
             - stdout: Standard output from the command.
             - stderr: Standard error output from the command.
+
+        Unless 'refresh' is True, the version is read from the asdf installation on disk, or the cached result
+        of the command is reused.
         """ 
 
-        result = Subproc.run_command(['asdf', '--version'])
+        if not refresh:
+            result = VersionFiles.asdf_version()
+            if result is not None:
+                return result
+
+        result = Subproc.run_version_command(['asdf', '--version'], refresh)
         return result
 
     @staticmethod
-    def get_plugin_versions(plugin_name):
+    def get_plugin_versions(plugin_name, refresh=False):
         """
-        Executes the 'asdf <plugin_name> list' command and returns a dictionary with:
+        Executes the 'asdf <plugin_name> list' command and returns a CommandResult with:
             - success: True if command succeeds, False otherwise.
             - stdout: Standard output from the command.
             - stderr: Standard error output from the command.
+
+        Unless 'refresh' is True, the installed versions are listed from the asdf installs directory instead.
         """ 
 
+        if not refresh:
+            result = VersionFiles.asdf_plugin_versions(plugin_name)
+            if result is not None:
+                return result
+
         result = Subproc.run_command(['asdf', plugin_name, 'list'])
         return result
 
     @staticmethod
-    def install_plugin(plugin_name, version=None):
+    def get_current_versions(plugin_names=None, cwd=None):
+        """
+        Runs 'asdf current <plugin_name>' for each plugin (default: Asdf.PLUGINS) in one batch (see Subproc.run_batch())
+        and returns a dictionary of plugin name to CommandResult. The version that applies in 'cwd' (default: the
+        current directory), which asdf reads from the .tool-versions files there and above, is the second column of
+        the last line of stdout.
+        """
+        plugin_names = list(plugin_names) if plugin_names is not None else list(Asdf.PLUGINS)
+        results = Subproc.run_batch([["asdf", "current", plugin_name] for plugin_name in plugin_names], cwd=cwd)
+        return dict(zip(plugin_names, results))
+
+    @staticmethod
+    def get_available_version(plugin_name, spec="latest", refresh=False):
+        """
+        Resolves a version spec such as 'latest', 'latest:3.12' or '>=3.11,<3.13' against the versions the plugin
+        can install (see AsdfCatalog), without a network round trip while the cached version list is fresh.
+        Returns a CommandResult whose stdout is the version.
+        """
+        if plugin_name not in Asdf.PLUGINS:
+            return CommandResult.failure(f"Plugin '{plugin_name}' not found in the list of available plugins.")
+        return AsdfCatalog().resolve(plugin_name, spec, refresh)
+
+    @staticmethod
+    def is_version_installed(plugin_name, spec):
+        """
+        Returns True if the version a spec names is installed. A spec such as '3.12.1', '3.12' or '>=3.11,<3.13' is
+        matched against the versions in the installs directory, so any installed 3.12.x satisfies '3.12'. 'latest' and
+        'latest:<prefix>' ask for the newest version, so they are first resolved with get_available_version(), from its
+        cached list.
+        """
+        installed = Asdf.get_plugin_versions(plugin_name)
+        if not installed.success:
+            return False
+        versions = {version.lstrip("*") for version in installed.stdout.split()}
+        if spec in versions:
+            return True
+        if not spec.startswith("latest"):
+            try:
+                return VersionIndex(versions).resolve(spec) is not None
+            except ValueError:
+                return False
+        resolved = Asdf.get_available_version(plugin_name, spec)
+        return resolved.success and resolved.stdout in versions
+
+    @staticmethod
+    def install_plugin(plugin_name, version=None, on_line=None, log_path=None):
         """
         Performs asdf plugin installation using the command:
             asdf install <plugin_name> <version>
+
+        'version' is a version spec resolved with get_available_version(), e.g. '3.12.1', 'latest:3.12' or
+        '>=3.11,<3.13'. Without it, asdf installs the versions named in .tool-versions.
+
+        The build tools of the plugin keep their source downloads in the artifact cache and fetch them from its
+        mirror if one is set (see ArtifactCache.build_env()).
+        Output lines are passed to 'on_line' as they arrive and written to 'log_path' if given.
         
         Returns:
-            A dictionary with the following keys:
+            A CommandResult with:
                 - success: True if the command executed successfully, False otherwise.
-                - stdout: The standard output of the command (stripped).
-                - stderr: The standard error output of the command (stripped).
+                - stdout: The last lines of output of the command.
+                - stderr: The last lines of output if the command failed.
         """
 
         if plugin_name not in Asdf.PLUGINS:
-            return {
-                "success": False,
-                "stdout": "",
-                "stderr": f"Plugin '{plugin_name}' not found in the list of available plugins."
-            }
+            return CommandResult.failure(f"Plugin '{plugin_name}' not found in the list of available plugins.")
         
         command = ["asdf", "install", plugin_name]
-        result = Subproc.run_command(command)
+        if version is not None:
+            resolved = Asdf.get_available_version(plugin_name, version)
+            if not resolved.success:
+                return resolved
+            command.append(resolved.stdout)
+        result = Subproc.run_command_streaming(command, on_line, log_path, env=ArtifactCache().build_env())
         return result
-    
+
+    @staticmethod
+    def install_plugins(plugin_names, on_output=None, log_dir=None, max_workers=None):
+        """
+        Installs several plugins at the same time, at most 'max_workers' (default Asdf.MAX_PARALLEL_INSTALLS) at once.
+        Each language is independent, so one failed install does not stop the others.
+
+        Parameters:
+            plugin_names: the plugins to install.
+            max_workers: the concurrency limit.
+            on_output: an optional function called with (plugin name, line) for every line of install output.
+            log_dir: an optional directory that receives the full output of each install as 'asdf-<plugin name>.log'.
+
+        Returns:
+            A dictionary mapping each plugin name to the CommandResult of install_plugin().
+        """
+        if max_workers is None:
+            max_workers = Asdf.MAX_PARALLEL_INSTALLS
+
+        def install(plugin_name):
+            on_line = (lambda line: on_output(plugin_name, line)) if on_output else None
+            log_path = os.path.join(log_dir, f"asdf-{plugin_name}.log") if log_dir else None
+            return Asdf.install_plugin(plugin_name, on_line=on_line, log_path=log_path)
+
+        unique = list(dict.fromkeys(plugin_names))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = dict(zip(unique, executor.map(install, unique)))
+        return {plugin_name: results[plugin_name] for plugin_name in plugin_names}
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the components.asdf_catalog module that caches the versions each asdf plugin can install.
+
+'asdf list all <plugin>' fetches the version list over the network and prints thousands of lines, so its output is
+kept on disk for a time-to-live and loaded into a VersionIndex once per process. Version specs such as 'latest:3.12'
+or '>=3.11,<3.13' are then resolved with a binary search instead of a network round trip. When the list cannot be
+fetched (e.g. offline), an expired list is still used.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+from components.utils.command_result import CommandResult
+from components.utils.probe_cache import ProbeCache
+from components.utils.subproc import Subproc
+from components.utils.version_index import VersionIndex
+
+class AsdfCatalog:
+    # Bump when the layout of the catalog file changes; older files are ignored.
+    FORMAT_VERSION = 1
+
+    # Seconds a fetched version list stays valid.
+    DEFAULT_TTL = 24 * 60 * 60
+
+    # Seconds 'asdf list all' may run; it clones or updates the plugin repository and queries the network.
+    LIST_TIMEOUT = 120
+
+    # Seconds an expired list is used after 'asdf list all' failed, before the list is fetched again.
+    RETRY_AFTER_FAILURE = 5 * 60
+
+    # Serializes catalog updates by plugins installed at the same time.
+    lock = threading.Lock()
+
+    # (catalog path, plugin name) -> (fetch time, VersionIndex, retry time), so each list is parsed once per process.
+    # The retry time is set when the list is an expired one kept after 'asdf list all' failed.
+    indexes = {}
+
+    def __init__(self, path=None, ttl=None):
+        self.path = path if path is not None else AsdfCatalog.default_path()
+        self.ttl = ttl if ttl is not None else AsdfCatalog.DEFAULT_TTL
+
+    @staticmethod
+    def default_path():
+        """Returns the path of the catalog file."""
+        return os.path.join(ProbeCache.cache_dir(), "asdf-catalog.json")
+
+    def load(self):
+        """Returns the plugin entries of the catalog file: plugin name -> {'time': ..., 'versions': [...]}."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("format") != AsdfCatalog.FORMAT_VERSION:
+            return {}
+        return data.get("plugins", {})
+
+    def store(self, plugin_name, versions):
+        """Adds the version list of a plugin to the catalog file."""
+        with AsdfCatalog.lock:
+            plugins = self.load()
+            plugins[plugin_name] = {"time": time.time(), "versions": versions}
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), prefix=".asdf-catalog-")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump({"format": AsdfCatalog.FORMAT_VERSION, "plugins": plugins}, f)
+                os.replace(temp_path, self.path)
+            except OSError:
+                # The catalog is only an optimization; the list is fetched again next time.
+                pass
+
+    @staticmethod
+    def list_all(plugin_name):
+        """Runs 'asdf list all <plugin_name>' and returns its CommandResult."""
+        return Subproc.run_command(["asdf", "list", "all", plugin_name], AsdfCatalog.LIST_TIMEOUT)
+
+    def index(self, plugin_name, refresh=False):
+        """
+        Returns the VersionIndex of the versions the plugin can install, or None if the list is neither cached nor
+        fetchable. The list is fetched again when it is older than the TTL or 'refresh' is True.
+        """
+        now = time.time()
+        key = (self.path, plugin_name)
+        cached = AsdfCatalog.indexes.get(key)
+        if cached is not None and not refresh and (now - cached[0] <= self.ttl or now < cached[2]):
+            return cached[1]
+
+        entry = self.load().get(plugin_name)
+        if entry is not None and not refresh and now - entry["time"] <= self.ttl:
+            AsdfCatalog.indexes[key] = (entry["time"], VersionIndex(entry["versions"]), 0)
+            return AsdfCatalog.indexes[key][1]
+
+        result = AsdfCatalog.list_all(plugin_name)
+        if result.success:
+            versions = result.stdout.splitlines()
+            self.store(plugin_name, versions)
+            AsdfCatalog.indexes[key] = (now, VersionIndex(versions), 0)
+        elif entry is not None:
+            # An expired list is better than none when the network is down, but only until the next retry, so that a
+            # long-running process (the daemon) fetches the list again once the network is back.
+            AsdfCatalog.indexes[key] = (entry["time"], VersionIndex(entry["versions"]), now + AsdfCatalog.RETRY_AFTER_FAILURE)
+        else:
+            return None
+        return AsdfCatalog.indexes[key][1]
+
+    def resolve(self, plugin_name, spec, refresh=False):
+        """
+        Resolves a version spec (see VersionIndex) against the versions the plugin can install.
+
+        Returns:
+            A CommandResult with:
+                - success: True if an available version matches the spec.
+                - stdout: The version name to pass to 'asdf install'.
+                - stderr: Why the spec could not be resolved.
+        """
+        index = self.index(plugin_name, refresh)
+        if index is None:
+            return CommandResult.failure(f"Could not list the available {plugin_name} versions with 'asdf list all {plugin_name}'.")
+        try:
+            version = index.resolve(spec)
+        except ValueError as e:
+            return CommandResult.failure(str(e))
+        if version is None:
+            return CommandResult.failure(f"No available {plugin_name} version matches '{spec}'.")
+        return CommandResult.ok(version)
@@ -10,64 +10,190 @@ LICENSE file in the root directory of this source tree.
 This is the components.brew module that handles Homebrew actions. 
 """
 
+from components.brew_inventory import BrewInventory
+from components.utils.artifact_cache import ArtifactCache
+from components.utils.command_result import CommandResult
+from components.utils.installable_component import InstallableComponent
 from components.utils.subproc import Subproc
+from components.version_files import VersionFiles
 
-class Brew:
+class Brew(InstallableComponent):
     # Homebrew plugins
     PLUGINS = ["asdf", "direnv"]
 
+    NOT_INSTALLED_MSG = "Homebrew is not installed. \nInstall using this command: beezeebot_cli.py -i brew"
+
+    INSTALL_SCRIPT_URL = "https://raw.githubusercontent.com/Homebrew/install/HEAD/install.sh"
+
+    def install(self, on_line=None, log_path=None):
+        """Install Homebrew. See install_homebrew()."""
+        return Brew.install_homebrew(on_line, log_path)
+
+    def uninstall(self):
+        """Uninstalling Homebrew is not supported."""
+        return InstallableComponent.not_supported("Uninstalling Homebrew")
+
+    def check_version(self, refresh=False):
+        """Check the Homebrew version. See get_homebrew_version()."""
+        return Brew.get_homebrew_version(refresh)
+
+    @staticmethod
+    def get_probes():
+        """
+        Returns the read-only commands used by the scanner to inventory Homebrew as a list of
+        (name, command, timeout) tuples. A timeout of None means the scanner default is used.
+        """
+        return [
+            ("brew", ["brew", "--version"], None)
+        ]
+
     @staticmethod
-    def get_homebrew_version():
+    def get_homebrew_version(refresh=False):
         """
-        Executes the 'brew --version' command and returns a dictionary with:
+        Executes the 'brew --version' command and returns a CommandResult with:
             - success: True if command succeeds, False otherwise.
             - stdout: Standard output from the command.
             - stderr: Standard error output from the command.
+
+        Unless 'refresh' is True, the version is read from the Homebrew repository on disk, or the cached result
+        of the command is reused, so that Homebrew does not have to boot.
         """
+        if not refresh:
+            result = VersionFiles.homebrew_version()
+            if result is not None:
+                return result
+
         command = ["brew", "--version"]
-        result = Subproc.run_command(command)
+        result = Subproc.run_version_command(command, refresh)
         return result
 
     @staticmethod
-    def install_homebrew():
+    def install_homebrew(on_line=None, log_path=None):
         """
-        Runs the Homebrew installation script using the command:
-            /bin/bash -c "$(curl -fsSL https://raw.githubusercontent.com/Homebrew/install/HEAD/install.sh)"
+        Runs the Homebrew installation script (Brew.INSTALL_SCRIPT_URL) with /bin/bash. The script is kept in the
+        artifact cache (see ArtifactCache) and revalidated with a conditional request, so an unchanged script is not
+        downloaded again.
+
+        Output lines are passed to 'on_line' as they arrive and written to 'log_path' if given.
         
         Returns:
-            A dictionary with the following keys:
+            A CommandResult with:
                 - success: True if the command executed successfully, False otherwise.
-                - stdout: The standard output of the command (stripped).
-                - stderr: The standard error output of the command (stripped).
+                - stdout: The last lines of output of the command.
+                - stderr: The last lines of output if the command failed.
         """
-        command = ["/bin/bash", "-c", "$(curl -fsSL https://raw.githubusercontent.com/Homebrew/install/HEAD/install.sh)"]
-        result = Subproc.run_command(command)
+        try:
+            script = ArtifactCache().fetch(Brew.INSTALL_SCRIPT_URL)
+        except (OSError, ValueError) as e:
+            return CommandResult.failure(f"Could not download the Homebrew install script: {e}")
+        command = ["/bin/bash", script]
+        result = Subproc.run_command_streaming(command, on_line, log_path)
         return result
         
     @staticmethod
-    def install_plugin(plugin_name):
+    def get_inventory():
+        """
+        Builds an index of all installed formulae and casks with two Homebrew boots, run at the same time:
+            brew info --json=v2 --installed
+            brew outdated --json=v2
+
+        Returns:
+            A CommandResult with:
+                - success: True if the inventory was read, False otherwise.
+                - stdout: A summary such as '42 installed packages'.
+                - stderr: Standard error output of the failed command.
+                - value: a BrewInventory, or None on failure.
+        """
+        # Imported on first use to keep asyncio out of the CLI start-up path.
+        import asyncio
+
+        async def query():
+            return await asyncio.gather(
+                Subproc.run_command_async(["brew", "info", "--json=v2", "--installed"], Subproc.DEFAULT_TIMEOUT),
+                Subproc.run_command_async(["brew", "outdated", "--json=v2"], Subproc.DEFAULT_TIMEOUT)
+            )
+
+        info, outdated = asyncio.run(query())
+        if not info.success:
+            return info
+        try:
+            # json.loads() reads the raw bytes directly, so the large JSON output is never decoded to text first.
+            inventory = BrewInventory.parse(info.raw_stdout, outdated.raw_stdout if outdated.success else None)
+        except (ValueError, KeyError) as e:
+            return CommandResult.failure(f"Could not parse the Homebrew inventory: {e}")
+        return CommandResult.ok(f"{len(inventory)} installed packages", value=inventory)
+
+    @staticmethod
+    def is_plugin_installed(plugin_name, inventory=None):
+        """
+        Returns True if the plugin is installed. With a BrewInventory the answer costs no command; otherwise it uses:
+            brew list --versions <plugin_name>
+        """
+        if inventory is not None:
+            return inventory.is_installed(plugin_name)
+        result = Subproc.run_command(["brew", "list", "--versions", plugin_name])
+        return result.success and result.stdout != ""
+
+    @staticmethod
+    def install_plugin(plugin_name, on_line=None, log_path=None):
         """
         Runs the Homebrew plugin installation script using the command:
             brew install <plugin_name>
+
+        Output lines are passed to 'on_line' as they arrive and written to 'log_path' if given.
         
         Returns:
-            A dictionary with the following keys:
+            A CommandResult with:
                 - success: True if the command executed successfully, False otherwise.
-                - stdout: The standard output of the command (stripped).
-                - stderr: The standard error output of the command (stripped).
+                - stdout: The last lines of output of the command.
+                - stderr: The last lines of output if the command failed.
         """
 
         if plugin_name not in Brew.PLUGINS:
-            return {
-                "success": False,
-                "stdout": "",
-                "stderr": f"Plugin '{plugin_name}' not found in the list of available plugins."
-            }
+            return CommandResult.failure(f"Plugin '{plugin_name}' not found in the list of available plugins.")
         
         command = ["brew", "install", plugin_name]
-        result = Subproc.run_command(command)
+        result = Subproc.run_command_streaming(command, on_line, log_path)
         return result
-    
+
+    @staticmethod
+    def install_plugins(plugin_names, on_output=None, log_path=None):
+        """
+        Installs several plugins with a single command, so Homebrew boots, resolves dependencies and takes its lock once:
+            brew install <plugin_name> <plugin_name> ...
+
+        Output lines are passed to 'on_output' as ('brew', line) as they arrive and written to 'log_path' if given.
+
+        Returns:
+            A dictionary mapping each plugin name to a CommandResult with:
+                - success: True if the plugin is installed, False otherwise.
+                - stdout: The last lines of output of the command.
+                - stderr: The reason the plugin did not install.
+        """
+        results = {}
+        for plugin_name in plugin_names:
+            if plugin_name not in Brew.PLUGINS:
+                results[plugin_name] = CommandResult.failure(f"Plugin '{plugin_name}' not found in the list of available plugins.")
+        valid = [plugin_name for plugin_name in dict.fromkeys(plugin_names) if plugin_name not in results]
+        if not valid:
+            return results
+
+        on_line = (lambda line: on_output("brew", line)) if on_output else None
+        result = Subproc.run_command_streaming(["brew", "install"] + valid, on_line, log_path)
+        if result.success:
+            installed = set(valid)
+        else:
+            # Homebrew may have installed some of the plugins before it failed; one inventory query tells which.
+            inventory = Brew.get_inventory().value
+            installed = set() if inventory is None else {name for name in valid if inventory.is_installed(name)}
+
+        for plugin_name in valid:
+            if plugin_name in installed:
+                results[plugin_name] = result.replace(returncode=0, timed_out=False, stderr="", message="")
+            else:
+                results[plugin_name] = result
+        return {plugin_name: results[plugin_name] for plugin_name in plugin_names}
+
 if __name__ == '__main__':
     # Add the project root directory to the Python path
     import sys
@@ -78,17 +204,17 @@ if __name__ == '__main__':
 
     utils.print_unit_test_header("Brew.get_homebrew_version")
     result = Brew.get_homebrew_version()
-    if result["success"]:
-        print("Homebrew version:", result["stdout"])
+    if result.success:
+        print("Homebrew version:", result.stdout)
     else:
         print("Homebrew is not installed.")
-        print("Error:", result["stderr"])
+        print("Error:", result.stderr)
 
     utils.print_unit_test_header("Brew.install_homebrew")
     result = Brew.install_homebrew()
-    if result["success"]:
+    if result.success:
         print("Homebrew installation initiated successfully.")
-        print("Output:", result["stdout"])
+        print("Output:", result.stdout)
     else:
         print("Homebrew installation failed.")
-        print("Error:", result["stderr"])
+        print("Error:", result.stderr)
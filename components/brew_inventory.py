@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the components.brew_inventory module, an in-memory index of everything Homebrew has installed.
+
+The index is built from the JSON of one 'brew info --json=v2 --installed' call plus one 'brew outdated --json=v2' call,
+so asking about any number of formulae and casks costs two Homebrew boots instead of one per package.
+"""
+
+import json
+
+class BrewInventory:
+    FORMULA = "formula"
+    CASK = "cask"
+
+    def __init__(self, packages=None):
+        """
+        Parameters:
+            packages: a list of package dictionaries with the keys:
+                - name: the formula name or cask token.
+                - kind: BrewInventory.FORMULA or BrewInventory.CASK.
+                - version: the installed (linked) version.
+                - latest: the newest available version.
+                - outdated: True if a newer version is available.
+                - aliases: other names the package can be looked up by (full names and aliases).
+        """
+        self.packages = {}
+        self.names = {}
+        for package in packages or []:
+            self.add(package)
+
+    def add(self, package):
+        """Adds a package dictionary to the index, under its name and all of its aliases."""
+        self.packages[package["name"]] = package
+        self.names[package["name"]] = package["name"]
+        for alias in package.get("aliases", []):
+            self.names.setdefault(alias, package["name"])
+
+    def get(self, name):
+        """Returns the package dictionary for a formula or cask name (or alias), or None if it is not installed."""
+        canonical = self.names.get(name)
+        return self.packages.get(canonical) if canonical is not None else None
+
+    def is_installed(self, name):
+        """Returns True if the formula or cask is installed."""
+        return self.get(name) is not None
+
+    def version(self, name):
+        """Returns the installed version of the formula or cask, or None."""
+        package = self.get(name)
+        return package["version"] if package else None
+
+    def is_outdated(self, name):
+        """Returns True if the formula or cask is installed and a newer version is available."""
+        package = self.get(name)
+        return bool(package and package["outdated"])
+
+    def missing(self, names):
+        """Returns the names that are not installed, in the given order."""
+        return [name for name in names if not self.is_installed(name)]
+
+    def __len__(self):
+        return len(self.packages)
+
+    @staticmethod
+    def parse(info_json, outdated_json=None):
+        """
+        Builds an inventory from the output of:
+            brew info --json=v2 --installed
+            brew outdated --json=v2   (optional; it refines the outdated flags and latest versions)
+
+        Parameters:
+            info_json, outdated_json: JSON text (str or bytes) or already decoded dictionaries.
+
+        Raises:
+            ValueError: if the text is not valid JSON.
+        """
+        info = json.loads(info_json) if isinstance(info_json, (str, bytes)) else info_json
+        inventory = BrewInventory()
+
+        for formula in info.get("formulae", []):
+            installed = formula.get("installed") or []
+            version = formula.get("linked_keg") or (installed[-1]["version"] if installed else None)
+            aliases = [formula.get("full_name")] + list(formula.get("aliases") or []) + list(formula.get("oldnames") or [])
+            inventory.add({
+                "name": formula["name"],
+                "kind": BrewInventory.FORMULA,
+                "version": version,
+                "latest": (formula.get("versions") or {}).get("stable"),
+                "outdated": bool(formula.get("outdated")),
+                "aliases": [alias for alias in aliases if alias and alias != formula["name"]],
+            })
+
+        for cask in info.get("casks", []):
+            aliases = [cask.get("full_token")] + list(cask.get("old_tokens") or [])
+            inventory.add({
+                "name": cask["token"],
+                "kind": BrewInventory.CASK,
+                "version": cask.get("installed"),
+                "latest": cask.get("version"),
+                "outdated": bool(cask.get("outdated")),
+                "aliases": [alias for alias in aliases if alias and alias != cask["token"]],
+            })
+
+        if outdated_json:
+            outdated = json.loads(outdated_json) if isinstance(outdated_json, (str, bytes)) else outdated_json
+            for entry in outdated.get("formulae", []) + outdated.get("casks", []):
+                package = inventory.get(entry["name"])
+                if package is not None:
+                    package["outdated"] = True
+                    package["latest"] = entry.get("current_version") or package["latest"]
+
+        return inventory
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the components.cache_invalidator module that drops cached probe results as soon as the files behind them
+change, e.g. when 'brew upgrade' or 'asdf install' runs outside beezeebot.
+
+Each cached result depends on a few paths:
+    - probe cache entries: the resolved executable, its directory and, for Homebrew installs, its Cellar directory;
+      'brew --version' also depends on the git refs of the Homebrew repository, which 'brew update' moves;
+    - inventory snapshot entries: every path of their fingerprint (see InventorySnapshot.fingerprint()) and the
+      directory holding it;
+    - both: every PATH directory, for an executable of the same name that would now be found first.
+An FsWatcher watches those paths, and a change drops exactly the entries that depend on the changed path. Changes to
+a directory that name an entry (inotify does) only drop the results that depend on that entry, so installing an
+unrelated tool into /usr/local/bin leaves the others cached. The dependencies are read again whenever the probe
+cache or the snapshot file is rewritten.
+"""
+
+import json
+import os
+import re
+import threading
+
+from components.inventory_snapshot import InventorySnapshot
+from components.utils.fs_watcher import FsWatcher
+from components.utils.probe_cache import ProbeCache
+from components.version_files import VersionFiles
+
+class CacheInvalidator:
+    # Seconds between two checks whether the cache files were rewritten and the watches must follow.
+    REFRESH_INTERVAL = 1.0
+
+    def __init__(self, watcher=None, cache=None, snapshot_path=None):
+        """
+        Parameters:
+            watcher: the FsWatcher to use; defaults to FsWatcher.create().
+            cache: the ProbeCache to invalidate; defaults to the resident cache, or one that follows the cache file.
+            snapshot_path: the snapshot file to invalidate; defaults to InventorySnapshot.default_path().
+        """
+        self.watcher = watcher if watcher is not None else FsWatcher.create()
+        self.cache = cache or ProbeCache.resident or ProbeCache(track_file=True)
+        self.snapshot_path = snapshot_path or InventorySnapshot.default_path()
+        # watched path -> list of (entry name or None for any change, ('probe', cache key) or ('snapshot', probe name))
+        self.dependencies = {}
+        self.stamps = None
+        self.thread = None
+        self.stopping = threading.Event()
+
+    # Dependencies
+
+    @staticmethod
+    def path_dirs():
+        return [directory for directory in os.environ.get("PATH", "").split(os.pathsep) if directory]
+
+    def add(self, dependencies, path, target, name=None):
+        dependencies.setdefault(path, []).append((name, target))
+
+    def add_file(self, dependencies, path, target):
+        """A file or directory changes itself, or is replaced, removed or created in its parent directory."""
+        self.add(dependencies, path, target)
+        self.add(dependencies, os.path.dirname(path), target, os.path.basename(path))
+
+    def add_executable(self, dependencies, executable, target):
+        """A newly installed executable of the same name in any PATH directory may shadow the cached one."""
+        for directory in CacheInvalidator.path_dirs():
+            self.add(dependencies, directory, target, executable)
+
+    def collect(self):
+        """Returns the dependencies of the current probe cache and snapshot entries."""
+        dependencies = {}
+        for key in list(self.cache.load()):
+            try:
+                identity = json.loads(key)
+            except ValueError:
+                continue
+            target = ("probe", key)
+            resolved = identity[0]
+            self.add_file(dependencies, resolved, target)
+            match = re.match(r"(.*/Cellar/[^/]+)/", resolved)
+            if match:
+                self.add_file(dependencies, match.group(1), target)
+            if os.path.basename(resolved) == "brew" and identity[4:] == ["--version"]:
+                # The same paths as InventorySnapshot.fingerprint(), since 'brew update' leaves the executable as is.
+                for path in VersionFiles.homebrew_ref_paths():
+                    self.add_file(dependencies, path, target)
+            self.add_executable(dependencies, os.path.basename(resolved), target)
+
+        snapshot = InventorySnapshot.load(self.snapshot_path)
+        for name, entry in (snapshot.entries if snapshot else {}).items():
+            if not entry.get("fingerprint"):
+                continue
+            target = ("snapshot", name)
+            for part in entry["fingerprint"]:
+                self.add_file(dependencies, part[0], target)
+            self.add_executable(dependencies, entry["command"][0], target)
+        return dependencies
+
+    def file_stamps(self):
+        stamps = []
+        for path in (self.cache.path, self.snapshot_path):
+            try:
+                stat = os.stat(path)
+                stamps.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamps.append(None)
+        return stamps
+
+    def refresh(self, force=False):
+        """Watches the paths the cached entries depend on, once the cache files were rewritten (or if 'force' is True)."""
+        stamps = self.file_stamps()
+        if stamps == self.stamps and not force:
+            # Watches dropped by the kernel (a deleted path) are restored when the path comes back.
+            for path in self.dependencies:
+                if path not in self.watcher.paths and os.path.exists(path):
+                    self.watcher.watch(path)
+            return
+        self.stamps = stamps
+        self.dependencies = self.collect()
+        for path in self.watcher.paths - set(self.dependencies):
+            self.watcher.unwatch(path)
+        for path in self.dependencies:
+            if path not in self.watcher.paths:
+                self.watcher.watch(path)
+
+    # Invalidation
+
+    def affected(self, changes):
+        """Returns the ('probe', key) and ('snapshot', name) targets that depend on the changed paths."""
+        targets = set()
+        for path, name in changes:
+            for entry_name, target in self.dependencies.get(path, []):
+                if name is None or entry_name is None or entry_name == name:
+                    targets.add(target)
+        return targets
+
+    def invalidate(self, changes):
+        """
+        Drops the cached results that depend on the changes reported by FsWatcher.read().
+
+        Returns:
+            A sorted list of the dropped snapshot probe names and probe cache keys.
+        """
+        targets = self.affected(changes)
+        keys = [key for kind, key in targets if kind == "probe"]
+        names = [name for kind, name in targets if kind == "snapshot"]
+        if keys:
+            self.cache.remove(keys)
+        if names:
+            snapshot = InventorySnapshot.load(self.snapshot_path)
+            if snapshot is not None:
+                for name in names:
+                    snapshot.entries.pop(name, None)
+                snapshot.save(self.snapshot_path)
+        if targets:
+            self.refresh(force=True)
+        return sorted(names) + sorted(keys)
+
+    def poll(self, timeout=None):
+        """Waits up to 'timeout' seconds for changes and invalidates what they affect. Returns what was dropped."""
+        self.refresh()
+        changes = self.watcher.read(timeout)
+        return self.invalidate(changes) if changes else []
+
+    # Background thread
+
+    def run(self):
+        while not self.stopping.is_set():
+            self.poll(CacheInvalidator.REFRESH_INTERVAL)
+
+    def start(self):
+        """Invalidates cached results on a background thread until stop() is called."""
+        self.thread = threading.Thread(target=self.run, name="cache-invalidator", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join()
+        self.watcher.close()
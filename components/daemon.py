@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the components.daemon module, a resident process that answers --version, --scan, --options and --updates
+over a Unix domain socket.
+
+Every CLI run pays for unpacking, interpreter start-up and loading the components. The daemon pays that once and
+keeps the loaded components, the probe cache and the asdf catalog in memory, so shell prompts and editors that poll
+tool versions get an answer in milliseconds. A CacheInvalidator drops cached results as soon as the files behind them
+change, so the daemon keeps probe results for ProbeCache.WATCHED_TTL instead of a day. The CLI is a thin client: it sends one request and prints the answer,
+and runs the command itself when no daemon is listening.
+
+Protocol: the client sends one JSON line, e.g. {"protocol": 1, "command": "version", "args": {...}, "env": {...}},
+and the daemon answers with one JSON line: {"ok": true, "output": "..."} or {"ok": false, "error": "..."}.
+A daemon started with a different PATH, home, asdf or Homebrew settings (any ASDF_* or HOMEBREW_* variable, such as
+an ASDF_PYTHON_VERSION override) or cache directory would give other answers, so it refuses such requests and the
+client falls back to running in-process. The working directory is not compared: a command whose answer depends on
+it, such as the current asdf versions of --version, receives the client's directory in its arguments.
+"""
+
+import json
+import os
+import socket
+
+from components.utils.probe_cache import ProbeCache
+
+class Daemon:
+    # Bump when requests or answers change; a daemon of another version refuses the request.
+    PROTOCOL_VERSION = 1
+
+    # Environment variables that decide which executables a probe finds and which caches it uses.
+    ENV_KEYS = ["PATH", "HOME", "ASDF_DIR", "ASDF_DATA_DIR", "HOMEBREW_PREFIX"]
+
+    # Prefixes of the variables that configure asdf and Homebrew, e.g. ASDF_PYTHON_VERSION or HOMEBREW_CELLAR.
+    ENV_PREFIXES = ("ASDF_", "HOMEBREW_")
+
+    # Seconds the client waits for a daemon to accept a request before running it in-process.
+    CONNECT_TIMEOUT = 0.5
+
+    # Seconds the client waits for the answer before running the command in-process, in case the daemon hangs.
+    REQUEST_TIMEOUT = 60
+
+    # Largest request line the daemon reads.
+    MAX_REQUEST_BYTES = 64 * 1024
+
+    def __init__(self, handlers, path=None, watch=True):
+        """
+        Parameters:
+            handlers: a dictionary of command name to a function that takes the request arguments (a dictionary)
+                      and returns the text to print, e.g. {"version": lambda args: get_version_msg(args["app"])}.
+            path: the socket path; defaults to Daemon.socket_path().
+            watch: True to invalidate cached results when the files behind them change (see CacheInvalidator).
+        """
+        self.handlers = handlers
+        self.path = path if path is not None else Daemon.socket_path()
+        self.env = Daemon.environment()
+        self.watch = watch
+        self.server = None
+
+    @staticmethod
+    def socket_path():
+        """Returns the socket path: $BEEZEEBOT_DAEMON_SOCKET, else 'daemon.sock' in the beezeebot cache directory."""
+        return os.environ.get("BEEZEEBOT_DAEMON_SOCKET") or os.path.join(ProbeCache.cache_dir(), "daemon.sock")
+
+    @staticmethod
+    def environment():
+        """Returns the parts of the environment that a request must share with the daemon."""
+        env = {key: os.environ.get(key) for key in Daemon.ENV_KEYS}
+        env.update((key, value) for key, value in os.environ.items() if key.startswith(Daemon.ENV_PREFIXES))
+        env["cache_dir"] = ProbeCache.cache_dir()
+        return env
+
+    # Client
+
+    @staticmethod
+    def request(command, args=None, path=None, timeout=None):
+        """
+        Sends a request to the daemon and returns its answer.
+
+        Returns:
+            The output text, or None if no daemon is listening, it refused the request or it did not answer within
+            'timeout' seconds (default Daemon.REQUEST_TIMEOUT), in which case the caller runs the command itself.
+        """
+        path = path if path is not None else Daemon.socket_path()
+        timeout = timeout if timeout is not None else Daemon.REQUEST_TIMEOUT
+        message = {"protocol": Daemon.PROTOCOL_VERSION, "command": command, "args": args or {}, "env": Daemon.environment()}
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            client.settimeout(Daemon.CONNECT_TIMEOUT)
+            client.connect(path)
+            client.settimeout(timeout)
+            client.sendall(json.dumps(message).encode("utf-8") + b"\n")
+            with client.makefile("rb") as reader:
+                answer = json.loads(reader.readline())
+        except (OSError, ValueError):
+            return None
+        finally:
+            client.close()
+        if not isinstance(answer, dict) or not answer.get("ok"):
+            return None
+        return answer.get("output", "")
+
+    @staticmethod
+    def is_running(path=None):
+        """Returns True if a daemon answers on the socket."""
+        return Daemon.request("ping", path=path, timeout=Daemon.CONNECT_TIMEOUT) is not None
+
+    @staticmethod
+    def stop(path=None):
+        """Asks the daemon to exit. Returns True if one was running."""
+        return Daemon.request("stop", path=path, timeout=Daemon.CONNECT_TIMEOUT) is not None
+
+    # Server
+
+    def handle(self, request):
+        """Answers one decoded request with a dictionary: {'ok': True, 'output': ...} or {'ok': False, 'error': ...}."""
+        if not isinstance(request, dict) or request.get("protocol") != Daemon.PROTOCOL_VERSION:
+            return {"ok": False, "error": f"unsupported protocol, expected {Daemon.PROTOCOL_VERSION}"}
+        if request.get("env") != self.env:
+            return {"ok": False, "error": "the daemon runs with a different environment"}
+        command = request.get("command")
+        if command == "ping":
+            return {"ok": True, "output": str(os.getpid())}
+        if command == "stop":
+            # shutdown() waits for serve_forever() to return, so it cannot run on the thread answering this request.
+            import threading
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return {"ok": True, "output": "stopping"}
+        if command not in self.handlers:
+            return {"ok": False, "error": f"unknown command '{command}'"}
+        try:
+            return {"ok": True, "output": self.handlers[command](request.get("args") or {})}
+        except Exception as e:
+            # The client runs the command itself and reports the error in its own terms.
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+    def bind(self):
+        """
+        Creates the listening server. A socket file left behind by a daemon that died is replaced.
+
+        Raises:
+            OSError: if another daemon is already listening on the socket, or the socket cannot be created.
+        """
+        import socketserver
+
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                # A client may send several requests over one connection.
+                while True:
+                    line = self.rfile.readline(Daemon.MAX_REQUEST_BYTES)
+                    if not line:
+                        return
+                    try:
+                        answer = daemon.handle(json.loads(line))
+                    except ValueError:
+                        answer = {"ok": False, "error": "malformed request"}
+                    self.wfile.write(json.dumps(answer).encode("utf-8") + b"\n")
+                    self.wfile.flush()
+
+        class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        # Connecting rather than pinging, since a daemon with another environment refuses pings but still listens.
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.settimeout(Daemon.CONNECT_TIMEOUT)
+            probe.connect(self.path)
+        except OSError:
+            pass
+        else:
+            raise OSError(f"A daemon is already listening on {self.path}.")
+        finally:
+            probe.close()
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # The socket is created without access for others, so no other user can connect before the chmod.
+        umask = os.umask(0o077)
+        try:
+            self.server = Server(self.path, Handler)
+        finally:
+            os.umask(umask)
+        os.chmod(self.path, 0o600)
+        return self.server
+
+    def serve(self):
+        """
+        Answers requests until a 'stop' request arrives. The probe cache stays loaded in memory meanwhile.
+
+        Raises:
+            OSError: see bind().
+        """
+        if self.server is None:
+            self.bind()
+        invalidator = None
+        if self.watch:
+            from components.cache_invalidator import CacheInvalidator
+            ProbeCache.keep_resident(ttl=ProbeCache.WATCHED_TTL)
+            invalidator = CacheInvalidator().start()
+        else:
+            ProbeCache.keep_resident()
+        try:
+            self.server.serve_forever(poll_interval=0.1)
+        finally:
+            if invalidator is not None:
+                invalidator.stop()
+            self.server.server_close()
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the components.fleet_store module that collects the inventory snapshots of many machines (see
+InventorySnapshot) in a SQLite database and answers questions about the whole fleet.
+
+The store keeps the latest snapshot of each host as one row per installed version (a component such as
+'asdf:python' can have several). Rows are indexed by component and version sort key (see Version.sort_text()),
+by version and by host, so version range queries over thousands of hosts take milliseconds.
+
+Snapshots are ingested as a stream: files are parsed one at a time and written in batches inside one transaction,
+and an older snapshot of a host never replaces a newer one.
+
+Queries (see FleetStore.query()):
+    hosts COMPONENT [OP VERSION]  : the hosts with the component installed, e.g. 'hosts asdf:python < 3.11'.
+    missing COMPONENT             : the hosts without the component.
+    histogram COMPONENT           : the number of hosts per installed version, e.g. 'histogram brew'.
+"""
+
+import functools
+import json
+import os
+import sqlite3
+import sys
+
+from components.inventory_snapshot import InventorySnapshot
+from components.utils.probe_cache import ProbeCache
+from components.utils.version import Version
+
+class FleetStore:
+    # Bump when the schema changes; an older store is rebuilt empty.
+    SCHEMA_VERSION = 2
+
+    # Number of snapshots written per executemany() batch.
+    BATCH_SIZE = 2000
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS hosts (
+            host TEXT PRIMARY KEY,
+            created REAL NOT NULL,
+            source TEXT
+        );
+        CREATE TABLE IF NOT EXISTS inventory (
+            host TEXT NOT NULL,
+            component TEXT NOT NULL,
+            status TEXT NOT NULL,
+            version TEXT,
+            sort_key TEXT
+        );
+        CREATE INDEX IF NOT EXISTS inventory_host ON inventory (host);
+    """
+
+    # Query indexes. A first load into an empty store creates them after the rows are written, which is faster than
+    # updating them row by row.
+    INDEXES = {
+        "inventory_component": "CREATE INDEX IF NOT EXISTS inventory_component ON inventory (component, sort_key)",
+        "inventory_version": "CREATE INDEX IF NOT EXISTS inventory_version ON inventory (version)",
+    }
+
+    # Page cache size in KiB (SQLite's default is 2 MiB), so the indexes of a large fleet stay in memory while loading.
+    CACHE_KIB = 65536
+
+    # Comparison operators accepted by 'hosts COMPONENT OP VERSION'.
+    OPERATORS = {"<": "<", "<=": "<=", ">": ">", ">=": ">=", "==": "=", "=": "=", "!=": "!="}
+
+    def __init__(self, path=None):
+        """
+        Parameters:
+            path: the SQLite database file; defaults to FleetStore.default_path().
+        """
+        self.path = path or FleetStore.default_path()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] != FleetStore.SCHEMA_VERSION:
+            self.connection.executescript("DROP TABLE IF EXISTS hosts; DROP TABLE IF EXISTS inventory;")
+            self.connection.execute(f"PRAGMA user_version = {FleetStore.SCHEMA_VERSION}")
+        self.connection.executescript(FleetStore.SCHEMA)
+        for statement in FleetStore.INDEXES.values():
+            self.connection.execute(statement)
+        self.connection.execute(f"PRAGMA cache_size = -{FleetStore.CACHE_KIB}")
+
+    @staticmethod
+    def default_path():
+        """Returns the path of the local fleet store."""
+        return os.path.join(ProbeCache.cache_dir(), "fleet.sqlite3")
+
+    def close(self):
+        self.connection.close()
+
+    # Ingest
+
+    @staticmethod
+    def read_snapshots(paths, errors=None):
+        """
+        Yields (source, snapshot dictionary) for every snapshot found in 'paths', one at a time.
+        A path can be a snapshot JSON file, a JSON-lines file with one snapshot per line, '-' for JSON lines on
+        standard input, or a directory searched recursively for .json and .jsonl files.
+        A file that cannot be read, or is not UTF-8 text, yields (path, None); the reason is appended to 'errors' if given.
+        """
+        for path in paths:
+            if os.path.isdir(path):
+                for directory, _, names in sorted(os.walk(path)):
+                    for name in sorted(names):
+                        if name.endswith((".json", ".jsonl")):
+                            yield from FleetStore.read_snapshots([os.path.join(directory, name)], errors)
+                continue
+            try:
+                if path == "-":
+                    yield from FleetStore.read_lines("-", sys.stdin)
+                elif path.endswith(".jsonl"):
+                    with open(path, "r", encoding="utf-8") as f:
+                        yield from FleetStore.read_lines(path, f)
+                else:
+                    with open(path, "r", encoding="utf-8") as f:
+                        try:
+                            data = json.load(f)
+                        except UnicodeDecodeError:
+                            raise
+                        except ValueError:
+                            data = None
+                    yield path, data
+            except OSError as e:
+                if errors is not None:
+                    errors.append(f"Cannot read {path}: {e.strerror}")
+                yield path, None
+            except UnicodeDecodeError:
+                if errors is not None:
+                    errors.append(f"Cannot read {path}: not UTF-8 text")
+                yield path, None
+
+    @staticmethod
+    def read_lines(source, lines):
+        """Yields (source, snapshot dictionary) for every line of a JSON-lines stream; None for unreadable lines."""
+        for number, line in enumerate(lines, 1):
+            if line.strip():
+                try:
+                    yield f"{source}:{number}", json.loads(line)
+                except ValueError:
+                    yield f"{source}:{number}", None
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def parse_versions(output, one_per_line):
+        """
+        Returns the (version, sort_key) tuples found in the output of a probe: the first version, or with
+        'one_per_line' the version on every line (e.g. 'asdf python list'). Outputs repeat across a fleet, so
+        each distinct output is parsed only once.
+        """
+        texts = output.splitlines() if one_per_line else [output]
+        versions = [version for version in map(Version.parse, texts) if version is not None]
+        return tuple((str(version), Version.sort_text(version.key)) for version in versions)
+
+    @staticmethod
+    def rows(snapshot):
+        """
+        Returns the inventory rows of a snapshot as (host, component, status, version, sort_key) tuples: one per
+        installed version, or one without a version for a component that is missing, timed out or unparseable.
+        """
+        rows = []
+        host = snapshot.host
+        for component, entry in snapshot.entries.items():
+            # The stored result dictionaries are read directly (see CommandResult.to_dict()); building a
+            # CommandResult for each of them would dominate the ingest time.
+            result = entry["result"]
+            if result.get("timed_out"):
+                rows.append((host, component, "timed out", None, None))
+                continue
+            if result.get("returncode") != 0:
+                rows.append((host, component, "missing", None, None))
+                continue
+            command = entry["command"]
+            # 'asdf PLUGIN list' prints one installed version per line; the current one is marked with '*'.
+            versions = FleetStore.parse_versions(result.get("stdout", ""), command[0] == "asdf" and command[2:] == ["list"])
+            if not versions:
+                rows.append((host, component, "installed", None, None))
+            for version, sort_key in versions:
+                rows.append((host, component, "installed", version, sort_key))
+        return rows
+
+    def ingest(self, paths, batch_size=None, errors=None):
+        """
+        Loads the snapshots found in 'paths' (see read_snapshots()), keeping the newest snapshot of each host.
+        The reasons files could not be read are appended to 'errors' if given.
+
+        Returns:
+            A dictionary with the counts of 'ingested' snapshots, 'skipped' ones (not newer than the stored
+            snapshot of their host) and 'invalid' ones (unreadable or not a snapshot).
+        """
+        batch_size = batch_size or FleetStore.BATCH_SIZE
+        counts = {"ingested": 0, "skipped": 0, "invalid": 0}
+        stored = dict(self.connection.execute("SELECT host, created FROM hosts"))
+        pending = {}
+
+        with self.connection:
+            deferred = not stored and self.connection.execute("SELECT 1 FROM inventory LIMIT 1").fetchone() is None
+            if deferred:
+                for name in FleetStore.INDEXES:
+                    self.connection.execute(f"DROP INDEX IF EXISTS {name}")
+            for source, data in FleetStore.read_snapshots(paths, errors):
+                try:
+                    if not data.get("host"):
+                        raise ValueError(f"The snapshot {source} has no host name.")
+                    snapshot = InventorySnapshot.from_dict(data)
+                    host = snapshot.host
+                    newest = pending[host][0] if host in pending else stored.get(host)
+                    if newest is not None and snapshot.created <= newest:
+                        counts["skipped"] += 1
+                        continue
+                    rows = FleetStore.rows(snapshot)
+                except (ValueError, KeyError, TypeError, AttributeError, IndexError):
+                    counts["invalid"] += 1
+                    continue
+                if host in pending:
+                    # An older snapshot of the host in the same batch is replaced before it was written.
+                    counts["ingested"] -= 1
+                    counts["skipped"] += 1
+                pending[host] = (snapshot.created, source, rows)
+                counts["ingested"] += 1
+                if len(pending) >= batch_size:
+                    self.write_batch(pending, stored)
+            self.write_batch(pending, stored)
+            if deferred:
+                for statement in FleetStore.INDEXES.values():
+                    self.connection.execute(statement)
+        return counts
+
+    def write_batch(self, pending, stored):
+        """Writes the pending snapshots, replacing the stored rows of their hosts, and empties 'pending'."""
+        if not pending:
+            return
+        replaced = [(host,) for host in pending if host in stored]
+        self.connection.executemany("DELETE FROM inventory WHERE host = ?", replaced)
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO hosts (host, created, source) VALUES (?, ?, ?)",
+            [(host, created, source) for host, (created, source, _) in pending.items()]
+        )
+        self.connection.executemany(
+            "INSERT INTO inventory (host, component, status, version, sort_key) VALUES (?, ?, ?, ?, ?)",
+            [row for _, _, rows in pending.values() for row in rows]
+        )
+        for host, (created, _, _) in pending.items():
+            stored[host] = created
+        pending.clear()
+
+    # Queries
+
+    def hosts(self, component, operator=None, version=None):
+        """
+        Returns (host, version) tuples of the hosts with the component installed, sorted by host and version.
+        With an operator ('<', '<=', '>', '>=', '==', '!=') and a version, only installed versions that compare
+        so are returned, e.g. hosts('asdf:python', '<', '3.11').
+
+        Raises:
+            ValueError: if the operator is not supported.
+        """
+        sql = "SELECT host, version FROM inventory WHERE component = ? AND status = 'installed'"
+        parameters = [component]
+        if operator is not None:
+            if operator not in FleetStore.OPERATORS:
+                raise ValueError(f"Unsupported operator '{operator}'; use one of {', '.join(FleetStore.OPERATORS)}.")
+            sql += f" AND sort_key {FleetStore.OPERATORS[operator]} ?"
+            parameters.append(Version.sort_text(Version(version).key))
+        sql += " ORDER BY host, sort_key"
+        return self.connection.execute(sql, parameters).fetchall()
+
+    def missing(self, component):
+        """Returns (host, status) tuples of the hosts where the component is not installed, sorted by host."""
+        return self.connection.execute(
+            "SELECT host, 'not scanned' FROM hosts WHERE host NOT IN (SELECT host FROM inventory WHERE component = ?)"
+            " UNION SELECT DISTINCT host, status FROM inventory WHERE component = ? AND status != 'installed'"
+            " ORDER BY 1",
+            (component, component)
+        ).fetchall()
+
+    def histogram(self, component):
+        """Returns (version, host count) tuples of the installed versions of the component, oldest version first."""
+        return self.connection.execute(
+            "SELECT version, COUNT(DISTINCT host) FROM inventory"
+            " WHERE component = ? AND status = 'installed' AND version IS NOT NULL"
+            " GROUP BY sort_key ORDER BY sort_key",
+            (component,)
+        ).fetchall()
+
+    def host_count(self):
+        """Returns the number of hosts in the store."""
+        return self.connection.execute("SELECT COUNT(*) FROM hosts").fetchone()[0]
+
+    def query(self, text):
+        """
+        Answers a query written as text (see the module description).
+
+        Returns:
+            The query name ('hosts', 'missing' or 'histogram') and its list of result tuples.
+
+        Raises:
+            ValueError: if the query cannot be parsed.
+        """
+        words = text.split()
+        if len(words) == 2 and words[0] in ("hosts", "missing", "histogram"):
+            return words[0], getattr(self, words[0])(words[1])
+        if len(words) == 4 and words[0] == "hosts":
+            return "hosts", self.hosts(words[1], words[2], words[3])
+        raise ValueError(
+            f"Cannot parse the query '{text}'. Use 'hosts COMPONENT [OP VERSION]', 'missing COMPONENT' or 'histogram COMPONENT'."
+        )
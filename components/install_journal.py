@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the components.install_journal module that remembers the progress of install runs across interruptions.
+
+The journal is an append-only JSON-lines file (install-journal.jsonl in the beezeebot cache directory). A run of
+InstallScheduler.run() appends a 'begin' record, a 'step' record for every step that is satisfied, and an 'end'
+record once every step is. Each record is flushed to disk before the run goes on, so a crash, a reboot or a failed
+step leaves a run without an 'end' record. The next run of the same targets continues that run: the steps it
+recorded are not run or checked again, as long as their inputs are unchanged.
+
+The inputs of a step are its name, its InstallStep.inputs (e.g. the asdf version spec) and the inputs of its
+prerequisites, hashed together, so changing the version of a step also redoes the steps that depend on it.
+A line that was cut short by a crash is ignored.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+import uuid
+
+from components.utils.probe_cache import ProbeCache
+
+class InstallJournal:
+    FORMAT_VERSION = 1
+
+    # The journal is rewritten without its finished runs when it grows beyond this size.
+    MAX_BYTES = 256 * 1024
+
+    def __init__(self, path=None):
+        """
+        Parameters:
+            path: the journal file; defaults to InstallJournal.default_path().
+        """
+        self.path = path or InstallJournal.default_path()
+        # The run being recorded, set by begin().
+        self.run_id = None
+
+    @staticmethod
+    def default_path():
+        """Returns the path of the install journal."""
+        return os.path.join(ProbeCache.cache_dir(), "install-journal.jsonl")
+
+    # Inputs
+
+    @staticmethod
+    def input_hashes(order, steps):
+        """
+        Returns a dictionary of step name to the hash of its inputs, for the step names of InstallScheduler.plan()
+        (prerequisites first).
+        """
+        hashes = {}
+        for name in order:
+            step = steps[name]
+            inputs = {
+                "step": name,
+                "inputs": step.inputs,
+                "dependencies": {dependency: hashes[dependency] for dependency in step.dependencies},
+            }
+            hashes[name] = hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        return hashes
+
+    @staticmethod
+    def run_key(targets):
+        """Returns the key that identifies runs of the same targets, in any order."""
+        return hashlib.sha256(json.dumps(sorted(set(targets))).encode("utf-8")).hexdigest()
+
+    # Records
+
+    def records(self):
+        """Returns the records of the journal in the order they were written, skipping unreadable lines."""
+        records = []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(record, dict) and record.get("format") == InstallJournal.FORMAT_VERSION:
+                        records.append(record)
+        except OSError:
+            pass
+        return records
+
+    def append(self, record):
+        """Appends a record and waits until it is on disk. The journal only saves work, so write errors are ignored."""
+        record = dict(record, format=InstallJournal.FORMAT_VERSION, run=self.run_id, time=time.time())
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError:
+            pass
+
+    def compact(self, records):
+        """Rewrites the journal atomically with the records of the runs that did not finish."""
+        finished = {record["run"] for record in records if record.get("event") == "end"}
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), prefix=".install-journal-")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                for record in records:
+                    if record.get("run") not in finished:
+                        f.write(json.dumps(record) + "\n")
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass
+
+    # Runs
+
+    def begin(self, targets):
+        """
+        Starts recording a run of the targets. If the last run of the same targets did not finish, it is continued.
+
+        Returns:
+            A dictionary of step name to input hash of the steps that the continued run completed, or an empty
+            dictionary for a new run.
+        """
+        key = InstallJournal.run_key(targets)
+        records = self.records()
+        unfinished = None
+        for record in records:
+            if record.get("event") == "begin" and record.get("key") == key:
+                unfinished = record["run"]
+            elif record.get("event") == "end" and record.get("run") == unfinished:
+                unfinished = None
+
+        if unfinished is not None:
+            self.run_id = unfinished
+            return {record["step"]: record["inputs"] for record in records
+                    if record.get("event") == "step" and record.get("run") == unfinished}
+
+        try:
+            oversized = os.path.getsize(self.path) > InstallJournal.MAX_BYTES
+        except OSError:
+            oversized = False
+        if oversized:
+            self.compact(records)
+        self.run_id = uuid.uuid4().hex
+        self.append({"event": "begin", "key": key, "targets": list(targets)})
+        return {}
+
+    def record_step(self, name, inputs):
+        """Records that a step of the current run is satisfied, with the hash of its inputs."""
+        self.append({"event": "step", "step": name, "inputs": inputs})
+
+    def end(self):
+        """Records that every step of the current run is satisfied; the next run of its targets starts afresh."""
+        self.append({"event": "end"})
+        self.run_id = None
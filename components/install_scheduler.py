@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the components.install_scheduler module that installs components in dependency order.
+
+The requested targets are expanded with their prerequisites into a dependency graph (DAG). Steps whose prerequisites
+are done run in parallel on a bounded worker pool. Steps that share a resource (for example, Homebrew's lock) never
+run at the same time. When a step fails, only the steps that depend on it are skipped.
+
+A step that fails with a network error is retried after a delay that doubles with each attempt. With an
+InstallJournal, the satisfied steps are recorded as they finish, and a run that was interrupted or had a failed
+step is continued by the next run of the same targets without redoing the recorded steps (see InstallJournal).
+"""
+
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from components.install_journal import InstallJournal
+from components.registry import ComponentRegistry
+from components.utils.command_result import CommandResult
+from components.utils.subproc import Subproc
+from components.utils.tracing import Tracer
+from components.version_files import VersionFiles
+
+class InstallStep:
+    """A node of the install graph."""
+
+    def __init__(self, name, dependencies, action, check=None, resource=None, batch=None, inputs=None):
+        """
+        Parameters:
+            name: the unique name of the step, e.g. 'brew' or 'asdf:python'.
+            dependencies: names of the steps that must succeed first.
+            action: a function without arguments that performs the install and returns a CommandResult.
+            check: an optional function without arguments that returns True if the step is already satisfied.
+            resource: an optional name of a resource that only one step may use at a time.
+            batch: an optional (key, function) tuple. Steps with the same key that are ready at the same time are
+                   installed together by one call of the function, which receives their names and returns a
+                   dictionary of step name to CommandResult.
+            inputs: an optional JSON-serializable description of what the step installs, such as a version spec.
+                    A step recorded in the install journal is redone when its inputs change.
+        """
+        self.name = name
+        self.dependencies = list(dependencies)
+        self.action = action
+        self.check = check
+        self.resource = resource
+        self.batch = batch
+        self.inputs = inputs
+
+class InstallScheduler:
+    # Result statuses of a step.
+    INSTALLED = "installed"
+    ALREADY_INSTALLED = "already installed"
+    FAILED = "failed"
+    TIMED_OUT = "timed out"
+    SKIPPED = "skipped"
+    RESUMED = "done in an earlier run"
+
+    # Number of times a step that failed with a network error is tried again, and the delay before the first retry.
+    DEFAULT_RETRIES = 2
+    DEFAULT_RETRY_DELAY = 5.0
+
+    # Errors of brew, curl, git and the asdf build tools when the network drops or a server is briefly unavailable.
+    TRANSIENT_ERRORS = re.compile(
+        r"Could not resolve host|Temporary failure in name resolution|nodename nor servname provided"
+        r"|Failed to connect|Connection (?:refused|reset|timed out)|Operation timed out|Network is unreachable"
+        r"|curl: \((?:6|7|18|28|35|52|56)\)|The requested URL returned error: 5\d\d|early EOF|unexpected disconnect",
+        re.IGNORECASE
+    )
+
+    # Maximum number of steps that run at the same time.
+    DEFAULT_MAX_WORKERS = 4
+
+    @staticmethod
+    def default_steps(on_output=None, log_dir=None, versions=None):
+        """
+        Returns the install graph of the registered components as a dictionary of step name to InstallStep:
+            xcode-select -> brew -> asdf, direnv (Brew.PLUGINS); asdf -> asdf:python, asdf:nodejs, asdf:ruby (Asdf.PLUGINS)
+
+        Parameters:
+            on_output: an optional function called with (step name, line) for every line of install output.
+            log_dir: an optional directory that receives the full output of each step as '<step name>.log'.
+            versions: an optional dictionary of asdf plugin step name (e.g. 'asdf:python') to the version spec to
+                      install (see Asdf.install_plugin()). A step with a version spec is skipped when that version is
+                      already installed.
+        """
+        versions = versions or {}
+        xcode = ComponentRegistry.get("xcode-select")
+        brew = ComponentRegistry.get("brew")
+        asdf = ComponentRegistry.get("asdf")
+
+        def on_line(name):
+            return (lambda line: on_output(name, line)) if on_output else None
+
+        def log_path(name):
+            return os.path.join(log_dir, name.replace(":", "-") + ".log") if log_dir else None
+
+        # All Homebrew plugin checks share one inventory query, made by the first check that needs it.
+        inventory_lock = threading.Lock()
+        inventory = []
+
+        def brew_inventory():
+            with inventory_lock:
+                if not inventory:
+                    inventory.append(brew.get_inventory().value)
+                return inventory[0]
+
+        def brew_plugin_installed(plugin_name):
+            # The Cellar answers without booting Homebrew; the inventory is the fallback when it cannot be found.
+            listed = VersionFiles.homebrew_formula_versions(plugin_name)
+            if listed is not None:
+                return listed.stdout != ""
+            return brew.is_plugin_installed(plugin_name, brew_inventory())
+
+        steps = [
+            InstallStep(
+                "xcode-select", [],
+                lambda: xcode.install(on_line("xcode-select"), log_path("xcode-select")),
+                # The package receipt answers without running xcode-select.
+                check=lambda: xcode.get_package_version() is not None or xcode.check_version().success
+            ),
+            InstallStep(
+                "brew", ["xcode-select"],
+                lambda: brew.install(on_line("brew"), log_path("brew")),
+                check=lambda: brew.check_version().success,
+                resource="brew"
+            ),
+        ]
+
+        # Homebrew plugins that are ready together are installed by one 'brew install a b ...' command.
+        brew_batch = ("brew install", lambda names: brew.install_plugins(names, on_output, log_path("brew-plugins")))
+        for plugin_name in brew.PLUGINS:
+            steps.append(InstallStep(
+                plugin_name, ["brew"],
+                lambda plugin_name=plugin_name: brew.install_plugin(plugin_name, on_line(plugin_name), log_path(plugin_name)),
+                check=lambda plugin_name=plugin_name: brew_plugin_installed(plugin_name),
+                resource="brew",
+                batch=brew_batch
+            ))
+        for plugin_name in asdf.PLUGINS:
+            name = f"asdf:{plugin_name}"
+            steps.append(InstallStep(
+                name, ["asdf"],
+                lambda plugin_name=plugin_name, name=name: asdf.install_plugin(plugin_name, versions.get(name), on_line(name), log_path(name)),
+                inputs=versions.get(name),
+                # Without a version spec the step installs whatever .tool-versions names, so it always runs.
+                check=(lambda plugin_name=plugin_name, spec=versions[name]: asdf.is_version_installed(plugin_name, spec))
+                      if name in versions else None
+            ))
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
+        return {step.name: step for step in steps}
+
+    @staticmethod
+    def plan(targets, steps=None):
+        """
+        Expands the targets with all of their prerequisites.
+
+        Returns:
+            The list of step names to run, prerequisites first.
+
+        Raises:
+            ValueError: if a target or dependency is unknown, or the dependencies form a cycle.
+        """
+        if steps is None:
+            steps = InstallScheduler.default_steps()
+
+        ordered = []
+        visiting = set()
+
+        def visit(name, path):
+            if name in ordered:
+                return
+            if name not in steps:
+                raise ValueError(f"Installation function for '{name}' is not supported.")
+            if name in visiting:
+                raise ValueError("Circular dependency: " + " -> ".join(path + [name]))
+            visiting.add(name)
+            for dependency in steps[name].dependencies:
+                visit(dependency, path + [name])
+            visiting.discard(name)
+            ordered.append(name)
+
+        for target in targets:
+            visit(target, [])
+        return ordered
+
+    @staticmethod
+    def is_transient(result):
+        """Returns True if a failed install result shows a network error, so the step may succeed if tried again."""
+        if result.success or result.timed_out:
+            return False
+        return bool(InstallScheduler.TRANSIENT_ERRORS.search(result.stderr or result.stdout))
+
+    @staticmethod
+    def run(targets, steps=None, max_workers=None, on_status=None, journal=None, retries=None, retry_delay=None):
+        """
+        Installs the targets and their prerequisites, running independent steps in parallel.
+
+        Parameters:
+            targets: names of the steps to install.
+            steps: the install graph; defaults to InstallScheduler.default_steps().
+            max_workers: size of the worker pool; defaults to InstallScheduler.DEFAULT_MAX_WORKERS.
+            on_status: an optional function called with (name, status) as each step finishes.
+            journal: an optional InstallJournal that records the satisfied steps, so that the next run of the same
+                     targets skips them if this run does not finish.
+            retries: number of retries of a step that fails with a network error; defaults to
+                     InstallScheduler.DEFAULT_RETRIES.
+            retry_delay: seconds before the first retry, doubled for each further one; defaults to
+                         InstallScheduler.DEFAULT_RETRY_DELAY.
+
+        Returns:
+            A dictionary mapping each planned step name, in plan order, to a result dictionary with:
+                - status: installed, already installed, done in an earlier run, failed, timed out or skipped.
+                - success: True if the step is satisfied, False otherwise.
+                - stdout: Standard output of the install command.
+                - stderr: Standard error of the install command, or the reason the step was skipped.
+        """
+        if steps is None:
+            steps = InstallScheduler.default_steps()
+        if max_workers is None:
+            max_workers = InstallScheduler.DEFAULT_MAX_WORKERS
+        if retries is None:
+            retries = InstallScheduler.DEFAULT_RETRIES
+        if retry_delay is None:
+            retry_delay = InstallScheduler.DEFAULT_RETRY_DELAY
+
+        order = InstallScheduler.plan(targets, steps)
+        hashes = {}
+        completed = {}
+        if journal is not None:
+            hashes = InstallJournal.input_hashes(order, steps)
+            completed = journal.begin(targets)
+        results = {}
+        running = {}
+        busy_resources = set()
+
+        def finish(name, status, result=None):
+            results[name] = {
+                'status': status,
+                'success': status in (InstallScheduler.INSTALLED, InstallScheduler.ALREADY_INSTALLED, InstallScheduler.RESUMED),
+                'stdout': result.stdout if result is not None else "",
+                'stderr': result.stderr if result is not None else ""
+            }
+            if journal is not None and status in (InstallScheduler.INSTALLED, InstallScheduler.ALREADY_INSTALLED):
+                journal.record_step(name, hashes[name])
+            if on_status:
+                on_status(name, status)
+
+        def status_of(result):
+            if result.success:
+                return InstallScheduler.INSTALLED
+            if result.timed_out:
+                return InstallScheduler.TIMED_OUT
+            return InstallScheduler.FAILED
+
+        def install(group):
+            if len(group) == 1:
+                return {group[0].name: group[0].action()}
+            return group[0].batch[1]([step.name for step in group])
+
+        def execute(group):
+            outcomes = {}
+            pending = []
+            for step in group:
+                satisfied = False
+                if step.check is not None:
+                    with Tracer.span(f"check {step.name}"):
+                        satisfied = step.check()
+                if satisfied:
+                    outcomes[step.name] = (InstallScheduler.ALREADY_INSTALLED, None)
+                else:
+                    pending.append(step)
+            installed = {}
+            if pending:
+                with Tracer.span("install " + " ".join(step.name for step in pending)):
+                    installed = install(pending)
+            for attempt in range(retries):
+                failed = [step for step in pending if step.name in installed and InstallScheduler.is_transient(installed[step.name])]
+                delay = retry_delay * 2 ** attempt
+                remaining = Subproc.effective_timeout(None)
+                if not failed or (remaining is not None and remaining <= delay):
+                    break
+                time.sleep(delay)
+                with Tracer.span("retry " + " ".join(step.name for step in failed)):
+                    installed.update(install(failed))
+            for name, result in installed.items():
+                outcomes[name] = (status_of(result), result)
+            return outcomes
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while len(results) < len(order):
+                # Skip the steps whose prerequisites failed and collect the steps that are ready.
+                started = {name for group in running.values() for name in group}
+                ready = []
+                for name in order:
+                    if name in results or name in started:
+                        continue
+                    step = steps[name]
+                    failed = [d for d in step.dependencies if d in results and not results[d]['success']]
+                    if failed:
+                        finish(name, InstallScheduler.SKIPPED, CommandResult.failure(f"Skipped because '{failed[0]}' did not install."))
+                    elif name in completed and completed[name] == hashes[name] and all(d in results for d in step.dependencies):
+                        finish(name, InstallScheduler.RESUMED)
+                    elif all(d in results for d in step.dependencies):
+                        ready.append(step)
+
+                # Start every ready step whose resource is free, together with the ready steps of the same batch.
+                for step in ready:
+                    if step.name in started or step.resource in busy_resources:
+                        continue
+                    group = [step]
+                    if step.batch is not None:
+                        group = [other for other in ready if other.batch is not None and other.batch[0] == step.batch[0]
+                                 and other.resource == step.resource and other.name not in started]
+                    if step.resource is not None:
+                        busy_resources.add(step.resource)
+                    started.update(member.name for member in group)
+                    running[executor.submit(execute, group)] = [member.name for member in group]
+
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    group = running.pop(future)
+                    busy_resources.discard(steps[group[0]].resource)
+                    try:
+                        outcomes = future.result()
+                    except Exception as e:
+                        outcomes = {name: (InstallScheduler.FAILED, CommandResult.failure(str(e))) for name in group}
+                    for name in group:
+                        status, result = outcomes.get(name, (InstallScheduler.FAILED, CommandResult.failure("No result was reported.")))
+                        finish(name, status, result)
+
+        if journal is not None and all(result['success'] for result in results.values()):
+            journal.end()
+        return {name: results[name] for name in order}
+
+if __name__ == '__main__':
+    # Add the project root directory to the Python path
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    import utils.unit_test as utils
+
+    utils.print_unit_test_header("InstallScheduler.plan")
+    print(InstallScheduler.plan(["asdf:python", "direnv"]))
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the components.inventory_snapshot module that stores the result of a scan together with fingerprints of
+the files each probe depends on.
+
+A fingerprint is a list of [path, inode, size, mtime_ns] identities (None for a missing path) of:
+    - the executable the probe runs, as resolved on PATH (so a new binary earlier on PATH changes it),
+    - the Cellar directory of the formula when the executable was installed by Homebrew,
+    - for 'brew --version': the git refs of the Homebrew repository,
+    - for 'xcode-select --version': the command-line tools package receipts,
+    - for 'asdf <plugin> list': the asdf installs directory of the plugin.
+A later scan reuses a stored result as long as the probe's fingerprint is unchanged, so an unchanged machine is
+scanned with a few stat() calls and no processes. Probes without a known fingerprint are always run.
+"""
+
+import json
+import os
+import re
+import socket
+import tempfile
+import time
+
+from components.utils.command_result import CommandResult
+from components.utils.probe_cache import ProbeCache
+from components.version_files import VersionFiles
+
+class InventorySnapshot:
+    # Bump when the layout of the snapshot file changes; older files are ignored.
+    FORMAT_VERSION = 1
+
+    def __init__(self, entries=None, host=None, created=None):
+        """
+        Parameters:
+            entries: a dictionary of probe name to entry, each with the keys command, fingerprint, version and result
+                     (see CommandResult.to_dict()).
+            host: the host name of the scanned machine.
+            created: the time of the scan (seconds since the epoch).
+        """
+        self.entries = entries if entries is not None else {}
+        self.host = host if host is not None else socket.gethostname()
+        self.created = created if created is not None else time.time()
+
+    @staticmethod
+    def default_path():
+        """Returns the path of the local snapshot file."""
+        return os.path.join(ProbeCache.cache_dir(), "snapshot.json")
+
+    # Fingerprints
+
+    @staticmethod
+    def path_identity(path):
+        """Returns [path, inode, size, mtime_ns] of a file or directory, or [path, None] if it does not exist."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return [path, None]
+        return [path, stat.st_ino, stat.st_size, stat.st_mtime_ns]
+
+    @staticmethod
+    def fingerprint(command):
+        """
+        Returns a JSON-serializable fingerprint of the files the output of the probe command depends on,
+        or None if the probe has no known fingerprint and must always run.
+        """
+        if not isinstance(command, list) or not command:
+            return None
+        is_version = command[1:] == ["--version"]
+        is_asdf_list = command[0] == "asdf" and len(command) == 3 and command[2] == "list"
+        if not (is_version or is_asdf_list):
+            return None
+
+        executable = ProbeCache.binary_identity(command[0])
+        parts = [executable or [command[0], None]]
+        if executable:
+            match = re.match(r"(.*/Cellar/[^/]+)/", executable[0])
+            if match:
+                parts.append(InventorySnapshot.path_identity(match.group(1)))
+
+        if command == ["brew", "--version"]:
+            parts.extend(InventorySnapshot.path_identity(path) for path in VersionFiles.homebrew_ref_paths())
+        elif command == ["xcode-select", "--version"]:
+            parts.extend(InventorySnapshot.path_identity(receipt) for receipt in VersionFiles.CLT_RECEIPTS)
+        elif is_asdf_list:
+            parts.append(InventorySnapshot.path_identity(os.path.join(VersionFiles.asdf_data_dir(), "installs", command[1])))
+        return parts
+
+    # Entries
+
+    def add(self, name, command, fingerprint, result):
+        """Stores the result of a probe with the fingerprint taken before it ran."""
+        version = result.version
+        self.entries[name] = {
+            "command": command,
+            "fingerprint": fingerprint,
+            "version": str(version) if version is not None else None,
+            "result": result.to_dict(),
+        }
+
+    def reuse(self, name, command, fingerprint):
+        """
+        Returns the stored CommandResult of the probe if it ran the same command and its fingerprint is unchanged,
+        otherwise None. Results of probes that timed out are never reused.
+        """
+        entry = self.entries.get(name)
+        if fingerprint is None or entry is None or entry["command"] != command or entry["fingerprint"] != fingerprint:
+            return None
+        if entry["result"].get("timed_out"):
+            return None
+        return CommandResult.from_dict(entry["result"])
+
+    def results(self):
+        """Returns a dictionary of probe name to the stored CommandResult."""
+        return {name: CommandResult.from_dict(entry["result"]) for name, entry in self.entries.items()}
+
+    # Files
+
+    def to_dict(self):
+        """Returns the snapshot as a JSON-serializable dictionary."""
+        return {"format": InventorySnapshot.FORMAT_VERSION, "host": self.host, "created": self.created, "entries": self.entries}
+
+    @staticmethod
+    def from_dict(data):
+        """
+        Builds a snapshot from to_dict() output.
+
+        Raises:
+            ValueError: if the data is not a snapshot of the current format.
+        """
+        if not isinstance(data, dict) or data.get("format") != InventorySnapshot.FORMAT_VERSION:
+            raise ValueError("Not a beezeebot inventory snapshot of format %d." % InventorySnapshot.FORMAT_VERSION)
+        return InventorySnapshot(data.get("entries", {}), data.get("host"), data.get("created"))
+
+    @staticmethod
+    def load(path=None):
+        """Returns the snapshot stored at 'path' (default: the local snapshot), or None if there is no readable snapshot."""
+        try:
+            with open(path or InventorySnapshot.default_path(), "r", encoding="utf-8") as f:
+                return InventorySnapshot.from_dict(json.load(f))
+        except (OSError, ValueError):
+            return None
+
+    def save(self, path=None):
+        """Writes the snapshot atomically to 'path' (default: the local snapshot)."""
+        path = path or InventorySnapshot.default_path()
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".snapshot-")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f)
+            os.replace(temp_path, path)
+        except OSError:
+            # The snapshot is only an optimization; failing to write it must not fail the scan.
+            pass
+
+    # Changes
+
+    @staticmethod
+    def describe(entry):
+        """Returns a one-line description of a stored entry, e.g. 'Homebrew 4.4.24' or 'not installed'."""
+        result = entry["result"]
+        if result.get("timed_out"):
+            return "timed out"
+        if result.get("returncode") != 0:
+            return "not installed"
+        return result.get("stdout", "").split("\n", 1)[0] or "installed"
+
+    @staticmethod
+    def diff(old, new):
+        """
+        Compares two snapshots.
+
+        Returns:
+            A list of (name, before, after) tuples for the probes whose description changed, in the order of the new
+            snapshot followed by removed probes. 'before' is None for added probes and 'after' is None for removed ones.
+        """
+        old_entries = old.entries if old is not None else {}
+        changes = []
+        for name, entry in new.entries.items():
+            after = InventorySnapshot.describe(entry)
+            before = InventorySnapshot.describe(old_entries[name]) if name in old_entries else None
+            if before != after:
+                changes.append((name, before, after))
+        for name, entry in old_entries.items():
+            if name not in new.entries:
+                changes.append((name, InventorySnapshot.describe(entry), None))
+        return changes
@@ -12,7 +12,32 @@ This is the components.mac_platform module that gets the MacOS version.
 
 import platform
 
-class MacPlatform:
+from components.utils.command_result import CommandResult
+from components.utils.installable_component import InstallableComponent
+
+class MacPlatform(InstallableComponent):
+    NOT_INSTALLED_MSG = "The macOS version could not be determined. This is not a macOS system."
+
+    def install(self):
+        """The operating system cannot be installed."""
+        return InstallableComponent.not_supported("Installing macOS")
+
+    def uninstall(self):
+        """The operating system cannot be uninstalled."""
+        return InstallableComponent.not_supported("Uninstalling macOS")
+
+    def check_version(self, refresh=False):
+        """
+        Returns a CommandResult with:
+            - success: True if the macOS version is known, False otherwise.
+            - stdout: The macOS version, e.g. 'macOS 15.3.1'.
+            - stderr: Empty.
+        """
+        version = MacPlatform.get_macos_version()
+        if not version:
+            return CommandResult(1)
+        return CommandResult.ok("macOS " + version)
+
     @staticmethod
     def get_macos_version():
         """
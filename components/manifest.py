@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the components.manifest module that reads the desired toolchain of a machine from a TOML file.
+
+A manifest names the components to install, the plugins of each application and, for asdf plugins, the version each
+must have installed:
+
+    components = ["xcode-select", "brew"]
+
+    [plugins]
+    brew = ["direnv"]
+
+    [plugins.asdf]
+    python = "3.12.1"
+    nodejs = "latest:20"
+    ruby = ""
+
+A list of plugins installs them without a pinned version; a table maps each plugin to a version spec (see
+Asdf.install_plugin()), where an empty spec means no pin. Prerequisites do not need to be listed.
+
+Manifest.plan() compares the manifest with the machine using the install checks of InstallScheduler.default_steps(),
+which read versions from disk or the probe cache, so a machine that is already set up is checked without installing
+or booting anything. Converging runs the same steps with InstallScheduler.run(), which installs only the steps whose
+check fails.
+"""
+
+from components.registry import ComponentRegistry
+
+class Manifest:
+    # Plan actions of a step.
+    KEEP = "keep"
+    INSTALL = "install"
+
+    # Application -> format of the install step name of its plugins.
+    PLUGIN_STEPS = {
+        "brew": "{plugin}",
+        "asdf": "asdf:{plugin}",
+    }
+
+    def __init__(self, targets, versions=None, path=None):
+        """
+        Parameters:
+            targets: names of the install steps the manifest asks for, e.g. ['brew', 'direnv', 'asdf:python'].
+            versions: a dictionary of asdf plugin step name to version spec.
+            path: the file the manifest was read from, if any.
+        """
+        self.targets = list(targets)
+        self.versions = dict(versions or {})
+        self.path = path
+
+    @staticmethod
+    def parse(data, path=None):
+        """
+        Builds a Manifest from the parsed TOML document.
+
+        Raises:
+            ValueError: if the document names an unknown key, component or plugin, or has a value of the wrong type.
+        """
+        unknown = set(data) - {"components", "plugins"}
+        if unknown:
+            raise ValueError(f"Unknown manifest key '{sorted(unknown)[0]}'; expected 'components' and 'plugins'.")
+
+        components = data.get("components", [])
+        if not isinstance(components, list) or not all(isinstance(name, str) for name in components):
+            raise ValueError("'components' must be a list of names.")
+        targets = []
+        for name in components:
+            if not ComponentRegistry.is_registered(name):
+                raise ValueError(f"Unknown component '{name}'.")
+            targets.append(name)
+
+        plugins = data.get("plugins", {})
+        if not isinstance(plugins, dict):
+            raise ValueError("'plugins' must be a table of application to plugins.")
+        versions = {}
+        for app, listed in plugins.items():
+            if app not in Manifest.PLUGIN_STEPS:
+                raise ValueError(f"Plugins of '{app}' cannot be installed; expected one of: {', '.join(Manifest.PLUGIN_STEPS)}.")
+            if isinstance(listed, list):
+                listed = {plugin: "" for plugin in listed}
+            if not isinstance(listed, dict):
+                raise ValueError(f"'plugins.{app}' must be a list of plugins or a table of plugin to version.")
+            available = ComponentRegistry.get(app).PLUGINS
+            for plugin, spec in listed.items():
+                if plugin not in available:
+                    raise ValueError(f"Plugin '{plugin}' not found in the list of available {app} plugins.")
+                if not isinstance(spec, str):
+                    raise ValueError(f"The version of 'plugins.{app}.{plugin}' must be a string.")
+                if spec and app != "asdf":
+                    raise ValueError(f"Versions can only be chosen for asdf plugins, not for '{plugin}'.")
+                name = Manifest.PLUGIN_STEPS[app].format(plugin=plugin)
+                targets.append(name)
+                if spec:
+                    versions[name] = spec
+
+        return Manifest(list(dict.fromkeys(targets)), versions, path)
+
+    @staticmethod
+    def load(path):
+        """
+        Reads a manifest from a TOML file.
+
+        Raises:
+            ValueError: if the file cannot be read or parsed, or is not a valid manifest.
+        """
+        try:
+            import tomllib
+        except ImportError:
+            # Python before 3.11 reads TOML with the tomli package, which tomllib is based on.
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise ValueError("Reading a manifest needs Python 3.11 or later, or the 'tomli' package.") from None
+        try:
+            with open(path, "rb") as f:
+                data = tomllib.load(f)
+        except OSError as e:
+            raise ValueError(f"Could not read the manifest {path}: {e.strerror}") from None
+        except tomllib.TOMLDecodeError as e:
+            raise ValueError(f"Could not parse the manifest {path}: {e}") from None
+        return Manifest.parse(data, path)
+
+    def install_targets(self):
+        """Returns the targets in the form --install takes them, e.g. 'asdf:python@3.12.1'."""
+        return [f"{name}@{self.versions[name]}" if name in self.versions else name for name in self.targets]
+
+    def steps(self, **kwargs):
+        """Returns the install graph for this manifest: InstallScheduler.default_steps() with its versions."""
+        from components.install_scheduler import InstallScheduler
+        return InstallScheduler.default_steps(versions=self.versions, **kwargs)
+
+    def plan(self, steps=None):
+        """
+        Compares the manifest with the machine, without installing anything.
+
+        Parameters:
+            steps: the install graph; defaults to self.steps().
+
+        Returns:
+            A list, in install order and including prerequisites, of (step name, action, reason) tuples where action is
+            Manifest.KEEP for a step whose check passes and Manifest.INSTALL for a step that converging would run.
+
+        Raises:
+            ValueError: if a target is not a step of the install graph.
+        """
+        from components.install_scheduler import InstallScheduler
+        from components.utils.tracing import Tracer
+
+        if steps is None:
+            steps = self.steps()
+        planned = []
+        for name in InstallScheduler.plan(self.targets, steps):
+            step = steps[name]
+            spec = self.versions.get(name)
+            if step.check is None:
+                planned.append((name, Manifest.INSTALL, "cannot be checked, so it always runs"))
+                continue
+            with Tracer.span(f"check {name}"):
+                satisfied = step.check()
+            if satisfied:
+                planned.append((name, Manifest.KEEP, f"{spec} installed" if spec else "installed"))
+            else:
+                planned.append((name, Manifest.INSTALL, f"{spec} not installed" if spec else "not installed"))
+        return planned
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the components.registry module, the table of every InstallableComponent known to beezeebot.
+
+Components are declared by name with the module and class that implement them. A module is only imported the first
+time its component is used, so start-up time does not grow with the number of registered components, and the CLI
+dispatches --install, --version, --plugin, --options and --scan with a table lookup.
+"""
+
+import importlib
+
+class ComponentRegistry:
+    # name -> (module, class name, description shown by --options)
+    COMPONENTS = {
+        "xcode-select": ("components.xcode", "Xcode", "Xcode command-line tools"),
+        "brew": ("components.brew", "Brew", "Homebrew package manager"),
+        "asdf": ("components.asdf", "Asdf", "programming language version manager"),
+        "macos": ("components.mac_platform", "MacPlatform", "macOS operating system (--version only)"),
+    }
+
+    # name -> component instance, filled as components are loaded
+    instances = {}
+
+    @staticmethod
+    def register(name, module_name, class_name, description):
+        """Declares a component without importing it."""
+        ComponentRegistry.COMPONENTS[name] = (module_name, class_name, description)
+        ComponentRegistry.instances.pop(name, None)
+
+    @staticmethod
+    def names():
+        """Returns the names of all registered components, in registration order."""
+        return list(ComponentRegistry.COMPONENTS)
+
+    @staticmethod
+    def is_registered(name):
+        """Returns True if a component with this name is registered."""
+        return name in ComponentRegistry.COMPONENTS
+
+    @staticmethod
+    def description(name):
+        """Returns the description of a registered component without loading it."""
+        return ComponentRegistry.COMPONENTS[name][2]
+
+    @staticmethod
+    def get(name):
+        """
+        Returns the instance of a registered component, importing its module on first use.
+
+        Raises:
+            KeyError: if no component with this name is registered.
+        """
+        component = ComponentRegistry.instances.get(name)
+        if component is None:
+            module_name, class_name, _ = ComponentRegistry.COMPONENTS[name]
+            component_class = getattr(importlib.import_module(module_name), class_name)
+            component = component_class()
+            ComponentRegistry.instances[name] = component
+        return component
+
+    @staticmethod
+    def load_all():
+        """Returns the instances of all registered components, loading the ones that are not loaded yet."""
+        return [ComponentRegistry.get(name) for name in ComponentRegistry.names()]
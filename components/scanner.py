@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the components.scanner module that inventories the installed utilities and applications.
+All probes are launched at the same time, so a scan takes about as long as the slowest probe rather than the sum of all of them.
+"""
+
+import asyncio
+
+from components.inventory_snapshot import InventorySnapshot
+from components.utils.probe_cache import ProbeCache
+from components.utils.subproc import Subproc
+from components.version_files import VersionFiles
+from components.registry import ComponentRegistry
+
+class Scanner:
+    # Seconds a single probe may run before it is killed.
+    DEFAULT_TIMEOUT = 15
+
+    @staticmethod
+    def get_probes():
+        """
+        Collects the probes of every registered component as a list of (name, command, timeout) tuples,
+        in registration order.
+        """
+        probes = []
+        for component in ComponentRegistry.load_all():
+            probes.extend(component.get_probes())
+        return probes
+
+    @staticmethod
+    async def scan_async(probes=None, timeout=None, refresh=False, snapshot_path=None):
+        """
+        Runs all probes concurrently, each with its own timeout. Unless 'refresh' is True, probes are first
+        answered from the previous inventory snapshot when their fingerprint is unchanged (see InventorySnapshot),
+        then from version files on disk (see VersionFiles), then cacheable probes ('--version' commands) from the
+        probe cache when their executable has not changed; only the remaining probes are run. The results are
+        written as the new snapshot.
+
+        Parameters:
+            probes: list of (name, command, timeout) tuples; defaults to Scanner.get_probes().
+            timeout: the timeout for probes that do not declare their own; defaults to Scanner.DEFAULT_TIMEOUT.
+            refresh: True to ignore cached results and run every probe.
+            snapshot_path: the snapshot file to read and write; defaults to InventorySnapshot.default_path().
+
+        Returns:
+            A dictionary mapping each probe name to the CommandResult of Subproc.run_command_async(),
+            in the same order as the probes.
+        """
+        if probes is None:
+            probes = Scanner.get_probes()
+        if timeout is None:
+            timeout = Scanner.DEFAULT_TIMEOUT
+
+        cache = ProbeCache.shared()
+        previous = None if refresh else InventorySnapshot.load(snapshot_path)
+        snapshot = InventorySnapshot()
+        fingerprints = {}
+        results = {}
+        pending = []
+        for name, command, probe_timeout in probes:
+            # Taken before the probe runs, so a change made while it runs is seen by the next scan.
+            fingerprints[name] = InventorySnapshot.fingerprint(command)
+            known = None
+            if not refresh:
+                known = ((previous and previous.reuse(name, command, fingerprints[name]))
+                         or VersionFiles.read(command) or cache.get(command))
+            if known is not None:
+                results[name] = known
+            else:
+                pending.append((name, command, probe_timeout if probe_timeout is not None else timeout))
+
+        fresh = await asyncio.gather(*[
+            Subproc.run_command_async(command, probe_timeout) for _, command, probe_timeout in pending
+        ])
+        for (name, command, _), result in zip(pending, fresh):
+            cache.put(command, result)
+            results[name] = result
+        cache.save()
+
+        for name, command, _ in probes:
+            snapshot.add(name, command, fingerprints[name], results[name])
+        snapshot.save(snapshot_path)
+
+        return {name: results[name] for name, _, _ in probes}
+
+    @staticmethod
+    def scan(probes=None, timeout=None, refresh=False, snapshot_path=None):
+        """
+        Synchronous entry point for scan_async(). Returns the inventory dictionary.
+        """
+        return asyncio.run(Scanner.scan_async(probes, timeout, refresh, snapshot_path))
+
+if __name__ == '__main__':
+    # Add the project root directory to the Python path
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    import utils.unit_test as utils
+
+    utils.print_unit_test_header("Scanner.scan")
+    for name, result in Scanner.scan().items():
+        if result.success:
+            print(f"{name}:", result.stdout)
+        else:
+            print(f"{name}: not available ({result.stderr})")
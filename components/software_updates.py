@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the components.software_updates module that checks for macOS software updates in the background.
+
+'softwareupdate -l' contacts Apple's update catalog and can take minutes, so no command waits for it. Instead:
+    - refresh() starts the check as a detached shell job that writes the output and exit status to files in the
+      beezeebot cache directory, and returns at once;
+    - collect() parses the files of a finished job into update records and saves them with the time of the check
+      ('software-updates.json');
+    - check() collects, starts a new job when the saved result is older than the maximum age, and returns the last
+      known result, which tells how old it is and whether a newer check is running.
+The job outlives the CLI process that started it; whichever beezeebot command runs next collects its result.
+"""
+
+import json
+import os
+import re
+import shlex
+import signal
+import subprocess
+import tempfile
+import time
+
+from components.utils.probe_cache import ProbeCache
+from components.utils.process_group import ProcessGroup
+
+class SoftwareUpdates:
+    # Bump when the layout of the result file changes; older files are ignored.
+    FORMAT_VERSION = 1
+
+    # Seconds a check result is considered fresh; an older one is shown while a new check runs.
+    DEFAULT_MAX_AGE = 24 * 60 * 60
+
+    # Seconds a background check may run before it is killed and started again; it matches Xcode.SOFTWARE_UPDATE_TIMEOUT.
+    JOB_TIMEOUT = 600
+
+    # Seconds before a check that failed (e.g. offline) is tried again automatically.
+    RETRY_AFTER_FAILURE = 60 * 60
+
+    COMMAND = ["softwareupdate", "-l"]
+
+    # macOS 11+: '* Label: macOS Sequoia 15.1-24B83' followed by
+    #            '\tTitle: macOS Sequoia 15.1, Version: 15.1, Size: 3040677KiB, Recommended: YES, Action: restart, '
+    LABEL = re.compile(r"^\s*\*\s*Label:\s*(?P<label>.+?)\s*$")
+    FIELD = re.compile(r"(?P<key>Title|Version|Size|Recommended|Action):\s*(?P<value>[^,]*)")
+    # macOS 10.x: '   * Safari11.0.3Sierra-11.0.3' followed by '\tSafari (11.0.3), 60953K [recommended] [restart]'
+    OLD_LABEL = re.compile(r"^\s*\*\s*(?P<label>[^:]+?)\s*$")
+    OLD_DETAILS = re.compile(r"^\s*(?P<title>.+?)\s*\((?P<version>[^)]*)\),\s*(?P<size>\S+?)K?(?P<flags>(\s*\[\w+\])*)\s*$")
+
+    def __init__(self, directory=None):
+        """
+        Parameters:
+            directory: where the result and the job files are kept; defaults to the beezeebot cache directory.
+        """
+        self.directory = directory if directory is not None else ProbeCache.cache_dir()
+        self.path = os.path.join(self.directory, "software-updates.json")
+        self.job_prefix = os.path.join(self.directory, "software-updates.job")
+
+    # Parsing
+
+    @staticmethod
+    def parse(text):
+        """
+        Parses the output of 'softwareupdate -l' (standard output and error combined).
+
+        Returns:
+            A list of update records: dictionaries with label, title, version, size_kib, recommended and restart.
+        """
+        updates = []
+        current = None
+        for line in text.splitlines():
+            match = SoftwareUpdates.LABEL.match(line) or SoftwareUpdates.OLD_LABEL.match(line)
+            if match:
+                current = {"label": match.group("label"), "title": match.group("label"), "version": None,
+                           "size_kib": None, "recommended": False, "restart": False}
+                updates.append(current)
+                continue
+            if current is None or not line.strip():
+                continue
+            fields = {m.group("key"): m.group("value").strip() for m in SoftwareUpdates.FIELD.finditer(line)}
+            if fields:
+                current["title"] = fields.get("Title") or current["title"]
+                current["version"] = fields.get("Version") or None
+                size = re.match(r"(\d+)", fields.get("Size", ""))
+                current["size_kib"] = int(size.group(1)) if size else None
+                current["recommended"] = fields.get("Recommended", "").upper() == "YES"
+                current["restart"] = fields.get("Action", "").lower() == "restart"
+                continue
+            match = SoftwareUpdates.OLD_DETAILS.match(line)
+            if match:
+                current["title"] = match.group("title")
+                current["version"] = match.group("version") or None
+                current["size_kib"] = int(match.group("size")) if match.group("size").isdigit() else None
+                current["recommended"] = "[recommended]" in match.group("flags")
+                current["restart"] = "[restart]" in match.group("flags")
+        return updates
+
+    # Result file
+
+    def load(self):
+        """
+        Returns the saved result, or None if there is none: a dictionary with
+            - checked: the time of the last successful check (seconds since the epoch);
+            - updates: the update records of that check (see parse());
+            - error, failed: the error and time of a later check that failed, if any.
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("format") != SoftwareUpdates.FORMAT_VERSION:
+            return None
+        return data
+
+    def save(self, data):
+        data = dict(data, format=SoftwareUpdates.FORMAT_VERSION)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=".software-updates-")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass
+
+    # Background job
+
+    def job_file(self, suffix):
+        return f"{self.job_prefix}.{suffix}"
+
+    def job_pid(self):
+        """Returns the process id of the running background check, or None if none is running."""
+        try:
+            with open(self.job_file("pid"), "r", encoding="utf-8") as f:
+                pid = int(f.read().strip())
+            started = os.stat(self.job_file("pid")).st_mtime
+        except (OSError, ValueError):
+            return None
+        if os.path.exists(self.job_file("rc")):
+            return None
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return None
+        except PermissionError:
+            pass
+        if time.time() - started > SoftwareUpdates.JOB_TIMEOUT:
+            # The check hangs; its whole process group is killed so that a new one can start.
+            try:
+                ProcessGroup.signal_group(os.getpgid(pid), signal.SIGKILL)
+            except OSError:
+                pass
+            return None
+        return pid
+
+    def refresh(self):
+        """
+        Starts a background check unless one is running. Returns immediately.
+
+        Returns:
+            The process id of the running check, or None if it could not be started.
+        """
+        pid = self.job_pid()
+        if pid is not None:
+            return pid
+        for suffix in ("out", "rc", "pid"):
+            try:
+                os.unlink(self.job_file(suffix))
+            except FileNotFoundError:
+                pass
+        os.makedirs(self.directory, exist_ok=True)
+        out, rc = shlex.quote(self.job_file("out")), shlex.quote(self.job_file("rc"))
+        # The exit status is written last and renamed into place, so a complete 'rc' file means the output is complete.
+        script = f"{shlex.join(SoftwareUpdates.COMMAND)} > {out} 2>&1; echo $? > {rc}.tmp; mv {rc}.tmp {rc}"
+        # The job runs in the background of a shell that exits at once and prints its process id, so the job is
+        # adopted by init instead of waiting to be reaped by this process.
+        try:
+            launcher = subprocess.run(
+                ["/bin/sh", "-c", f"( {script} ) </dev/null >/dev/null 2>&1 & echo $!"],
+                stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=10, **ProcessGroup.popen_kwargs()
+            )
+            pid = int(launcher.stdout.strip())
+        except (OSError, ValueError, subprocess.SubprocessError):
+            return None
+        with open(self.job_file("pid"), "w", encoding="utf-8") as f:
+            f.write(str(pid))
+        return pid
+
+    def collect(self):
+        """
+        Saves the result of a finished background check, if there is one.
+
+        Returns:
+            True if a result was collected.
+        """
+        try:
+            with open(self.job_file("rc"), "r", encoding="utf-8") as f:
+                returncode = int(f.read().strip() or -1)
+            with open(self.job_file("out"), "r", encoding="utf-8", errors="replace") as f:
+                output = f.read()
+            finished = os.stat(self.job_file("rc")).st_mtime
+        except (OSError, ValueError):
+            return False
+        data = self.load() or {}
+        if returncode == 0:
+            data = {"checked": finished, "updates": SoftwareUpdates.parse(output)}
+        else:
+            data.update(error=output.strip().splitlines()[-1] if output.strip() else f"exit status {returncode}", failed=finished)
+        self.save(data)
+        for suffix in ("out", "rc", "pid"):
+            try:
+                os.unlink(self.job_file(suffix))
+            except FileNotFoundError:
+                pass
+        return True
+
+    def check(self, refresh=False, max_age=None):
+        """
+        Returns the last known result at once (see load(), or None if no check has finished yet) with two more keys:
+            - age: seconds since the last successful check, or None;
+            - running: True if a background check is running.
+        A background check is started when the result is older than 'max_age' seconds or missing, unless a check
+        failed within RETRY_AFTER_FAILURE seconds, and always if 'refresh' is True.
+        """
+        max_age = max_age if max_age is not None else SoftwareUpdates.DEFAULT_MAX_AGE
+        self.collect()
+        data = self.load()
+        age = time.time() - data["checked"] if data and "checked" in data else None
+        recently_failed = data is not None and time.time() - data.get("failed", 0) < SoftwareUpdates.RETRY_AFTER_FAILURE
+        if refresh or ((age is None or age > max_age) and not recently_failed):
+            self.refresh()
+        result = dict(data or {}, age=age, running=self.job_pid() is not None)
+        return result if data or result["running"] else None
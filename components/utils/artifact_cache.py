@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the components.artifact_cache module that keeps downloaded installer artifacts (install scripts, source
+tarballs, ...) in a local content-addressed store.
+
+Artifacts are stored as objects/<sha256>. An artifact with a known checksum is downloaded at most once and verified
+before it is stored; without a checksum, the latest download of a URL is reused for 'max_age' seconds and then
+revalidated with a conditional request (If-None-Match / If-Modified-Since), so an unchanged artifact costs a single
+304 round trip. Interrupted downloads resume with an HTTP Range request. The least recently used files are evicted
+once the store grows beyond its size limit. Downloads go through HttpFetcher, which reuses connections, and
+fetch_all() downloads independent artifacts at the same time.
+
+The store can be shared: $BEEZEEBOT_ARTIFACT_DIR points it at a shared directory, and $BEEZEEBOT_ARTIFACT_MIRROR at
+a LAN mirror that serves artifacts as <mirror>/<sha256>, e.g. 'python -m http.server' run in the objects directory
+of another machine. python-build and ruby-build (used by asdf) read mirrors of the same layout, so build_env()
+points them at the mirror as well as at download caches inside the store.
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from components.utils.probe_cache import ProbeCache
+
+class ArtifactCache:
+    # Size limit of the store in bytes; $BEEZEEBOT_ARTIFACT_MAX_MB overrides it.
+    DEFAULT_MAX_BYTES = 4 * 1024 * 1024 * 1024
+
+    CHUNK_SIZE = 1024 * 1024
+
+    # Downloads run at the same time by fetch_all().
+    MAX_PARALLEL_DOWNLOADS = 4
+
+    # Environment variable prefixes of the asdf build tools, by plugin. Each tool keeps its own download cache in
+    # build/<plugin>; python-build and ruby-build also fetch from a mirror that serves files by checksum.
+    BUILD_TOOLS = {"python": "PYTHON_BUILD", "ruby": "RUBY_BUILD", "nodejs": "NODE_BUILD"}
+    MIRROR_TOOLS = ["python", "ruby"]
+
+    def __init__(self, root=None, max_bytes=None, mirror=None, fetcher=None):
+        """
+        Parameters:
+            root: the store directory; defaults to ArtifactCache.default_root().
+            max_bytes: the size limit; defaults to $BEEZEEBOT_ARTIFACT_MAX_MB or ArtifactCache.DEFAULT_MAX_BYTES.
+            mirror: the base URL of a mirror serving <mirror>/<sha256>; defaults to $BEEZEEBOT_ARTIFACT_MIRROR.
+            fetcher: the HttpFetcher used for downloads; defaults to HttpFetcher.default().
+        """
+        self.root = root or ArtifactCache.default_root()
+        if max_bytes is None:
+            max_mb = os.environ.get("BEEZEEBOT_ARTIFACT_MAX_MB")
+            max_bytes = int(max_mb) * 1024 * 1024 if max_mb else ArtifactCache.DEFAULT_MAX_BYTES
+        self.max_bytes = max_bytes
+        self.mirror = mirror if mirror is not None else os.environ.get("BEEZEEBOT_ARTIFACT_MIRROR")
+        self.fetcher = fetcher
+        # Serializes updates of the URL index by the threads of fetch_all().
+        self.index_lock = threading.Lock()
+
+    @staticmethod
+    def default_root():
+        """Returns the store directory: $BEEZEEBOT_ARTIFACT_DIR, else 'artifacts' in the beezeebot cache directory."""
+        return os.environ.get("BEEZEEBOT_ARTIFACT_DIR") or os.path.join(ProbeCache.cache_dir(), "artifacts")
+
+    def object_path(self, sha256):
+        return os.path.join(self.root, "objects", sha256.lower())
+
+    def partial_path(self, url, sha256=None):
+        """Returns the file an interrupted download of the artifact is kept in until it is resumed."""
+        key = sha256.lower() if sha256 else hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.root, "partial", key + ".part")
+
+    # URL index
+
+    def index_path(self):
+        return os.path.join(self.root, "urls.json")
+
+    def load_index(self):
+        try:
+            with open(self.index_path(), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_index(self, index):
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.root, prefix=".urls-")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(index, f)
+            os.replace(temp_path, self.index_path())
+        except OSError:
+            # The index only maps URLs without a checksum to their last download.
+            pass
+
+    def remember(self, url, sha256, **details):
+        """Records the object that 'url' was last downloaded as, with optional details (e.g. HTTP validators)."""
+        with self.index_lock:
+            index = self.load_index()
+            index[url] = {"sha256": sha256, "time": time.time(), **details}
+            self.save_index(index)
+
+    def recall(self, url):
+        """Returns the index entry of 'url' if its object is still stored, otherwise None."""
+        entry = self.load_index().get(url)
+        if entry and os.path.exists(self.object_path(entry["sha256"])):
+            return entry
+        return None
+
+    # Artifacts
+
+    @staticmethod
+    def touch(path):
+        """Marks a stored file as used for the LRU eviction."""
+        try:
+            os.utime(path)
+        except OSError:
+            # A read-only shared store is still usable.
+            pass
+
+    def lookup(self, url, sha256=None, max_age=None):
+        """
+        Returns the path of the stored artifact, or None if it must be downloaded.
+        With a checksum the object is looked up by content; without one, the last download of 'url' is reused if
+        it is at most 'max_age' seconds old.
+        """
+        if sha256:
+            path = self.object_path(sha256)
+            if not os.path.exists(path):
+                return None
+        else:
+            entry = self.recall(url)
+            if entry is None or max_age is None or time.time() - entry["time"] > max_age:
+                return None
+            path = self.object_path(entry["sha256"])
+        ArtifactCache.touch(path)
+        return path
+
+    def fetch(self, url, sha256=None, max_age=None):
+        """
+        Returns the path of a local copy of the artifact at 'url', downloading it (from the mirror first when the
+        checksum is known) if it is not stored yet. A stored download of a URL without checksum that is older than
+        'max_age' is revalidated with a conditional request and only downloaded again if it changed.
+
+        Parameters:
+            url: the URL of the artifact.
+            sha256: the expected SHA-256 checksum (hex), or None if unknown.
+            max_age: seconds the last download of a URL without checksum is reused without asking the server;
+                     None to always ask.
+
+        Raises:
+            OSError: if the artifact could not be downloaded (urllib.error.URLError is an OSError).
+            ValueError: if the downloaded artifact does not match the checksum.
+        """
+        path = self.lookup(url, sha256, max_age)
+        if path is not None:
+            return path
+        previous = None if sha256 else self.recall(url)
+        sources = [url]
+        if self.mirror and sha256:
+            sources.insert(0, self.mirror.rstrip("/") + "/" + sha256.lower())
+        error = None
+        for source in sources:
+            try:
+                digest, validators = self.download(source, url, sha256, previous)
+                break
+            except (OSError, ValueError) as e:
+                error = e
+        else:
+            raise error
+        self.remember(url, digest, **validators)
+        self.evict(keep=digest)
+        path = self.object_path(digest)
+        ArtifactCache.touch(path)
+        return path
+
+    def fetch_all(self, artifacts, max_workers=None):
+        """
+        Fetches several independent artifacts at the same time, at most 'max_workers'
+        (default ArtifactCache.MAX_PARALLEL_DOWNLOADS) at once.
+
+        Parameters:
+            artifacts: a list of URLs or (url, sha256) tuples.
+
+        Returns:
+            A list with the path of each artifact, or the exception that fetching it raised, in the given order.
+        """
+        def fetch(artifact):
+            url, sha256 = (artifact, None) if isinstance(artifact, str) else artifact
+            try:
+                return self.fetch(url, sha256)
+            except (OSError, ValueError) as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=max_workers or ArtifactCache.MAX_PARALLEL_DOWNLOADS) as executor:
+            return list(executor.map(fetch, artifacts))
+
+    def download(self, source, url, sha256=None, previous=None):
+        """
+        Downloads 'source' into the store.
+        A download with a known checksum resumes from its partial file; a lock file makes processes sharing the
+        store wait for each other instead of downloading the same artifact twice. With 'previous', the index entry
+        of an earlier download of 'url', the request is conditional and a 304 answer keeps the stored object.
+
+        Returns:
+            The SHA-256 checksum the artifact is stored under and a dictionary of its HTTP validators
+            ('etag', 'last_modified') for later conditional requests.
+        """
+        # Imported on first use to keep the HTTP modules out of the CLI start-up path.
+        import urllib.error
+        from components.utils.http_fetcher import HttpFetcher
+
+        fetcher = self.fetcher or HttpFetcher.default()
+        partial = self.partial_path(url, sha256)
+        os.makedirs(os.path.dirname(partial), exist_ok=True)
+        os.makedirs(os.path.join(self.root, "objects"), exist_ok=True)
+        with open(partial + ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            if sha256 and os.path.exists(self.object_path(sha256)):
+                return sha256.lower(), {}
+
+            with open(partial, "ab+") as f:
+                digest = hashlib.sha256()
+                # Without a checksum, a partial file may belong to an older version of the artifact.
+                offset = f.seek(0, os.SEEK_END) if sha256 else 0
+                if offset:
+                    f.seek(0)
+                    for chunk in iter(lambda: f.read(ArtifactCache.CHUNK_SIZE), b""):
+                        digest.update(chunk)
+                else:
+                    f.truncate(0)
+
+                headers = {}
+                if offset:
+                    headers["Range"] = f"bytes={offset}-"
+                elif previous:
+                    if previous.get("etag"):
+                        headers["If-None-Match"] = previous["etag"]
+                    if previous.get("last_modified"):
+                        headers["If-Modified-Since"] = previous["last_modified"]
+                validators = {}
+                try:
+                    with fetcher.get(source, headers) as response:
+                        validators = {"etag": response.getheader("ETag"), "last_modified": response.getheader("Last-Modified")}
+                        if response.status == 304 and previous:
+                            actual = None
+                        else:
+                            if offset and response.status != 206:
+                                # The server ignored the range; start over.
+                                f.truncate(0)
+                                digest = hashlib.sha256()
+                            f.seek(0, os.SEEK_END)
+                            for chunk in iter(lambda: response.read(ArtifactCache.CHUNK_SIZE), b""):
+                                f.write(chunk)
+                                digest.update(chunk)
+                            actual = digest.hexdigest()
+                except urllib.error.HTTPError as e:
+                    # 416: the partial file already holds the whole artifact.
+                    if not (offset and e.code == 416):
+                        raise
+                    actual = digest.hexdigest()
+
+                if sha256 and actual != sha256.lower():
+                    f.truncate(0)
+                    raise ValueError(f"Checksum mismatch for {url}: expected {sha256.lower()}, got {actual}.")
+            if actual is None:
+                # Not modified: the stored object is still current.
+                os.remove(partial)
+                return previous["sha256"], validators
+            os.replace(partial, self.object_path(actual))
+        return actual, validators
+
+    # Eviction
+
+    def stored_files(self):
+        """Returns (path, size, mtime) of every object and build-tool download in the store."""
+        files = []
+        for directory in ("objects", "build"):
+            for parent, _, names in os.walk(os.path.join(self.root, directory)):
+                for name in names:
+                    path = os.path.join(parent, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    files.append((path, stat.st_size, stat.st_mtime))
+        return files
+
+    def evict(self, keep=None):
+        """
+        Removes the least recently used files until the store fits in max_bytes. The object 'keep' (a checksum)
+        is never removed.
+
+        Returns:
+            The number of bytes freed.
+        """
+        files = self.stored_files()
+        total = sum(size for _, size, _ in files)
+        keep_path = self.object_path(keep) if keep else None
+        freed = 0
+        for path, size, _ in sorted(files, key=lambda file: file[2]):
+            if total - freed <= self.max_bytes:
+                break
+            if path == keep_path:
+                continue
+            try:
+                os.remove(path)
+                freed += size
+            except OSError:
+                pass
+        return freed
+
+    def build_env(self, base=None):
+        """
+        Returns a copy of the environment ('base', default os.environ) in which the asdf build tools keep their
+        downloads in the store and, with a mirror, fetch from it first.
+        """
+        env = dict(os.environ if base is None else base)
+        for plugin, prefix in ArtifactCache.BUILD_TOOLS.items():
+            cache_path = os.path.join(self.root, "build", plugin)
+            try:
+                # The build tools only use a cache directory that exists.
+                os.makedirs(cache_path, exist_ok=True)
+            except OSError:
+                continue
+            env.setdefault(f"{prefix}_CACHE_PATH", cache_path)
+            if self.mirror and plugin in ArtifactCache.MIRROR_TOOLS:
+                env.setdefault(f"{prefix}_MIRROR_URL", self.mirror.rstrip("/"))
+        return env
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the components.command_result module, the immutable result of a command or component action.
+
+A CommandResult keeps the raw output (bytes or text) as the command produced it. The text is only decoded and
+stripped when stdout or stderr is first read, and the version is only parsed when it is first asked for; both
+are then kept. Slots keep each result small when many are held at once (scans, inventories, fleet reports).
+
+For code written against the older result dictionaries, result['success'], result['stdout'], result['stderr']
+and result['timed_out'] (and get()) still work.
+"""
+
+from components.utils.version import Version
+
+# Marks a lazily computed slot that has not been computed yet.
+_UNSET = object()
+
+class CommandResult:
+    __slots__ = ("returncode", "timed_out", "duration", "raw_stdout", "raw_stderr", "message", "value",
+                 "_stdout", "_stderr", "_version")
+
+    # Keys readable with result[key], for compatibility with result dictionaries.
+    KEYS = ("success", "timed_out", "stdout", "stderr", "returncode", "duration", "value")
+
+    def __init__(self, returncode, stdout="", stderr="", timed_out=False, duration=None, message="", value=None):
+        """
+        Parameters:
+            returncode: the exit code of the command (negative for a signal), or None if no command ran to completion.
+            stdout, stderr: the raw output (bytes or str).
+            timed_out: True if the command was killed because it ran out of time.
+            duration: the wall time of the command in seconds, if measured.
+            message: a note from beezeebot about the outcome (e.g. the timeout), shown after the command's stderr.
+            value: an optional object built from the output, e.g. a BrewInventory.
+        """
+        init = object.__setattr__
+        init(self, "returncode", returncode)
+        init(self, "timed_out", timed_out)
+        init(self, "duration", duration)
+        init(self, "raw_stdout", stdout)
+        init(self, "raw_stderr", stderr)
+        init(self, "message", message)
+        init(self, "value", value)
+        init(self, "_stdout", _UNSET)
+        init(self, "_stderr", _UNSET)
+        init(self, "_version", _UNSET)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CommandResult is immutable; use replace() to derive a changed copy.")
+
+    def __delattr__(self, name):
+        raise AttributeError("CommandResult is immutable.")
+
+    @staticmethod
+    def ok(stdout="", value=None):
+        """Returns a successful result that was not produced by a command, e.g. a version read from disk."""
+        return CommandResult(0, stdout, value=value)
+
+    @staticmethod
+    def failure(message, stdout="", timed_out=False):
+        """Returns a failed result with a message as stderr, e.g. for a command that could not start."""
+        return CommandResult(None, stdout, "", timed_out, message=message)
+
+    @staticmethod
+    def decode(raw):
+        """Returns raw output as stripped text."""
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8", errors="replace")
+        return raw.strip()
+
+    @property
+    def success(self):
+        """True if the command exited with status 0 within its time."""
+        return self.returncode == 0 and not self.timed_out
+
+    @property
+    def stdout(self):
+        """The standard output as stripped text (decoded on first access)."""
+        if self._stdout is _UNSET:
+            object.__setattr__(self, "_stdout", CommandResult.decode(self.raw_stdout))
+        return self._stdout
+
+    @property
+    def stderr(self):
+        """The standard error as stripped text, followed by the message if there is one (decoded on first access)."""
+        if self._stderr is _UNSET:
+            stderr = CommandResult.decode(self.raw_stderr)
+            object.__setattr__(self, "_stderr", (stderr + "\n" + self.message).strip() if self.message else stderr)
+        return self._stderr
+
+    @property
+    def version(self):
+        """The Version in the output of a successful command (parsed on first access), or None."""
+        if self._version is _UNSET:
+            object.__setattr__(self, "_version", Version.parse(self.stdout) if self.success else None)
+        return self._version
+
+    def first_line(self):
+        """Returns the first line of stdout, or an empty string."""
+        return self.stdout.split("\n", 1)[0]
+
+    def replace(self, **changes):
+        """Returns a copy with the given constructor arguments changed, e.g. result.replace(returncode=0, stderr="")."""
+        fields = {
+            "returncode": self.returncode,
+            "stdout": self.raw_stdout,
+            "stderr": self.raw_stderr,
+            "timed_out": self.timed_out,
+            "duration": self.duration,
+            "message": self.message,
+            "value": self.value,
+        }
+        fields.update(changes)
+        return CommandResult(**fields)
+
+    def to_dict(self):
+        """Returns the result as a JSON-serializable dictionary (see from_dict())."""
+        return {
+            "returncode": self.returncode,
+            "timed_out": self.timed_out,
+            "duration": self.duration,
+            "stdout": self.stdout,
+            "stderr": self.stderr,
+        }
+
+    @staticmethod
+    def from_dict(data):
+        """Builds a result from to_dict() output, or from an older result dictionary with a 'success' key."""
+        returncode = data.get("returncode", 0 if data.get("success") else 1)
+        return CommandResult(returncode, data.get("stdout", ""), data.get("stderr", ""),
+                             data.get("timed_out", False), data.get("duration"))
+
+    def __eq__(self, other):
+        if not isinstance(other, CommandResult):
+            return NotImplemented
+        return (self.returncode, self.timed_out, self.stdout, self.stderr) == (other.returncode, other.timed_out, other.stdout, other.stderr)
+
+    def __hash__(self):
+        return hash((self.returncode, self.timed_out, self.stdout, self.stderr))
+
+    def __getitem__(self, key):
+        if key not in CommandResult.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in CommandResult.KEYS else default
+
+    def __repr__(self):
+        return f"CommandResult(returncode={self.returncode!r}, timed_out={self.timed_out!r}, stdout={self.first_line()!r})"
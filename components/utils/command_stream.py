@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the components.command_stream module that runs a long command and hands out its output line by line.
+
+Only a bounded tail of the output is kept in memory for the result; the full output can be written to a log file.
+"""
+
+import contextlib
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+
+from components.utils.command_result import CommandResult
+from components.utils.process_group import ProcessGroup
+from components.utils.tracing import Tracer
+
+class CommandStream:
+    # Number of output lines kept for the result when no other value is given.
+    DEFAULT_TAIL_LINES = 50
+
+    def __init__(self, command, tail_lines=None, log_path=None, timeout=None, env=None):
+        """
+        Parameters:
+            command: the command to run (string or list).
+            tail_lines: the number of trailing output lines kept for the result.
+            log_path: an optional file that receives the full output.
+            timeout: seconds after which the command and every process it started are killed, or None for no limit.
+            env: the environment of the command, or None to inherit the current one.
+        """
+        self.command = command
+        self.env = env
+        self.timeout = timeout
+        self.timed_out = False
+        self.tail = deque(maxlen=tail_lines if tail_lines is not None else CommandStream.DEFAULT_TAIL_LINES)
+        self.log_path = log_path
+        self.result = None
+
+    def __iter__(self):
+        """
+        Starts the command and yields its output lines (stdout and stderr interleaved, without line endings) as they arrive.
+        When the iteration ends, 'result' holds a CommandResult with:
+            - success: True if command succeeds, False otherwise.
+            - timed_out: True if the command was killed because it ran longer than the timeout.
+            - stdout: The last output lines.
+            - stderr: The last output lines if the command failed, or the reason it could not start.
+        The command stays in this terminal session and holds the terminal while it runs, so it can prompt for a password;
+        KeyboardInterrupt is raised when Ctrl-C stops it there.
+        """
+        start = time.perf_counter()
+        # The log is opened first, so that a log that cannot be written never leaves a command running.
+        try:
+            log = open(self.log_path, "w", encoding="utf-8") if self.log_path else None
+        except OSError as e:
+            self.result = CommandResult.failure(f"Cannot write the log file {self.log_path}: {e.strerror}")
+            return
+        try:
+            process = subprocess.Popen(
+                self.command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors="replace",
+                bufsize=1,
+                env=self.env,
+                # Installs may prompt on the terminal (sudo in the Homebrew installer), so they stay in this session.
+                **ProcessGroup.popen_kwargs(new_session=False)
+            )
+        except OSError as e:
+            if log:
+                log.close()
+            self.result = CommandResult.failure(str(e))
+            return
+
+        def expire():
+            self.timed_out = True
+            ProcessGroup.kill(process)
+
+        terminal = contextlib.ExitStack()
+        watchdog = None
+        rusage = None
+        try:
+            attached = terminal.enter_context(ProcessGroup.foreground(process.pid))
+            # Killing the process group closes the output pipe, which ends the read loop below.
+            if self.timeout is not None:
+                watchdog = threading.Timer(self.timeout, expire)
+                watchdog.daemon = True
+                watchdog.start()
+
+            for line in process.stdout:
+                line = line.rstrip("\n")
+                self.tail.append(line)
+                if log:
+                    log.write(line + "\n")
+                yield line
+            # While tracing, the child is reaped with wait4() to collect its resource usage.
+            rusage = Tracer.reap(process) if Tracer.enabled else None
+            returncode = process.wait()
+        finally:
+            if watchdog:
+                watchdog.cancel()
+            if process.poll() is None:
+                # The consumer stopped iterating early (or was interrupted); do not leave the command running.
+                ProcessGroup.kill(process)
+            process.stdout.close()
+            if log:
+                log.close()
+            terminal.close()
+            Tracer.record_command(self.command, start, process.returncode, process.pid, rusage, self.timed_out)
+
+        if attached and returncode == -signal.SIGINT:
+            # Ctrl-C went to the command's foreground group only; stop this run as the shell would.
+            raise KeyboardInterrupt()
+
+        output = "\n".join(self.tail)
+        duration = time.perf_counter() - start
+        if self.timed_out:
+            self.result = CommandResult(returncode, output, output, timed_out=True, duration=duration,
+                                        message=f"Command timed out after {self.timeout:g} seconds")
+        elif returncode == 0:
+            self.result = CommandResult(returncode, output, duration=duration)
+        else:
+            self.result = CommandResult(returncode, output, output, duration=duration,
+                                        message="" if output.strip() else f"Command returned non-zero exit status {returncode}.")
+
+    def run(self, on_line=None):
+        """
+        Consumes the whole stream, passing every line to 'on_line' if given, and returns the CommandResult.
+        """
+        for line in self:
+            if on_line:
+                on_line(line)
+        return self.result
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the components.fs_watcher module that reports changes to a set of files and directories.
+
+Two watchers share one interface:
+    - InotifyWatcher asks the Linux kernel for events through inotify (called with ctypes, so no extra package is
+      needed) and learns the name of each changed directory entry.
+    - PollingWatcher compares stat() results of the watched paths at an interval. It works everywhere, sees a path
+      that does not exist yet being created, but only reports which watched path changed.
+FsWatcher.create() picks inotify when it is available.
+
+Watches are not recursive: watching a directory reports entries created, removed, renamed or modified directly in it.
+"""
+
+import os
+import select
+import struct
+import sys
+import time
+from abc import ABC, abstractmethod
+
+class FsWatcher(ABC):
+    def __init__(self):
+        # The watched paths.
+        self.paths = set()
+
+    @staticmethod
+    def create(polling=False, interval=None):
+        """Returns an InotifyWatcher if inotify is available and 'polling' is False, otherwise a PollingWatcher."""
+        if not polling and InotifyWatcher.is_available():
+            try:
+                return InotifyWatcher()
+            except OSError:
+                # E.g. the per-user inotify instance limit is reached.
+                pass
+        return PollingWatcher(interval)
+
+    @abstractmethod
+    def watch(self, path):
+        """Starts watching a file or directory. Returns False if it cannot be watched (e.g. it does not exist)."""
+        pass
+
+    @abstractmethod
+    def unwatch(self, path):
+        """Stops watching a path."""
+        pass
+
+    @abstractmethod
+    def read(self, timeout=None):
+        """
+        Waits up to 'timeout' seconds (None: until something changes) for changes.
+
+        Returns:
+            A list of (watched path, name) tuples. 'name' is the changed entry of a watched directory, or None if the
+            watched path itself changed or the watcher does not know which entry changed.
+        """
+        pass
+
+    def close(self):
+        """Releases the watcher."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class InotifyWatcher(FsWatcher):
+    # Event bits from <sys/inotify.h>.
+    IN_MODIFY = 0x2
+    IN_ATTRIB = 0x4
+    IN_CLOSE_WRITE = 0x8
+    IN_MOVED_FROM = 0x40
+    IN_MOVED_TO = 0x80
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_DELETE_SELF = 0x400
+    IN_MOVE_SELF = 0x800
+    IN_Q_OVERFLOW = 0x4000
+    IN_IGNORED = 0x8000
+    IN_NONBLOCK = os.O_NONBLOCK
+    IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0)
+
+    MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+            | IN_DELETE_SELF | IN_MOVE_SELF)
+
+    # struct inotify_event: int wd; uint32_t mask, cookie, len; char name[len]
+    EVENT = struct.Struct("iIII")
+
+    libc = None
+
+    @staticmethod
+    def load_libc():
+        """Returns the C library if it provides inotify, else None."""
+        if InotifyWatcher.libc is None:
+            InotifyWatcher.libc = False
+            if sys.platform.startswith("linux"):
+                import ctypes
+                import ctypes.util
+                try:
+                    libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+                except OSError:
+                    libc = None
+                if libc is not None and all(hasattr(libc, name) for name in ("inotify_init1", "inotify_add_watch", "inotify_rm_watch")):
+                    InotifyWatcher.libc = libc
+        return InotifyWatcher.libc or None
+
+    @staticmethod
+    def is_available():
+        return InotifyWatcher.load_libc() is not None
+
+    def __init__(self):
+        super().__init__()
+        import ctypes
+
+        self.libc = InotifyWatcher.load_libc()
+        self.fd = self.libc.inotify_init1(InotifyWatcher.IN_NONBLOCK | InotifyWatcher.IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        # watch descriptor -> path, and back
+        self.descriptors = {}
+        self.watches = {}
+
+    def watch(self, path):
+        if path in self.watches:
+            return True
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), InotifyWatcher.MASK)
+        if wd < 0:
+            return False
+        self.descriptors[wd] = path
+        self.watches[path] = wd
+        self.paths.add(path)
+        return True
+
+    def unwatch(self, path):
+        wd = self.watches.pop(path, None)
+        self.paths.discard(path)
+        if wd is not None:
+            self.descriptors.pop(wd, None)
+            self.libc.inotify_rm_watch(self.fd, wd)
+
+    def read(self, timeout=None):
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return []
+        changes = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = InotifyWatcher.EVENT.unpack_from(data, offset)
+                name = data[offset + InotifyWatcher.EVENT.size:offset + InotifyWatcher.EVENT.size + length].rstrip(b"\0")
+                offset += InotifyWatcher.EVENT.size + length
+                if mask & InotifyWatcher.IN_Q_OVERFLOW:
+                    # Events were lost, so every watched path may have changed.
+                    changes.extend((path, None) for path in self.watches)
+                    continue
+                path = self.descriptors.get(wd)
+                if path is None:
+                    continue
+                changes.append((path, os.fsdecode(name) if name else None))
+                if mask & InotifyWatcher.IN_IGNORED:
+                    # The kernel dropped the watch because the path was deleted or its file system unmounted.
+                    self.descriptors.pop(wd, None)
+                    self.watches.pop(path, None)
+                    self.paths.discard(path)
+        return changes
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatcher(FsWatcher):
+    # Seconds between two rounds of stat() calls.
+    DEFAULT_INTERVAL = 2.0
+
+    def __init__(self, interval=None):
+        super().__init__()
+        self.interval = interval if interval is not None else PollingWatcher.DEFAULT_INTERVAL
+        # path -> (inode, size, mtime_ns, ctime_ns), or None while the path does not exist
+        self.identities = {}
+
+    @staticmethod
+    def identity(path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns)
+
+    def watch(self, path):
+        if path not in self.identities:
+            self.identities[path] = PollingWatcher.identity(path)
+            self.paths.add(path)
+        return True
+
+    def unwatch(self, path):
+        self.identities.pop(path, None)
+        self.paths.discard(path)
+
+    def changes(self):
+        """Returns the watched paths whose stat() result changed since the last call, as read() does."""
+        changes = []
+        for path, before in list(self.identities.items()):
+            after = PollingWatcher.identity(path)
+            if after != before:
+                self.identities[path] = after
+                changes.append((path, None))
+        return changes
+
+    def read(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changes = self.changes()
+            if changes:
+                return changes
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return []
+            time.sleep(self.interval if remaining is None else min(self.interval, remaining))
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the components.http_fetcher module that makes HTTP requests in-process over pooled keep-alive connections.
+
+Each request takes an idle connection to the same host from the pool, or opens a new one, and returns it to the
+pool once the response has been read to the end, so a series of downloads from one host pays for a single TCP and
+TLS handshake. Requests running in different threads use different connections, so independent downloads run in
+parallel (see ArtifactCache.fetch_all()). Proxies from the environment (https_proxy, http_proxy, no_proxy) are
+honored.
+
+Responses with an error status raise urllib.error.HTTPError, like urllib.request.urlopen(); 304 Not Modified is
+returned like any other response so callers can answer conditional requests.
+"""
+
+import contextlib
+import http.client
+import threading
+import urllib.error
+import urllib.parse
+
+class HttpFetcher:
+    # Seconds a connection may wait for the server before the request fails.
+    DEFAULT_TIMEOUT = 60
+
+    # Idle connections kept per host.
+    MAX_IDLE_PER_HOST = 8
+
+    MAX_REDIRECTS = 5
+    REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+    USER_AGENT = "beezeebot"
+
+    # The fetcher shared by the whole process (see HttpFetcher.default()).
+    shared = None
+    shared_lock = threading.Lock()
+
+    def __init__(self, timeout=None):
+        """
+        Parameters:
+            timeout: the socket timeout of new connections; defaults to HttpFetcher.DEFAULT_TIMEOUT.
+        """
+        self.timeout = timeout if timeout is not None else HttpFetcher.DEFAULT_TIMEOUT
+        self.idle = {}
+        self.lock = threading.Lock()
+        self.ssl_context = None
+        # Number of connections opened, for tests and benchmarks.
+        self.connections_opened = 0
+
+    @staticmethod
+    def default():
+        """Returns the fetcher shared by the process, so every component reuses the same connections."""
+        with HttpFetcher.shared_lock:
+            if HttpFetcher.shared is None:
+                HttpFetcher.shared = HttpFetcher()
+            return HttpFetcher.shared
+
+    # Connections
+
+    @staticmethod
+    def proxy_for(scheme, host):
+        """Returns the proxy URL to reach 'host' through, or None for a direct connection."""
+        # Imported on first use; urllib.request is slow to import.
+        import urllib.request
+        if urllib.request.proxy_bypass(host):
+            return None
+        return urllib.request.getproxies().get(scheme)
+
+    def connect(self, scheme, host, port):
+        """Opens a new connection to the host, through a proxy if the environment names one."""
+        proxy = HttpFetcher.proxy_for(scheme, host)
+        if scheme == "https":
+            if self.ssl_context is None:
+                import ssl
+                self.ssl_context = ssl.create_default_context()
+            if proxy:
+                proxy_url = urllib.parse.urlsplit(proxy)
+                connection = http.client.HTTPSConnection(proxy_url.hostname, proxy_url.port or 80, timeout=self.timeout, context=self.ssl_context)
+                connection.set_tunnel(host, port)
+            else:
+                connection = http.client.HTTPSConnection(host, port, timeout=self.timeout, context=self.ssl_context)
+        else:
+            if proxy:
+                proxy_url = urllib.parse.urlsplit(proxy)
+                connection = http.client.HTTPConnection(proxy_url.hostname, proxy_url.port or 80, timeout=self.timeout)
+                # Requests through a plain HTTP proxy carry the absolute URL.
+                connection.absolute_urls = True
+            else:
+                connection = http.client.HTTPConnection(host, port, timeout=self.timeout)
+        with self.lock:
+            self.connections_opened += 1
+        return connection
+
+    def acquire(self, key):
+        """Returns (connection, reused): an idle pooled connection for 'key' if there is one, otherwise a new one."""
+        with self.lock:
+            idle = self.idle.get(key)
+            if idle:
+                return idle.pop(), True
+        return self.connect(*key), False
+
+    def release(self, key, connection):
+        """Returns a connection whose response was read to the end to the pool."""
+        with self.lock:
+            idle = self.idle.setdefault(key, [])
+            if len(idle) < HttpFetcher.MAX_IDLE_PER_HOST:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def close(self):
+        """Closes every idle connection."""
+        with self.lock:
+            idle, self.idle = self.idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+    # Requests
+
+    def send(self, url, headers):
+        """
+        Sends a GET request on a pooled connection and returns (key, connection, response).
+        A reused connection that the server closed while it was idle is replaced by a new one.
+        """
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise urllib.error.URLError(f"Unsupported URL scheme in {url}")
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        headers = {"User-Agent": HttpFetcher.USER_AGENT, **headers}
+
+        connection, reused = self.acquire(key)
+        while True:
+            try:
+                connection.request("GET", url if getattr(connection, "absolute_urls", False) else target, headers=headers)
+                return key, connection, connection.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                connection.close()
+                if not reused:
+                    raise
+                connection, reused = self.connect(*key), False
+            except BaseException:
+                connection.close()
+                raise
+
+    @contextlib.contextmanager
+    def get(self, url, headers=None):
+        """
+        Sends a GET request, following redirects, and yields the http.client.HTTPResponse. The connection goes back
+        to the pool when the 'with' block has read the response to the end, and is closed otherwise.
+
+        Raises:
+            urllib.error.HTTPError: for a response status of 400 or above.
+            OSError: if the server cannot be reached (urllib.error.URLError and socket errors).
+        """
+        headers = dict(headers or {})
+        for _ in range(HttpFetcher.MAX_REDIRECTS + 1):
+            key, connection, response = self.send(url, headers)
+            if response.status in HttpFetcher.REDIRECT_STATUSES and response.getheader("Location"):
+                response.read()
+                self.finish(key, connection, response)
+                url = urllib.parse.urljoin(url, response.getheader("Location"))
+                continue
+            if response.status >= 400:
+                body = response.read()
+                self.finish(key, connection, response)
+                raise urllib.error.HTTPError(url, response.status, f"{response.reason} ({body[:200]!r})", response.headers, None)
+            try:
+                yield response
+            finally:
+                self.finish(key, connection, response)
+            return
+        raise urllib.error.URLError(f"Too many redirects for {url}")
+
+    def finish(self, key, connection, response):
+        """Pools the connection if its response was read completely and the server keeps it open."""
+        if response.length == 0 and not response.isclosed():
+            # Marks a response without a body (e.g. 304 Not Modified) as complete.
+            response.read()
+        if response.isclosed() and not response.will_close:
+            self.release(key, connection)
+        else:
+            connection.close()
+
+    def read(self, url, headers=None):
+        """Returns the body of the response to a GET request as bytes."""
+        with self.get(url, headers) as response:
+            return response.read()
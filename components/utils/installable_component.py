@@ -12,7 +12,12 @@ This is the components.installable_component, the abstract class for all install
 
 from abc import ABC, abstractmethod
 
+from components.utils.command_result import CommandResult
+
 class InstallableComponent(ABC):
+    # Shown by --version when the component is not installed.
+    NOT_INSTALLED_MSG = "This component is not installed."
+
     @abstractmethod
     def install(self):
         """Install the component."""
@@ -27,3 +32,16 @@ class InstallableComponent(ABC):
     def check_version(self):
         """Check the component's version."""
         pass
+
+    def install_plugins(self, plugin_names, on_output=None):
+        """Install plugins of the component. Components without plugins report every plugin as not supported."""
+        return {plugin_name: CommandResult.failure("This component does not support plugins.") for plugin_name in plugin_names}
+
+    def get_probes(self):
+        """Returns the (name, command, timeout) probes the scanner runs for this component; none by default."""
+        return []
+
+    @staticmethod
+    def not_supported(action):
+        """Returns the CommandResult of an action the component does not support."""
+        return CommandResult.failure(f"{action} is not supported for this component.")
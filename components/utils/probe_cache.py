@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the components.probe_cache module that remembers the results of '--version' probes on disk.
+
+A cached result is keyed by the resolved path of the executable plus its inode, size and modification time, so an
+upgraded or reinstalled binary never serves an old answer. Entries also expire after a time-to-live.
+
+A long-running process (the daemon) keeps one resident cache in memory instead of reading the file on every probe;
+it still reloads the file when another process has written it.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from components.utils.command_result import CommandResult
+
+class ProbeCache:
+    # Bump when the layout of the cache file changes; older files are ignored.
+    FORMAT_VERSION = 2
+
+    # Seconds a cached result stays valid, even if the binary is unchanged.
+    DEFAULT_TTL = 24 * 60 * 60
+
+    # The TTL while a CacheInvalidator drops entries as soon as the files behind them change.
+    WATCHED_TTL = 7 * 24 * 60 * 60
+
+    # Only commands made of an executable followed by one of these argument lists are cached.
+    # Their output depends on nothing but the binary itself.
+    CACHEABLE_ARGS = [["--version"]]
+
+    # The cache shared by every probe of a long-running process, see keep_resident().
+    resident = None
+
+    def __init__(self, path=None, ttl=None, track_file=False):
+        """
+        Parameters:
+            path: the cache file; defaults to ProbeCache.default_path().
+            ttl: seconds a cached result stays valid; defaults to ProbeCache.DEFAULT_TTL.
+            track_file: True to read the file again whenever another process rewrites it, for long-lived instances.
+        """
+        self.path = path if path is not None else ProbeCache.default_path()
+        self.ttl = ttl if ttl is not None else ProbeCache.DEFAULT_TTL
+        self.entries = None
+        self.dirty = False
+        # (mtime_ns, size) of the cache file when it was last read or written, if tracked; (-1,) differs from
+        # every file_stamp(), so the first load() reads the file.
+        self.stamp = (-1,) if track_file else None
+        self.lock = threading.RLock()
+
+    @staticmethod
+    def shared():
+        """Returns the resident cache if the process keeps one, otherwise a new ProbeCache that reads the file."""
+        return ProbeCache.resident if ProbeCache.resident is not None else ProbeCache()
+
+    @staticmethod
+    def keep_resident(path=None, ttl=None):
+        """Keeps one cache in memory for the rest of the process, for processes that answer many probes."""
+        ProbeCache.resident = ProbeCache(path, ttl, track_file=True)
+        return ProbeCache.resident
+
+    def file_stamp(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return ()
+        return (stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def cache_dir():
+        """
+        Returns the beezeebot cache directory: $BEEZEEBOT_CACHE_DIR, else $XDG_CACHE_HOME/beezeebot, else ~/.cache/beezeebot.
+        """
+        if os.environ.get("BEEZEEBOT_CACHE_DIR"):
+            return os.environ["BEEZEEBOT_CACHE_DIR"]
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        return os.path.join(base, "beezeebot")
+
+    @staticmethod
+    def default_path():
+        """Returns the path of the probe cache file."""
+        return os.path.join(ProbeCache.cache_dir(), "probes.json")
+
+    @staticmethod
+    def is_cacheable(command):
+        """Returns True if the output of the command depends only on the executable, e.g. 'brew --version'."""
+        return isinstance(command, list) and len(command) > 1 and command[1:] in ProbeCache.CACHEABLE_ARGS
+
+    @staticmethod
+    def binary_identity(executable):
+        """
+        Resolves the executable on PATH (following symlinks) and returns [path, inode, size, mtime_ns],
+        or None if it cannot be found.
+        """
+        located = shutil.which(executable)
+        if located is None:
+            return None
+        resolved = os.path.realpath(located)
+        try:
+            stat = os.stat(resolved)
+        except OSError:
+            return None
+        return [resolved, stat.st_ino, stat.st_size, stat.st_mtime_ns]
+
+    @staticmethod
+    def make_key(command):
+        """Returns the cache key for a cacheable command, or None if the command cannot be cached."""
+        if not ProbeCache.is_cacheable(command):
+            return None
+        identity = ProbeCache.binary_identity(command[0])
+        if identity is None:
+            return None
+        return json.dumps(identity + command[1:])
+
+    def load(self):
+        """
+        Reads the cache file once; a missing, unreadable or outdated file starts an empty cache.
+        The resident cache reads it again whenever another process has replaced it.
+        """
+        with self.lock:
+            if self.stamp is not None and not self.dirty:
+                stamp = self.file_stamp()
+                if stamp != self.stamp:
+                    self.entries, self.stamp = None, stamp
+            if self.entries is not None:
+                return self.entries
+            self.entries = {}
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("format") == ProbeCache.FORMAT_VERSION:
+                    self.entries = data.get("entries", {})
+            except (OSError, ValueError, AttributeError):
+                pass
+            return self.entries
+
+    def get(self, command):
+        """Returns the cached CommandResult for the command, or None on a miss or an expired entry."""
+        key = ProbeCache.make_key(command)
+        if key is None:
+            return None
+        with self.lock:
+            entry = self.load().get(key)
+        if entry is None or time.time() - entry["time"] > self.ttl:
+            return None
+        return CommandResult.from_dict(entry["result"])
+
+    def put(self, command, result):
+        """Stores a successful result for the command. Failed results are never cached."""
+        key = ProbeCache.make_key(command)
+        if key is None or not result.success:
+            return
+        with self.lock:
+            self.load()[key] = {"time": time.time(), "result": result.to_dict()}
+            self.dirty = True
+
+    def remove(self, keys):
+        """Drops the entries with the given keys (see make_key()) and writes the cache file."""
+        with self.lock:
+            entries = self.load()
+            for key in keys:
+                if entries.pop(key, None) is not None:
+                    self.dirty = True
+            self.save()
+
+    def save(self):
+        """Writes the cache file atomically if anything changed, dropping expired entries."""
+        with self.lock:
+            if not self.dirty:
+                return
+            now = time.time()
+            entries = {key: entry for key, entry in self.entries.items() if now - entry["time"] <= self.ttl}
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), prefix=".probes-")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump({"format": ProbeCache.FORMAT_VERSION, "entries": entries}, f)
+                os.replace(temp_path, self.path)
+                self.dirty = False
+                if self.stamp is not None:
+                    self.stamp = self.file_stamp()
+            except OSError:
+                # The cache is only an optimization; failing to write it must not fail the command.
+                pass
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the components.process_group module that starts commands in their own process group and kills the whole group.
+
+Shell scripts such as the asdf shims and Homebrew's entry point start further processes. Killing only the direct child
+would leave those grandchildren running (and holding the output pipes open), so every command is started as the leader
+of a new process group and timeouts or cancellations signal the whole group.
+
+Captured commands such as version probes also start a new session, which detaches them from the terminal. Interactive
+installs stay in this session: the Homebrew installer runs sudo, which asks for a password on /dev/tty. Their group
+is made the foreground group of the terminal while they run (see foreground()), because a background group that reads
+from the terminal is stopped.
+"""
+
+import contextlib
+import os
+import signal
+import sys
+import time
+
+class ProcessGroup:
+    # Seconds a process group gets to exit after SIGTERM before it receives SIGKILL.
+    KILL_GRACE = 2.0
+
+    @staticmethod
+    def popen_kwargs(new_session=True):
+        """
+        Returns the keyword arguments that start a child process as the leader of a new process group.
+        With 'new_session' the child also leaves the terminal; without it the child can still open /dev/tty.
+        """
+        if os.name != "posix":
+            return {}
+        if new_session:
+            return {"start_new_session": True}
+        if sys.version_info >= (3, 11):
+            return {"process_group": 0}
+        return {"preexec_fn": lambda: os.setpgid(0, 0)}
+
+    @staticmethod
+    @contextlib.contextmanager
+    def foreground(pid):
+        """
+        Makes the process group led by 'pid' the foreground group of the controlling terminal while the block runs, if
+        this process's group holds the terminal. Yields True if the terminal was handed over, False otherwise (no
+        terminal, running in the background, or another command holds it).
+        """
+        try:
+            fd = os.open("/dev/tty", os.O_RDWR | os.O_NOCTTY) if os.name == "posix" else None
+        except OSError:
+            fd = None
+        previous = None
+        try:
+            if fd is not None:
+                try:
+                    if os.tcgetpgrp(fd) == os.getpgrp():
+                        os.tcsetpgrp(fd, pid)
+                        previous = os.getpgrp()
+                except OSError:
+                    pass
+            yield previous is not None
+        finally:
+            if previous is not None:
+                # This process is in the background now, and tcsetpgrp() from the background raises SIGTTOU unless the
+                # signal is blocked (per thread, so this also works on the install worker threads).
+                mask = signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGTTOU})
+                try:
+                    os.tcsetpgrp(fd, previous)
+                except OSError:
+                    pass
+                finally:
+                    signal.pthread_sigmask(signal.SIG_SETMASK, mask)
+            if fd is not None:
+                os.close(fd)
+
+    @staticmethod
+    def signal_group(pid, sig):
+        """Sends a signal to the process group led by 'pid'. Returns False if the group no longer exists."""
+        try:
+            os.killpg(pid, sig)
+            return True
+        except (ProcessLookupError, PermissionError):
+            return False
+
+    @staticmethod
+    def kill(process, grace=None):
+        """
+        Terminates a subprocess.Popen child together with every process in its group:
+        SIGTERM first, then SIGKILL once the grace period is over (or right away for children that ignore SIGTERM).
+        """
+        if os.name != "posix":
+            process.kill()
+            return
+        if grace is None:
+            grace = ProcessGroup.KILL_GRACE
+
+        ProcessGroup.signal_group(process.pid, signal.SIGTERM)
+        end = time.monotonic() + grace
+        while process.poll() is None and time.monotonic() < end:
+            time.sleep(0.01)
+        # Grandchildren may ignore SIGTERM even if the direct child exited, so the group always gets SIGKILL.
+        ProcessGroup.signal_group(process.pid, signal.SIGKILL)
+        process.wait()
+
+    @staticmethod
+    async def kill_async(process, grace=None):
+        """Same as kill() for an asyncio subprocess."""
+        import asyncio
+
+        if os.name != "posix":
+            process.kill()
+            await process.wait()
+            return
+        if grace is None:
+            grace = ProcessGroup.KILL_GRACE
+
+        ProcessGroup.signal_group(process.pid, signal.SIGTERM)
+        try:
+            await asyncio.wait_for(process.wait(), grace)
+        except asyncio.TimeoutError:
+            pass
+        ProcessGroup.signal_group(process.pid, signal.SIGKILL)
+        await process.wait()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the components.shell_worker module, a persistent /bin/sh that runs batches of small commands.
+
+Starting a process per check costs a fork and an exec, and the asdf and Homebrew entry points are shell scripts that
+start another shell on top. A ShellWorker keeps one shell running and feeds it a batch of commands on its standard
+input. Shell builtins such as 'command -v' then run without any new process, and other commands skip the extra
+shell. After each command the shell prints a sentinel line with the exit status to stdout and another sentinel to
+stderr, so the output and status of every command are told apart:
+
+    cd <working directory>
+    { eval '<command>'
+    } </dev/null
+    __bzb_status=$?
+    printf '\\n<token> %d\\n' "$__bzb_status"
+    printf '\\n<token>\\n' >&2
+
+Commands share the shell, so a command that changes variables or options affects the next ones (the working
+directory is reset for each). A command that makes the shell exit, or a batch that runs out of time, ends the shell;
+the command gets a failed result and the rest of the batch runs in a new shell.
+"""
+
+import os
+import re
+import selectors
+import shlex
+import subprocess
+import time
+import uuid
+
+from components.utils.command_result import CommandResult
+from components.utils.process_group import ProcessGroup
+from components.utils.tracing import Tracer
+
+class ShellWorker:
+    SHELL = "/bin/sh"
+
+    def __init__(self, cwd=None, env=None):
+        """
+        Parameters:
+            cwd: the working directory of every command; defaults to the current directory.
+            env: the environment of the shell; defaults to this process's environment when the shell starts.
+        """
+        self.cwd = cwd or os.getcwd()
+        self.env = env
+        self.process = None
+        # The environment the running shell was started with.
+        self.environ = None
+        # Number of shells started, including restarts after a crash or timeout.
+        self.starts = 0
+
+    def start(self):
+        """Starts the shell if it is not running."""
+        if self.is_running():
+            return
+        self.environ = dict(self.env if self.env is not None else os.environ)
+        self.process = subprocess.Popen(
+            [ShellWorker.SHELL],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            env=self.environ, cwd=self.cwd, **ProcessGroup.popen_kwargs()
+        )
+        self.starts += 1
+
+    def is_running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def close(self):
+        """Ends the shell: it exits when its input closes, and is killed if it does not."""
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+            self.process.wait(1)
+        except (OSError, subprocess.TimeoutExpired):
+            ProcessGroup.kill(self.process)
+        for stream in (self.process.stdout, self.process.stderr):
+            stream.close()
+        self.process = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Batches
+
+    def script(self, command, token):
+        """Returns the shell input that runs one command and prints its sentinels."""
+        text = command if isinstance(command, str) else shlex.join(command)
+        return (
+            f"cd {shlex.quote(self.cwd)}\n"
+            f"{{ eval {shlex.quote(text)}\n}} </dev/null\n"
+            "__bzb_status=$?\n"
+            f"printf '\\n{token} %d\\n' \"$__bzb_status\"\n"
+            f"printf '\\n{token}\\n' >&2\n"
+        )
+
+    def run_batch(self, commands, timeout=None):
+        """
+        Runs the commands one after the other in the shell.
+
+        Parameters:
+            commands: a list of commands, each an argv list or a shell command string.
+            timeout: seconds the whole batch may take; the commands left when it runs out get timed-out results.
+
+        Returns:
+            A list with a CommandResult for each command, as Subproc.run_command() returns. The duration of a command
+            is the time from the end of the previous one.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        results = []
+        while len(results) < len(commands):
+            results.extend(self.exchange(commands[len(results):], deadline, timeout))
+        return results
+
+    def exchange(self, commands, deadline, timeout):
+        """
+        Sends the commands to the shell and reads their results until all are in, the shell exits, or the deadline
+        passes. Returns the results of the commands that finished, plus one for the command that ended the shell.
+        """
+        self.start()
+        batch = uuid.uuid4().hex
+        tokens = [f"__bzb_{batch}_{index}".encode() for index in range(len(commands))]
+        pending = "".join(self.script(command, token.decode()) for command, token in zip(commands, tokens)).encode()
+        out, err = bytearray(), bytearray()
+        results = []
+        start = time.perf_counter()
+
+        selector = selectors.DefaultSelector()
+        os.set_blocking(self.process.stdin.fileno(), False)
+        selector.register(self.process.stdin, selectors.EVENT_WRITE)
+        selector.register(self.process.stdout, selectors.EVENT_READ, out)
+        selector.register(self.process.stderr, selectors.EVENT_READ, err)
+        open_streams = 2
+        try:
+            while len(results) < len(commands):
+                index = len(results)
+                status = re.search(b"\n" + re.escape(tokens[index]) + b" (-?\\d+)\n", out)
+                marker = b"\n" + tokens[index] + b"\n"
+                if status and marker in err:
+                    returncode = int(status.group(1))
+                    stdout, out[:] = bytes(out[:status.start()]), out[status.end():]
+                    split = err.index(marker)
+                    stderr, err[:] = bytes(err[:split]), err[split + len(marker):]
+                    results.append(self.finish(commands[index], start, returncode, stdout, stderr))
+                    start = time.perf_counter()
+                    continue
+
+                if open_streams == 0:
+                    # The shell exited before the command finished: 'exit' in the command, a crash or a signal.
+                    self.process.wait()
+                    results.append(self.finish(commands[index], start, self.process.returncode, bytes(out), bytes(err)))
+                    self.close()
+                    return results
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    ProcessGroup.kill(self.process)
+                    self.close()
+                    for command in commands[index:]:
+                        Tracer.record_command(command, start, None, timed_out=True)
+                        results.append(CommandResult(None, bytes(out), bytes(err), timed_out=True,
+                                                     duration=time.perf_counter() - start,
+                                                     message=f"The command batch timed out after {timeout:g} seconds"))
+                        out, err = bytearray(), bytearray()
+                    return results
+
+                for key, _ in selector.select(remaining):
+                    if key.fileobj is self.process.stdin:
+                        try:
+                            pending = pending[os.write(self.process.stdin.fileno(), pending):]
+                        except BlockingIOError:
+                            continue
+                        except BrokenPipeError:
+                            pending = b""
+                        if not pending:
+                            selector.unregister(self.process.stdin)
+                        continue
+                    chunk = os.read(key.fileobj.fileno(), 65536)
+                    if chunk:
+                        key.data.extend(chunk)
+                    else:
+                        selector.unregister(key.fileobj)
+                        open_streams -= 1
+                        if open_streams == 0 and pending:
+                            selector.unregister(self.process.stdin)
+        finally:
+            selector.close()
+        return results
+
+    def finish(self, command, start, returncode, stdout, stderr):
+        duration = time.perf_counter() - start
+        Tracer.record_command(command, start, returncode, self.process.pid if self.process else None)
+        message = ""
+        if returncode != 0 and not stderr.strip():
+            message = str(subprocess.CalledProcessError(returncode, command))
+        return CommandResult(returncode, stdout, stderr, duration=duration, message=message)
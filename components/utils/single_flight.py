@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the components.single_flight module that merges identical commands running at the same time.
+
+A scan, an install plan and the plugin prerequisite checks each ask 'brew --version' or 'asdf --version', often at
+the same moment, and booting Homebrew is the most expensive part of a scan. While a command is running, every other
+call with the same argv, environment and working directory waits for it and receives the same CommandResult
+instead of starting another process. Threads and asyncio tasks are merged separately (an asyncio task cannot wait
+on a thread without blocking its loop).
+
+A caller that joins a running command keeps its own timeout: if it runs out of time first it gets a timed-out
+result, but the command keeps running for the others. An asyncio command is cancelled (and its process group
+killed) only when every task waiting for it was cancelled.
+"""
+
+import os
+import threading
+
+class FlightCall:
+    """A command run by one thread on behalf of every thread that asked for it meanwhile."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self.lock = threading.Lock()
+        # key -> FlightCall of the running threaded command
+        self.calls = {}
+        # (event loop id, key) -> [task, number of waiting tasks]
+        self.tasks = {}
+        # Number of calls answered by another call's command.
+        self.merged = 0
+
+    @staticmethod
+    def key(command, env=None, cwd=None):
+        """
+        Returns the key of a command: its argv, its environment (default: this process's) and its working directory
+        (default: the current one). Calls with equal keys would start identical processes.
+        """
+        argv = command if isinstance(command, str) else tuple(command)
+        environ = env if env is not None else os.environ
+        return (argv, tuple(sorted(environ.items())), cwd or os.getcwd())
+
+    def run(self, key, function, timeout=None, on_timeout=None):
+        """
+        Returns function() if no call with this key is running, otherwise waits for the running call and returns its
+        result (or raises its exception). A waiting caller gives up after 'timeout' seconds and returns on_timeout(),
+        or raises TimeoutError without it.
+        """
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = FlightCall()
+            else:
+                self.merged += 1
+        if leader:
+            try:
+                call.result = function()
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self.lock:
+                    del self.calls[key]
+                call.done.set()
+            return call.result
+
+        if not call.done.wait(timeout):
+            if on_timeout is None:
+                raise TimeoutError(f"{key[0]} is still running")
+            return on_timeout()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    async def run_async(self, key, function, timeout=None, on_timeout=None):
+        """
+        The asyncio version of run(): 'function' returns the coroutine to run once for every task of the same event
+        loop that awaits this key meanwhile. The task that starts the coroutine waits for it without a timeout, since
+        the coroutine enforces its own; only the tasks that join it give up after 'timeout' seconds.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        with self.lock:
+            entry = self.tasks.get(flight_key)
+            leader = entry is None or entry[0].done()
+            if leader:
+                entry = self.tasks[flight_key] = [loop.create_task(function()), 0]
+                entry[0].add_done_callback(lambda task: self.forget(flight_key, task))
+            else:
+                self.merged += 1
+            entry[1] += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(entry[0]), None if leader else timeout)
+        except asyncio.TimeoutError:
+            if on_timeout is None:
+                raise
+            return on_timeout()
+        finally:
+            with self.lock:
+                entry[1] -= 1
+                abandoned = entry[1] == 0 and not entry[0].done()
+            if abandoned:
+                # Nobody waits for the result any more.
+                entry[0].cancel()
+
+    def forget(self, flight_key, task):
+        with self.lock:
+            entry = self.tasks.get(flight_key)
+            if entry is not None and entry[0] is task:
+                del self.tasks[flight_key]
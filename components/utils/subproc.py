@@ -10,32 +10,249 @@ LICENSE file in the root directory of this source tree.
 This is the components.subproc module that manages shell actions. 
 """
 
+import os
 import subprocess
+import threading
+import time
+
+from components.utils.command_result import CommandResult
+from components.utils.command_stream import CommandStream
+from components.utils.probe_cache import ProbeCache
+from components.utils.process_group import ProcessGroup
+from components.utils.single_flight import SingleFlight
+from components.utils.tracing import Tracer
 
 class Subproc:
+    # Seconds a captured command may run before it is killed, unless the caller gives another timeout.
+    DEFAULT_TIMEOUT = 120
+
+    # Seconds a '--version' style probe may run before it is killed.
+    PROBE_TIMEOUT = 30
+
+    # Monotonic time after which no command may keep running, or None for no global deadline.
+    deadline = None
+
+    # Merges identical captured commands that run at the same time into one process (see SingleFlight).
+    flights = SingleFlight()
+
+    # The shell that runs batches of small commands (see run_batch()), started on first use.
+    worker = None
+    worker_lock = threading.Lock()
+
     @staticmethod
-    def run_command(command):
+    def set_deadline(seconds):
+        """
+        Sets a global deadline 'seconds' from now (None clears it). Every command started afterwards is
+        killed when the deadline passes, whatever its own timeout is.
         """
-        Executes the specified command (string or list) and returns a dictionary with:
+        Subproc.deadline = time.monotonic() + seconds if seconds is not None else None
+
+    @staticmethod
+    def effective_timeout(timeout):
+        """Returns the smaller of 'timeout' and the time left until the global deadline (None means no limit)."""
+        if Subproc.deadline is None:
+            return timeout
+        remaining = max(0.0, Subproc.deadline - time.monotonic())
+        return remaining if timeout is None else min(timeout, remaining)
+
+    @staticmethod
+    def timed_out_result(command, timeout, stdout="", stderr="", returncode=None, duration=None):
+        """Returns the CommandResult of a command that was killed because it ran out of time."""
+        name = command if isinstance(command, str) else " ".join(command)
+        return CommandResult(returncode, stdout, stderr, timed_out=True, duration=duration,
+                             message=f"Command '{name}' timed out after {timeout:g} seconds")
+
+    @staticmethod
+    def finished_result(command, returncode, stdout, stderr, duration):
+        """Returns the CommandResult of a command that exited; a failure without stderr gets the exit status as message."""
+        message = ""
+        if returncode != 0 and not stderr.strip():
+            message = str(subprocess.CalledProcessError(returncode, command))
+        return CommandResult(returncode, stdout, stderr, duration=duration, message=message)
+
+    @staticmethod
+    def run_command(command, timeout=None):
+        """
+        Executes the specified command (string or list) and returns a CommandResult with:
             - success: True if command succeeds, False otherwise.
-            - stdout: Standard output from the command.
+            - returncode: The exit code (negative for a signal), or None if the command could not start.
+            - timed_out: True if the command was killed because it ran longer than 'timeout' seconds
+              (default Subproc.DEFAULT_TIMEOUT) or past the global deadline.
+            - duration: The wall time in seconds.
+            - stdout: Standard output from the command (kept as bytes until first read).
             - stderr: Standard error output from the command.
+
+        The command runs in its own process group, so a timeout or an interrupt (Ctrl-C) also kills the
+        processes it started. While the same command is already running on another thread, its result is shared
+        instead of starting another process.
         """
+        timeout = Subproc.effective_timeout(timeout if timeout is not None else Subproc.DEFAULT_TIMEOUT)
+        if timeout is not None and timeout <= 0:
+            return Subproc.timed_out_result(command, 0)
+        return Subproc.flights.run(
+            SingleFlight.key(command),
+            lambda: Subproc.execute_command(command, timeout),
+            timeout,
+            lambda: Subproc.timed_out_result(command, timeout)
+        )
+
+    @staticmethod
+    def execute_command(command, timeout):
+        """Runs the command for run_command(), always in a new process."""
+        start = time.perf_counter()
         try:
-            result = subprocess.run(
+            process = subprocess.Popen(
                 command,
-                capture_output=True,
-                text=True,
-                check=True
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                **ProcessGroup.popen_kwargs()
+            )
+        except OSError as e:
+            return CommandResult.failure(str(e))
+
+        # While tracing, the child is reaped with wait4() to collect its resource usage.
+        traced = Tracer.enabled
+        rusage = None
+        try:
+            if traced:
+                stdout, stderr, rusage = Tracer.communicate(process, timeout)
+            else:
+                stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired as e:
+            ProcessGroup.kill(process)
+            stdout, stderr = process.communicate()
+            if traced:
+                # Tracer.communicate() keeps what it read before the timeout; Popen.communicate() returns the rest.
+                stdout, stderr = (e.output or b"") + (stdout or b""), (e.stderr or b"") + (stderr or b"")
+            Tracer.record_command(command, start, process.returncode, process.pid, timed_out=True)
+            return Subproc.timed_out_result(command, timeout, stdout or b"", stderr or b"", process.returncode, time.perf_counter() - start)
+        except BaseException:
+            ProcessGroup.kill(process)
+            raise
+        Tracer.record_command(command, start, process.returncode, process.pid, rusage)
+        return Subproc.finished_result(command, process.returncode, stdout, stderr, time.perf_counter() - start)
+
+    @staticmethod
+    def stream_command(command, tail_lines=None, log_path=None, timeout=None, env=None):
+        """
+        Returns a CommandStream for the specified command. Iterating over it runs the command and yields
+        output lines as they arrive; afterwards its 'result' attribute holds a CommandResult built from a
+        bounded tail of the output. The command has no timeout of its own unless 'timeout'
+        is given, but it is still bound by the global deadline. 'env' replaces the environment of the command.
+        """
+        return CommandStream(command, tail_lines, log_path, Subproc.effective_timeout(timeout), env)
+
+    @staticmethod
+    def run_command_streaming(command, on_line=None, log_path=None, tail_lines=None, timeout=None, env=None):
+        """
+        Executes a long-running command (e.g. an install) without buffering its whole output in memory.
+        Each output line is passed to 'on_line' as it arrives, and the full output is written to 'log_path' if given.
+        'env' replaces the environment of the command.
+
+        Returns:
+            A CommandResult with:
+                - success: True if command succeeds, False otherwise.
+                - timed_out: True if the command was killed after 'timeout' seconds or at the global deadline.
+                - stdout: The last output lines of the command.
+                - stderr: The last output lines if the command failed, otherwise empty.
+        """
+        return Subproc.stream_command(command, tail_lines, log_path, timeout, env).run(on_line)
+
+    @staticmethod
+    def run_batch(commands, timeout=None, cwd=None):
+        """
+        Executes many small commands (argv lists or shell command strings) one after the other in a persistent shell,
+        so that they cost no process each, e.g. 'command -v' checks, version queries or 'asdf current'. The shell
+        keeps running between batches and is started again if the environment or working directory changed, if a
+        command made it exit, or if a batch ran out of time. 'timeout' (default Subproc.DEFAULT_TIMEOUT) applies
+        to the whole batch. 'cwd' (default: the current directory) is the working directory of the commands.
+
+        Returns:
+            A list with the CommandResult of each command, as run_command() returns (see ShellWorker.run_batch()).
+        """
+        from components.utils.shell_worker import ShellWorker
+
+        timeout = Subproc.effective_timeout(timeout if timeout is not None else Subproc.DEFAULT_TIMEOUT)
+        if timeout is not None and timeout <= 0:
+            return [Subproc.timed_out_result(command, 0) for command in commands]
+        cwd = cwd or os.getcwd()
+        with Subproc.worker_lock:
+            worker = Subproc.worker
+            if worker is not None and (worker.cwd != cwd or (worker.is_running() and worker.environ != os.environ)):
+                worker.close()
+                worker = None
+            if worker is None:
+                import atexit
+                worker = Subproc.worker = ShellWorker(cwd)
+                atexit.register(worker.close)
+            return worker.run_batch(commands, timeout)
+
+    @staticmethod
+    def run_version_command(command, refresh=False):
+        """
+        Executes a '--version' style command through the on-disk probe cache.
+        The command is only run when the executable changed, the cached entry expired, or 'refresh' is True.
+
+        Returns:
+            The same CommandResult as run_command().
+        """
+        cache = ProbeCache.shared()
+        if not refresh:
+            result = cache.get(command)
+            if result is not None:
+                return result
+
+        result = Subproc.run_command(command, Subproc.PROBE_TIMEOUT)
+        cache.put(command, result)
+        cache.save()
+        return result
+
+    @staticmethod
+    async def run_command_async(command, timeout=None):
+        """
+        Executes the specified command (list) as an asyncio subprocess so that many commands can run at the same time.
+        If the command does not finish within 'timeout' seconds (or by the global deadline), its whole process group
+        is killed. Cancelling the awaiting task kills the process group as well, unless other tasks await the same
+        command: while it is already running in the event loop, its result is shared instead of starting another process.
+
+        Returns:
+            The same CommandResult as run_command().
+        """
+        timeout = Subproc.effective_timeout(timeout)
+        if timeout is not None and timeout <= 0:
+            return Subproc.timed_out_result(command, 0)
+        return await Subproc.flights.run_async(
+            SingleFlight.key(command),
+            lambda: Subproc.execute_command_async(command, timeout),
+            timeout,
+            lambda: Subproc.timed_out_result(command, timeout)
+        )
+
+    @staticmethod
+    async def execute_command_async(command, timeout):
+        """Runs the command for run_command_async(), always in a new process."""
+        # asyncio is the most expensive import of the CLI, so only the commands that run async code load it.
+        import asyncio
+
+        start = time.perf_counter()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                **ProcessGroup.popen_kwargs()
             )
-            return {
-                'success': True,
-                'stdout': result.stdout.strip(),
-                'stderr': result.stderr.strip()
-            }
-        except subprocess.CalledProcessError as e:
-            return {
-                'success': False,
-                'stdout': e.stdout.strip() if e.stdout else "",
-                'stderr': e.stderr.strip() if e.stderr else str(e)
-            }
+        except OSError as e:
+            return CommandResult.failure(str(e))
+
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            await ProcessGroup.kill_async(process)
+            Tracer.record_command(command, start, process.returncode, process.pid, timed_out=True)
+            return Subproc.timed_out_result(command, timeout, returncode=process.returncode, duration=time.perf_counter() - start)
+        except BaseException:
+            await ProcessGroup.kill_async(process)
+            raise
+        Tracer.record_command(command, start, process.returncode, process.pid)
+        return Subproc.finished_result(command, process.returncode, stdout, stderr, time.perf_counter() - start)
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the components.tracing module that records a timing span for every spawned command and every install step.
+
+A command span holds the argv, the wall time, the exit code and, for commands run by Subproc.run_command() and
+CommandStream, the child's resource usage (CPU time and peak RSS) as reported by wait4(): while tracing, those reap
+their child with Tracer.reap() instead of Popen.wait(). asyncio reaps its children itself, and a child killed after a
+timeout is reaped by ProcessGroup.kill(), so those spans carry the wall time and exit code only.
+
+Spans are only recorded while tracing is enabled (see Tracer.enable()). They can be written as Chrome trace JSON
+(open it in https://ui.perfetto.dev or chrome://tracing) or summarized per command as a table.
+"""
+
+import contextlib
+import json
+import os
+import selectors
+import subprocess
+import sys
+import threading
+import time
+
+class Tracer:
+    # Span categories.
+    COMMAND = "command"
+    STEP = "step"
+
+    # True while spans are recorded.
+    enabled = False
+
+    spans = []
+    lock = threading.Lock()
+
+    # perf_counter() value of time zero in the trace.
+    origin = time.perf_counter()
+
+    @staticmethod
+    def enable():
+        """Starts recording spans, discarding the ones recorded before."""
+        with Tracer.lock:
+            Tracer.spans = []
+            Tracer.origin = time.perf_counter()
+            Tracer.enabled = True
+
+    @staticmethod
+    def disable():
+        """Stops recording spans; the recorded spans are kept."""
+        Tracer.enabled = False
+
+    @staticmethod
+    def reap(process, timeout=None, output=None, stderr=None):
+        """
+        Waits for a subprocess.Popen child with os.wait4() and sets its returncode, as Popen.wait() would.
+        'output' and 'stderr' are what the caller has read from the child so far; a timeout reports them.
+
+        Returns:
+            The child's resource usage, or None if it was reaped elsewhere (or wait4() is not available).
+
+        Raises:
+            subprocess.TimeoutExpired: if the child does not exit within 'timeout' seconds.
+        """
+        if process.returncode is not None or not hasattr(os, "wait4"):
+            try:
+                process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                raise subprocess.TimeoutExpired(process.args, timeout, output, stderr) from None
+            return None
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                pid, status, rusage = os.wait4(process.pid, 0 if deadline is None else os.WNOHANG)
+            except ChildProcessError:
+                process.wait()
+                return None
+            if pid == process.pid:
+                process.returncode = -os.WTERMSIG(status) if os.WIFSIGNALED(status) else os.WEXITSTATUS(status)
+                return rusage
+            if time.monotonic() >= deadline:
+                raise subprocess.TimeoutExpired(process.args, timeout, output, stderr)
+            time.sleep(0.005)
+
+    @staticmethod
+    def communicate(process, timeout=None):
+        """
+        Popen.communicate() for a child with stdout and stderr pipes and no stdin pipe, which reaps the child with
+        reap() so that its resource usage is known.
+
+        Returns:
+            A (stdout bytes, stderr bytes, resource usage or None) tuple.
+
+        Raises:
+            subprocess.TimeoutExpired: if the child runs longer than 'timeout' seconds. The output read so far is in its
+                'output' and 'stderr' attributes; Popen.communicate() returns the rest.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        outputs = {process.stdout: bytearray(), process.stderr: bytearray()}
+        with selectors.DefaultSelector() as selector:
+            for stream in outputs:
+                selector.register(stream, selectors.EVENT_READ)
+            while selector.get_map():
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise subprocess.TimeoutExpired(process.args, timeout, bytes(outputs[process.stdout]), bytes(outputs[process.stderr]))
+                for key, _ in selector.select(remaining):
+                    chunk = os.read(key.fd, 65536)
+                    if chunk:
+                        outputs[key.fileobj].extend(chunk)
+                    else:
+                        selector.unregister(key.fileobj)
+        # The child may close its pipes and keep running, so the wait for it reports the output as well.
+        rusage = Tracer.reap(process, None if deadline is None else max(0.0, deadline - time.monotonic()),
+                             bytes(outputs[process.stdout]), bytes(outputs[process.stderr]))
+        process.stdout.close()
+        process.stderr.close()
+        return bytes(outputs[process.stdout]), bytes(outputs[process.stderr]), rusage
+
+    @staticmethod
+    def command_name(command):
+        """Returns the short name spans are grouped by: the executable and its first argument, e.g. 'brew install'."""
+        argv = command.split() if isinstance(command, str) else list(command)
+        return " ".join(os.path.basename(part) if index == 0 else part for index, part in enumerate(argv[:2]))
+
+    @staticmethod
+    def record(name, category, start, duration, track=None, **details):
+        """
+        Records a span if tracing is enabled.
+
+        Parameters:
+            name: the span name.
+            category: Tracer.COMMAND or Tracer.STEP.
+            start: the perf_counter() value when the span started.
+            duration: the length of the span in seconds.
+            track: the trace track (row) the span is drawn on; defaults to the current thread.
+            details: extra values shown with the span, e.g. argv and exit_code.
+        """
+        if not Tracer.enabled:
+            return
+        span = {
+            "name": name,
+            "category": category,
+            "start": start - Tracer.origin,
+            "duration": duration,
+            "track": track if track is not None else threading.get_ident(),
+            **details,
+        }
+        with Tracer.lock:
+            Tracer.spans.append(span)
+
+    @staticmethod
+    def record_command(command, start, returncode, pid=None, rusage=None, timed_out=False):
+        """
+        Records the span of a finished command, from its start time until now.
+
+        Parameters:
+            command: the command (string or list).
+            start: the perf_counter() value when the command was started.
+            returncode: the exit code, negative for a signal.
+            pid: the process ID; each process gets its own track so concurrent commands do not overlap.
+            rusage: the resource usage returned by os.wait4(), if known.
+            timed_out: True if the command was killed because it ran out of time.
+        """
+        if not Tracer.enabled:
+            return
+        details = {
+            "argv": command if isinstance(command, str) else list(command),
+            "exit_code": returncode,
+            "timed_out": timed_out,
+        }
+        if rusage is not None:
+            details["user_time"] = rusage.ru_utime
+            details["system_time"] = rusage.ru_stime
+            # ru_maxrss is in kilobytes on Linux and in bytes on macOS.
+            details["max_rss_kib"] = rusage.ru_maxrss // 1024 if sys.platform == "darwin" else rusage.ru_maxrss
+        Tracer.record(Tracer.command_name(command), Tracer.COMMAND, start, time.perf_counter() - start, pid, **details)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def span(name, category=None, **details):
+        """Records a span around the body of a 'with' block, e.g. an install step."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            Tracer.record(name, category or Tracer.STEP, start, time.perf_counter() - start, **details)
+
+    @staticmethod
+    def chrome_trace(spans=None):
+        """Returns the spans as a Chrome trace dictionary of complete ('X') events with microsecond times."""
+        events = []
+        for span in spans if spans is not None else list(Tracer.spans):
+            args = {key: value for key, value in span.items() if key not in ("name", "category", "start", "duration", "track")}
+            events.append({
+                "name": span["name"],
+                "cat": span["category"],
+                "ph": "X",
+                "ts": round(span["start"] * 1e6, 1),
+                "dur": round(span["duration"] * 1e6, 1),
+                "pid": os.getpid(),
+                "tid": span["track"],
+                "args": args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    @staticmethod
+    def write_chrome_trace(path, spans=None):
+        """Writes the spans to 'path' as Chrome trace JSON."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(Tracer.chrome_trace(spans), f)
+
+    @staticmethod
+    def summarize(spans=None):
+        """
+        Groups the command spans by name.
+
+        Returns:
+            A list of dictionaries with the keys name, count, total, max, cpu (user plus system seconds) and
+            max_rss_kib, the most time-consuming command first. cpu and max_rss_kib are None when no span of the
+            group has resource usage.
+        """
+        groups = {}
+        for span in spans if spans is not None else list(Tracer.spans):
+            if span["category"] != Tracer.COMMAND:
+                continue
+            group = groups.setdefault(span["name"], {"name": span["name"], "count": 0, "total": 0.0, "max": 0.0, "cpu": None, "max_rss_kib": None})
+            group["count"] += 1
+            group["total"] += span["duration"]
+            group["max"] = max(group["max"], span["duration"])
+            if "max_rss_kib" in span:
+                group["cpu"] = (group["cpu"] or 0.0) + span["user_time"] + span["system_time"]
+                group["max_rss_kib"] = max(group["max_rss_kib"] or 0, span["max_rss_kib"])
+        return sorted(groups.values(), key=lambda group: group["total"], reverse=True)
+
+    @staticmethod
+    def format_timings(spans=None):
+        """Returns the per-command summary as a text table."""
+        lines = [f"{'command':<32} {'count':>5} {'total s':>9} {'max s':>8} {'cpu s':>8} {'max RSS MiB':>12}"]
+        for group in Tracer.summarize(spans):
+            cpu = f"{group['cpu']:.2f}" if group["cpu"] is not None else "-"
+            rss = f"{group['max_rss_kib'] / 1024:.1f}" if group["max_rss_kib"] is not None else "-"
+            lines.append(f"{group['name'][:32]:<32} {group['count']:>5} {group['total']:>9.2f} {group['max']:>8.2f} {cpu:>8} {rss:>12}")
+        return "\n".join(lines)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the components.version module, a comparable version number parsed once from tool output.
+
+Tools print versions in many shapes ('Homebrew 4.4.24', 'v0.14.1', 'xcode-select version 2409.',
+'Command Line Tools version 16.2.0.0.1.1733547573'). Version.parse() finds the version in such a line, and
+Version objects compare numerically part by part, so '3.9.1' < '3.10.0'. Pre-release tags sort below the release they
+lead up to: '3.13.0a1' < '3.13.0b2' < '3.13.0rc1' == '3.13.0-rc1' < '3.13.0'.
+"""
+
+import re
+from functools import total_ordering
+
+@total_ordering
+class Version:
+    __slots__ = ("text", "key")
+
+    # The first word that starts with a digit (optionally after a 'v'), e.g. '4.4.24' in 'Homebrew 4.4.24'.
+    PATTERN = re.compile(r"(?<![\w.])v?(\d[\w.+\-]*)")
+
+    # Kinds of key parts, in sort order. A pre-release tag sorts below the end of a version, so '3.12.0rc1' < '3.12.0',
+    # and the end sorts below a further number, so '3.12' < '3.12.0'. Other words sort after numbers.
+    PRE_RELEASE, NUMBER, WORD = -2, 0, 1
+    END = (-1, 0, "")
+
+    # Pre-release tags -> rank, so that 'dev' < 'alpha' < 'beta' < 'rc'.
+    PRE_RELEASE_TAGS = {"dev": 0, "a": 1, "alpha": 1, "b": 2, "beta": 2, "c": 3, "pre": 3, "preview": 3, "rc": 3}
+
+    def __init__(self, text):
+        """
+        Parameters:
+            text: a version string such as '3.12.1', 'v0.14.1' or '2409.'; a leading 'v' and trailing dots are dropped.
+        """
+        text = text.strip().rstrip(".")
+        if text[:1] == "v" and text[1:2].isdigit():
+            text = text[1:]
+        self.text = text
+        self.key = Version.make_key(text)
+
+    @staticmethod
+    def make_key(text):
+        """
+        Returns the sort key of a version string: a tuple of (kind, number, text) parts ending with Version.END.
+        Numbers compare as numbers, and a number and a word written together ('0rc1') are separate parts.
+        """
+        key = []
+        for part in re.split(r"[.\-+_]", text):
+            for piece in re.findall(r"\d+|\D+", part) or [part]:
+                if piece.isdigit():
+                    key.append((Version.NUMBER, int(piece), ""))
+                elif piece.lower() in Version.PRE_RELEASE_TAGS:
+                    key.append((Version.PRE_RELEASE, Version.PRE_RELEASE_TAGS[piece.lower()], piece.lower()))
+                else:
+                    key.append((Version.WORD, 0, piece))
+        key.append(Version.END)
+        return tuple(key)
+
+    @staticmethod
+    def sort_text(key):
+        """
+        Returns a sort key as a string that sorts like the key, for databases that can only compare text.
+        Numbers are prefixed with their length, so '0210' (10) sorts after '019' (9). Pre-release tags ('!') and
+        the end of the version ('#') sort before every number.
+        """
+        parts = []
+        for kind, number, text in key:
+            if kind == Version.NUMBER:
+                digits = str(number)
+                parts.append(f"0{len(digits):02d}{digits}")
+            elif kind == Version.PRE_RELEASE:
+                parts.append(f"!{number}{text}")
+            elif kind == Version.WORD:
+                parts.append("1" + text)
+            else:
+                parts.append("#")
+        return " ".join(parts)
+
+    @staticmethod
+    def parse(output):
+        """Returns the Version found in the first line of tool output that has one, or None."""
+        if not output:
+            return None
+        match = Version.PATTERN.search(output)
+        return Version(match.group(1)) if match else None
+
+    @property
+    def release(self):
+        """Returns the leading numeric parts, e.g. (3, 12, 1) for '3.12.1-rc1'."""
+        numbers = []
+        for kind, number, _ in self.key:
+            if kind != Version.NUMBER:
+                break
+            numbers.append(number)
+        return tuple(numbers)
+
+    @staticmethod
+    def coerce(other):
+        """Returns 'other' as a Version; strings are parsed, anything else is returned as is."""
+        return Version(other) if isinstance(other, str) else other
+
+    def __eq__(self, other):
+        other = Version.coerce(other)
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.key == other.key
+
+    def __lt__(self, other):
+        other = Version.coerce(other)
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.key < other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return f"Version('{self.text}')"
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the components.version_index module, a sorted index of available versions answering version specs with a
+binary search.
+
+Version specs:
+    latest              : the newest stable version.
+    latest:3.12         : the newest stable version starting with 3.12 (3.12, 3.12.x, but not 3.120).
+    >=3.11,<3.13        : the newest stable version within all constraints (operators <, <=, >, >=, ==, !=).
+    3.12.1, pypy3.10-.. : exactly this version, if available.
+    3.12                : like latest:3.12 when 3.12 itself is not available.
+
+Stable versions have numeric parts only (3.12.1, not 3.13.0rc1). A pre-release is only chosen when no stable version
+matches, or when it is named exactly.
+"""
+
+import bisect
+import re
+
+from components.utils.version import Version
+
+class VersionIndex:
+    # A version string, as opposed to names like 'pypy3.10-7.3.12' or 'miniconda3-latest'.
+    PLAIN = re.compile(r"^v?\d[\w.+\-]*$")
+
+    CONSTRAINT = re.compile(r"^(<=|>=|==|!=|<|>|=)\s*(\S+)$")
+
+    def __init__(self, names):
+        """
+        Parameters:
+            names: the available version names, in any order (e.g. the lines of 'asdf list all python').
+        """
+        names = [name.strip() for name in names if name.strip()]
+        self.names = set(names)
+        # Version() drops a leading 'v', so the original name is kept for installs.
+        self.name_of = {Version(name).key: name for name in names if VersionIndex.PLAIN.match(name)}
+        self.keys = sorted(self.name_of)
+        self.versions = [Version(self.name_of[key]) for key in self.keys]
+
+    def __len__(self):
+        return len(self.versions)
+
+    @staticmethod
+    def is_stable(version):
+        return all(kind == Version.NUMBER for kind, _, _ in version.key[:-1])
+
+    @staticmethod
+    def prefix_bounds(prefix):
+        """Returns the [low, high) key range of the versions starting with a numeric prefix, or None."""
+        # Without the end marker, the prefix sorts before every version that starts with it, pre-releases included.
+        key = Version(prefix).key[:-1]
+        if not key or any(kind != Version.NUMBER for kind, _, _ in key):
+            return None
+        high = key[:-1] + ((0, key[-1][1] + 1, ""),)
+        return key, high
+
+    def span(self, spec):
+        """
+        Returns (low, high, excluded): the index range of versions matching the spec and the keys inside it that
+        are excluded by '!=' constraints.
+
+        Raises:
+            ValueError: if the spec cannot be parsed.
+        """
+        low, high, excluded = 0, len(self.keys), set()
+        if spec == "latest":
+            return low, high, excluded
+        prefix = spec[len("latest:"):] if spec.startswith("latest:") else None
+        if prefix is None and VersionIndex.PLAIN.match(spec):
+            prefix = spec
+        if prefix is not None:
+            bounds = VersionIndex.prefix_bounds(prefix)
+            if bounds is None:
+                raise ValueError(f"'{spec}' needs a numeric prefix, such as 'latest:3.12'.")
+            return bisect.bisect_left(self.keys, bounds[0]), bisect.bisect_left(self.keys, bounds[1]), excluded
+        for clause in spec.split(","):
+            match = VersionIndex.CONSTRAINT.match(clause.strip())
+            if not match:
+                raise ValueError(f"Cannot parse the version constraint '{clause.strip()}'; use e.g. '>=3.11,<3.13'.")
+            operator, key = match.group(1), Version(match.group(2)).key
+            if operator in (">=", "==", "="):
+                low = max(low, bisect.bisect_left(self.keys, key))
+            if operator == ">":
+                low = max(low, bisect.bisect_right(self.keys, key))
+            if operator in ("<=", "==", "="):
+                high = min(high, bisect.bisect_right(self.keys, key))
+            if operator == "<":
+                high = min(high, bisect.bisect_left(self.keys, key))
+            if operator == "!=":
+                excluded.add(key)
+        return low, high, excluded
+
+    def select(self, spec):
+        """Returns the versions matching the spec, oldest first."""
+        if spec in self.names and not spec.startswith("latest"):
+            return [Version(spec)]
+        low, high, excluded = self.span(spec)
+        return [version for version in self.versions[low:high] if version.key not in excluded]
+
+    def resolve(self, spec):
+        """
+        Returns the name of the version to install for the spec, or None if no available version matches.
+
+        Raises:
+            ValueError: if the spec cannot be parsed.
+        """
+        if spec in self.names and not spec.startswith("latest"):
+            return spec
+        low, high, excluded = self.span(spec)
+        fallback = None
+        # Newest first; pre-releases are passed over while a stable version may still come.
+        for index in range(high - 1, low - 1, -1):
+            version = self.versions[index]
+            if version.key in excluded:
+                continue
+            if VersionIndex.is_stable(version):
+                return self.name_of[version.key]
+            if fallback is None:
+                fallback = self.name_of[version.key]
+        return fallback
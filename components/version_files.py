@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the components.version_files module that reads tool versions directly from files on disk.
+
+Running 'brew --version' boots Homebrew's shell and Ruby layers, and 'asdf --version' starts a shell script. The same
+answers are available from metadata the tools leave on disk:
+    - Homebrew: the git tag checked out in the Homebrew repository (stable Homebrew always sits on a release tag).
+    - asdf: the Cellar directory of a Homebrew install, or the version.txt file of a git install.
+    - Homebrew formulae: the directories under <prefix>/Cellar/<formula>.
+    - asdf plugins: the directories under $ASDF_DATA_DIR/installs/<plugin>.
+
+The version of the Xcode command-line tools package is read from the receipt written by its installer. It is not what
+'xcode-select --version' prints (the version of xcode-select itself, e.g. 'xcode-select version 2409.'), so it does
+not stand in for that command.
+
+Every reader returns None when the files are missing or not understood, so the caller can fall back to running the tool.
+"""
+
+import os
+import re
+import shutil
+
+from components.utils.command_result import CommandResult
+from components.utils.version import Version
+
+class VersionFiles:
+    # Package receipts of the Xcode command-line tools (newer macOS versions use the first location).
+    CLT_RECEIPTS = [
+        "/Library/Apple/System/Library/Receipts/com.apple.pkg.CLTools_Executables.plist",
+        "/var/db/receipts/com.apple.pkg.CLTools_Executables.plist",
+    ]
+
+    @staticmethod
+    def read_text(path):
+        """Returns the stripped contents of a small text file, or None if it cannot be read."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read().strip()
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    @staticmethod
+    def resolve_executable(name):
+        """Returns the real path of an executable found on PATH, or None."""
+        located = shutil.which(name)
+        return os.path.realpath(located) if located else None
+
+    # Homebrew
+
+    @staticmethod
+    def git_head_commit(git_dir):
+        """Returns the commit SHA that HEAD points to in a git directory, following one level of symbolic ref."""
+        head = VersionFiles.read_text(os.path.join(git_dir, "HEAD"))
+        if head is None:
+            return None
+        if not head.startswith("ref: "):
+            return head
+        ref = head[len("ref: "):]
+        sha = VersionFiles.read_text(os.path.join(git_dir, ref))
+        if sha:
+            return sha
+        return VersionFiles.packed_refs(git_dir).get(ref)
+
+    @staticmethod
+    def packed_refs(git_dir):
+        """
+        Parses .git/packed-refs into a dictionary of ref name to commit SHA. For annotated tags, the peeled
+        commit (the '^<sha>' line) replaces the SHA of the tag object.
+        """
+        refs = {}
+        previous = None
+        text = VersionFiles.read_text(os.path.join(git_dir, "packed-refs")) or ""
+        for line in text.splitlines():
+            if line.startswith("#") or not line:
+                continue
+            if line.startswith("^") and previous:
+                refs[previous] = line[1:]
+                continue
+            sha, _, name = line.partition(" ")
+            refs[name] = sha
+            previous = name
+        return refs
+
+    @staticmethod
+    def git_tags_at(git_dir, sha):
+        """Returns the names of the tags that point at the given commit."""
+        tags = []
+        for name, tag_sha in VersionFiles.packed_refs(git_dir).items():
+            if name.startswith("refs/tags/") and tag_sha == sha:
+                tags.append(name[len("refs/tags/"):])
+        tags_dir = os.path.join(git_dir, "refs", "tags")
+        if os.path.isdir(tags_dir):
+            for name in os.listdir(tags_dir):
+                if VersionFiles.read_text(os.path.join(tags_dir, name)) == sha and name not in tags:
+                    tags.append(name)
+        return tags
+
+    @staticmethod
+    def homebrew_repository():
+        """Returns the Homebrew repository: $HOMEBREW_REPOSITORY, or the directory above the resolved 'brew' executable."""
+        if os.environ.get("HOMEBREW_REPOSITORY"):
+            return os.environ["HOMEBREW_REPOSITORY"]
+        brew = VersionFiles.resolve_executable("brew")
+        if brew is None:
+            return None
+        return os.path.dirname(os.path.dirname(brew))
+
+    @staticmethod
+    def homebrew_ref_paths(repository=None):
+        """
+        Returns the paths of the Homebrew repository that change when Homebrew is updated: the HEAD, packed-refs and
+        refs/tags of its git directory. Returns an empty list if the repository cannot be found.
+        """
+        if repository is None:
+            repository = VersionFiles.homebrew_repository()
+        if repository is None:
+            return []
+        git_dir = os.path.join(repository, ".git")
+        return [os.path.join(git_dir, name) for name in ("HEAD", "packed-refs", os.path.join("refs", "tags"))]
+
+    @staticmethod
+    def homebrew_version(repository=None):
+        """
+        Reads the Homebrew version from the release tag checked out in the Homebrew repository.
+        Returns a CommandResult with stdout like 'Homebrew 4.4.24', or None.
+        """
+        if repository is None:
+            repository = VersionFiles.homebrew_repository()
+        if repository is None:
+            return None
+        git_dir = os.path.join(repository, ".git")
+        sha = VersionFiles.git_head_commit(git_dir)
+        if not sha:
+            return None
+        tags = [tag for tag in VersionFiles.git_tags_at(git_dir, sha) if re.match(r"^\d+(\.\d+)*$", tag)]
+        if not tags:
+            # HEAD is between releases (e.g. a developer checkout); only 'git describe' can name it.
+            return None
+        return CommandResult.ok("Homebrew " + max(tags, key=Version))
+
+    @staticmethod
+    def homebrew_cellar():
+        """Returns the Homebrew Cellar: $HOMEBREW_CELLAR, or the Cellar of the prefix whose bin directory holds 'brew'."""
+        if os.environ.get("HOMEBREW_CELLAR"):
+            return os.environ["HOMEBREW_CELLAR"]
+        brew = shutil.which("brew")
+        if brew is None:
+            return None
+        return os.path.join(os.path.dirname(os.path.dirname(brew)), "Cellar")
+
+    @staticmethod
+    def homebrew_formula_versions(formula, cellar=None):
+        """
+        Lists the installed versions of a Homebrew formula from <cellar>/<formula>, like 'brew list --versions':
+        stdout is '<formula> <version> ...', or empty if the formula is not installed.
+        Returns a CommandResult, or None if there is no Cellar directory.
+        """
+        if cellar is None:
+            cellar = VersionFiles.homebrew_cellar()
+        if cellar is None or not os.path.isdir(cellar):
+            return None
+        try:
+            versions = [name for name in os.listdir(os.path.join(cellar, formula)) if not name.startswith(".")]
+        except OSError:
+            return CommandResult.ok("")
+        if not versions:
+            return CommandResult.ok("")
+        return CommandResult.ok(" ".join([formula] + sorted(versions, key=Version)))
+
+    # Xcode command-line tools
+
+    @staticmethod
+    def command_line_tools_version(receipts=None):
+        """
+        Reads the version of the Xcode command-line tools package from its installer receipt.
+        Returns a CommandResult with stdout like '16.2.0.0.1.1733547573', or None.
+        """
+        # plistlib pulls in the XML parser, so it is only imported when a receipt is read.
+        import plistlib
+
+        for path in receipts if receipts is not None else VersionFiles.CLT_RECEIPTS:
+            try:
+                with open(path, "rb") as f:
+                    receipt = plistlib.load(f)
+            except (OSError, plistlib.InvalidFileException, ValueError):
+                continue
+            version = receipt.get("PackageVersion")
+            if version:
+                return CommandResult.ok(version)
+        return None
+
+    # asdf
+
+    @staticmethod
+    def asdf_dir():
+        """Returns the asdf installation directory of a git install: $ASDF_DIR or ~/.asdf."""
+        return os.environ.get("ASDF_DIR") or os.path.join(os.path.expanduser("~"), ".asdf")
+
+    @staticmethod
+    def asdf_data_dir():
+        """Returns the asdf data directory: $ASDF_DATA_DIR or ~/.asdf."""
+        return os.environ.get("ASDF_DATA_DIR") or os.path.join(os.path.expanduser("~"), ".asdf")
+
+    @staticmethod
+    def asdf_version(executable=None):
+        """
+        Reads the asdf version from the path of the resolved 'asdf' executable:
+            - <prefix>/Cellar/asdf/<version>/bin/asdf for a Homebrew install (stdout like 'asdf version 0.16.7');
+            - <asdf dir>/bin/asdf next to a version.txt file for a git install (stdout like 'v0.14.1').
+        Returns a CommandResult, or None.
+        """
+        if executable is None:
+            executable = VersionFiles.resolve_executable("asdf")
+        if executable is None:
+            return None
+
+        match = re.search(r"/Cellar/asdf/([^/]+)/", executable)
+        if match:
+            # Homebrew appends '_<revision>' to rebuilt formulae.
+            return CommandResult.ok("asdf version " + re.sub(r"_\d+$", "", match.group(1)))
+
+        version = VersionFiles.read_text(os.path.join(os.path.dirname(os.path.dirname(executable)), "version.txt"))
+        if version:
+            return CommandResult.ok(version if version.startswith("v") else "v" + version)
+        return None
+
+    @staticmethod
+    def asdf_plugin_versions(plugin_name, data_dir=None):
+        """
+        Lists the installed versions of an asdf plugin from $ASDF_DATA_DIR/installs/<plugin_name>, one per line
+        in ascending order. Returns a CommandResult, or None if the plugin has no installs directory.
+        """
+        installs = os.path.join(data_dir if data_dir is not None else VersionFiles.asdf_data_dir(), "installs", plugin_name)
+        try:
+            versions = [name for name in os.listdir(installs) if os.path.isdir(os.path.join(installs, name))]
+        except OSError:
+            return None
+        return CommandResult.ok("\n".join("  " + version for version in sorted(versions, key=Version)))
+
+    @staticmethod
+    def read(command):
+        """
+        Answers a probe command from disk if a reader exists for it:
+            ['brew', '--version'], ['asdf', '--version'] and ['asdf', <plugin>, 'list'].
+        Returns a CommandResult, or None if the command must be run.
+        """
+        if command == ["brew", "--version"]:
+            return VersionFiles.homebrew_version()
+        if command == ["asdf", "--version"]:
+            return VersionFiles.asdf_version()
+        if len(command) == 3 and command[0] == "asdf" and command[2] == "list":
+            return VersionFiles.asdf_plugin_versions(command[1])
+        return None
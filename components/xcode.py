@@ -10,72 +10,80 @@ LICENSE file in the root directory of this source tree.
 This is the components.xcode module that installs Xcode command line tools and checks for the version.
 """
 
-import subprocess
+from components.utils.installable_component import InstallableComponent
+from components.utils.subproc import Subproc
+from components.version_files import VersionFiles
+
+class Xcode(InstallableComponent):
+    # Seconds 'softwareupdate' may run before it is killed; it contacts Apple's update catalog.
+    SOFTWARE_UPDATE_TIMEOUT = 600
+
+    NOT_INSTALLED_MSG = "Xcode command-line tools are not installed. \nInstall using this command: beezeebot_cli.py -i xcode-select"
+
+    def install(self, on_line=None, log_path=None):
+        """Install the Xcode command-line tools. See install_command_line_tools()."""
+        return Xcode.install_command_line_tools(on_line, log_path)
+
+    def uninstall(self):
+        """Uninstalling the Xcode command-line tools is not supported."""
+        return InstallableComponent.not_supported("Uninstalling the Xcode command-line tools")
+
+    def check_version(self, refresh=False):
+        """Check the Xcode command-line tools version. See get_command_line_tools_version()."""
+        return Xcode.get_command_line_tools_version(refresh)
+
+    @staticmethod
+    def get_probes():
+        """
+        Returns the read-only commands used by the scanner to inventory the Xcode command-line tools as a list of
+        (name, command, timeout) tuples. A timeout of None means the scanner default is used.
+        """
+        return [
+            ("xcode-select", ["xcode-select", "--version"], None)
+        ]
 
-class Xcode:
     @staticmethod
-    def get_command_line_tools_version():
+    def get_command_line_tools_version(refresh=False):
         """
-        Executes the 'xcode-select --version' command and returns a dictionary with:
+        Executes the 'xcode-select --version' command and returns a CommandResult with:
             - success: True if command succeeds, False otherwise.
             - stdout: Standard output from the command.
             - stderr: Standard error output from the command.
+
+        Unless 'refresh' is True, the cached result of the command is reused.
+        """
+        return Subproc.run_version_command(['xcode-select', '--version'], refresh)
+
+    @staticmethod
+    def get_package_version():
+        """
+        Reads the version of the installed command-line tools package (e.g. '16.2.0.0.1.1733547573') from its installer
+        receipt, without running anything. Returns a CommandResult, or None if no receipt is found.
         """
-        try:
-            result = subprocess.run(
-                ['xcode-select', '--version'],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return {
-                'success': True,
-                'stdout': result.stdout.strip(),
-                'stderr': result.stderr.strip()
-            }
-        except subprocess.CalledProcessError as e:
-            return {
-                'success': False,
-                'stdout': e.stdout.strip() if e.stdout else "",
-                'stderr': e.stderr.strip() if e.stderr else str(e)
-            }
+        return VersionFiles.command_line_tools_version()
 
     @staticmethod
-    def install_command_line_tools():
+    def install_command_line_tools(on_line=None, log_path=None):
         """
         Attempts to install the Xcode Command Line Tools by running the 'xcode-select --install' command.
-        Returns a dictionary with:
+        Output lines are passed to 'on_line' as they arrive and written to 'log_path' if given.
+        Returns a CommandResult with:
             - success: True if the installation process was initiated successfully, False otherwise.
             - stdout: Standard output from the command.
             - stderr: Standard error output from the command.
         """
-        try:
-            result = subprocess.run(
-                ['xcode-select', '--install'],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return {
-                'success': True,
-                'stdout': result.stdout.strip(),
-                'stderr': result.stderr.strip()
-            }
-        except subprocess.CalledProcessError as e:
-            return {
-                'success': False,
-                'stdout': e.stdout.strip() if e.stdout else "",
-                'stderr': e.stderr.strip() if e.stderr else str(e)
-            }
+        return Subproc.run_command_streaming(['xcode-select', '--install'], on_line, log_path)
 
     @staticmethod
     def list_software_updates():
         """
         Lists available MacOS software updates using the 'softwareupdate -l' command.
+        This waits for the command; SoftwareUpdates.check() returns the last known result at once and checks in the background.
 
         Returns:
-            A dict with keys:
+            A CommandResult with:
                 - success: True if the command succeeds, False otherwise.
+                - timed_out: True if the command ran longer than Xcode.SOFTWARE_UPDATE_TIMEOUT seconds and was killed.
                 - stdout: Standard output (stripped).
                 - stderr: Standard error (stripped).
 
@@ -87,24 +95,7 @@ class Xcode:
                 - There appears to be a way to install updates according to the help list (softwareupdate --help).
                 - UNKNOWN: where the output for available updates will go (possibly stderr).
         """
-        try:
-            result = subprocess.run(
-                ['softwareupdate', '-l'],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return {
-                'success': True,
-                'stdout': result.stdout.strip(),
-                'stderr': result.stderr.strip()
-            }
-        except subprocess.CalledProcessError as e:
-            return {
-                'success': False,
-                'stdout': e.stdout.strip() if e.stdout else "",
-                'stderr': e.stderr.strip() if e.stderr else str(e)
-            }
+        return Subproc.run_command(['softwareupdate', '-l'], Xcode.SOFTWARE_UPDATE_TIMEOUT)
 
     @staticmethod
     def list_software_updates_history():
@@ -112,8 +103,9 @@ class Xcode:
         List historical MacOS software updates using the 'softwareupdate --history' command.
 
         Returns:
-            A dict with keys:
+            A CommandResult with:
                 - success: True if the command succeeds, False otherwise.
+                - timed_out: True if the command ran longer than Xcode.SOFTWARE_UPDATE_TIMEOUT seconds and was killed.
                 - stdout: Standard output (stripped).
                 - stderr: Standard error (stripped).
 
@@ -125,24 +117,7 @@ class Xcode:
                 - There appears to be a way to install updates according to the help list (softwareupdate --help).
                 - UNKNOWN: where the output for available updates will go (possibly stderr).
         """
-        try:
-            result = subprocess.run(
-                ['softwareupdate', '--history'],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return {
-                'success': True,
-                'stdout': result.stdout.strip(),
-                'stderr': result.stderr.strip()
-            }
-        except subprocess.CalledProcessError as e:
-            return {
-                'success': False,
-                'stdout': e.stdout.strip() if e.stdout else "",
-                'stderr': e.stderr.strip() if e.stderr else str(e)
-            }
+        return Subproc.run_command(['softwareupdate', '--history'], Xcode.SOFTWARE_UPDATE_TIMEOUT)
 
 # unit tests
 if __name__ == '__main__':
@@ -156,31 +131,31 @@ if __name__ == '__main__':
     # Check for, and if necessary, install the Xcode Command Line Tools version.
     utils.print_unit_test_header("get_command_line_tools_version")
     version_info = Xcode.get_command_line_tools_version()
-    if version_info['success']:
-        print("Xcode Command Line Tools version:", version_info['stdout'])
+    if version_info.success:
+        print("Xcode Command Line Tools version:", version_info.stdout)
     else:
         utils.print_unit_test_header("install_command_line_tools")
         print("Xcode Command Line Tools not installed. Attempting installation...")
         install_info = Xcode.install_command_line_tools()
-        if install_info['success']:
+        if install_info.success:
             print("Installation initiated successfully. Please follow the GUI prompts.")
         else:
-            print("Failed to initiate installation. Error details:", install_info['stderr'])
+            print("Failed to initiate installation. Error details:", install_info.stderr)
 
     # List available macOS software updates.
     utils.print_unit_test_header("list_software_updates")
     updates_info = Xcode.list_software_updates()
-    if updates_info['success']:
-        print(updates_info['stdout'])
-        print(updates_info['stderr'])
+    if updates_info.success:
+        print(updates_info.stdout)
+        print(updates_info.stderr)
     else:
-        print("Failed to list software updates. Error details:", updates_info['stderr'])
+        print("Failed to list software updates. Error details:", updates_info.stderr)
 
     # List historical macOS software updates.
     utils.print_unit_test_header("list_software_updates_history")
     history_info = Xcode.list_software_updates_history()
-    if history_info['success']:
+    if history_info.success:
         print("Software updates history:")
-        print(history_info['stdout'])
+        print(history_info.stdout)
     else:
-        print("Failed to list software updates history. Error details:", history_info['stderr'])
+        print("Failed to list software updates history. Error details:", history_info.stderr)
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+Shared pytest fixtures.
+
+Fixtures:
+    - isolated_cache_dir: points the beezeebot cache at a temporary directory so tests never read or write the user's cache.
+"""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "beezeebot-cache"
+    monkeypatch.setenv("BEEZEEBOT_CACHE_DIR", str(cache_dir))
+    return cache_dir
@@ -11,15 +11,29 @@ Support functions for pytest.
 
 Helper Classes:
     - FakeCompletedProcessOutput: encapsulates mock output.
+    - FakePopen: runs a fake subprocess.run() function behind the subprocess.Popen interface used by Subproc.
+    - FakeHttpServer: a local HTTP/1.1 server that serves files from a dictionary, with keep-alive, Range and
+      conditional requests, and records requests and connections.
 
 Helper Functions:
     - fake_run_failure() has a consistent output
+    - patch_subprocess_run() makes Subproc call a fake subprocess.run() function instead of starting a process.
+    - make_stub() writes an executable shell script on a temporary PATH.
+    - make_stub_tool() writes an executable on a temporary PATH that counts how many times it ran.
+    - run_count() returns how many times a tool made by make_stub_tool() ran.
 
 Inline Functions:
     - There are custome versions of fake_run_success() functions are defined inline for each function needed.
 
 """
 
+import hashlib
+import os
+import subprocess
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 
 # Helper class to simulate subprocess.CompletedProcess
 class FakeCompletedProcessOutput:
@@ -37,3 +51,114 @@ def fake_run_failure(args, capture_output, text, check):
         stderr="Command failed"
     )
 
+# Helper class to run a fake subprocess.run() function where Subproc expects subprocess.Popen
+class FakePopen:
+    fake_run = None
+
+    def __init__(self, args, **kwargs):
+        self.args = args
+        self.pid = None
+        try:
+            completed = FakePopen.fake_run(args, capture_output=True, text=True, check=True)
+            self.returncode = 0
+            self.output = (completed.stdout, completed.stderr)
+        except subprocess.CalledProcessError as e:
+            self.returncode = e.returncode
+            self.output = (e.output, e.stderr)
+
+    def communicate(self, timeout=None):
+        return self.output
+
+def patch_subprocess_run(monkeypatch, fake_run):
+    monkeypatch.setattr(FakePopen, "fake_run", staticmethod(fake_run))
+    monkeypatch.setattr(subprocess, "Popen", FakePopen)
+
+# Helper functions that put stub executables on a temporary PATH
+def make_stub(tmp_path, monkeypatch, name, script):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir(exist_ok=True)
+    stub = bin_dir / name
+    stub.write_text("#!/bin/sh\n" + script)
+    stub.chmod(0o755)
+    monkeypatch.setenv("PATH", str(bin_dir) + os.pathsep + os.environ["PATH"])
+    return stub
+
+def make_stub_tool(tmp_path, monkeypatch, name="stubtool", version="1.0"):
+    counter = tmp_path / f"{name}.count"
+    tool = make_stub(tmp_path, monkeypatch, name, f"echo run >> '{counter}'\necho '{name} {version}'\n")
+    return tool, counter
+
+def run_count(counter):
+    return len(counter.read_text().splitlines()) if counter.exists() else 0
+
+# Helper class to serve downloads from memory on 127.0.0.1
+class FakeHttpServer:
+    LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+    def __init__(self, files=None, delay=0.0, redirects=None):
+        """
+        'files' maps request paths such as '/install.sh' to their content (bytes), and 'redirects' maps paths to the
+        paths they redirect to. Every response waits 'delay' seconds before it is sent.
+        """
+        self.files = dict(files or {})
+        self.redirects = dict(redirects or {})
+        self.delay = delay
+        self.requests = []
+        self.connections = set()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server.requests.append((self.path, dict(self.headers)))
+                server.connections.add(self.client_address)
+                time.sleep(server.delay)
+                if self.path in server.redirects:
+                    self.send_response(302)
+                    self.send_header("Location", server.redirects[self.path])
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                content = server.files.get(self.path)
+                if content is None:
+                    self.send_error(404)
+                    return
+                etag = '"' + hashlib.sha256(content).hexdigest()[:16] + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                start = 0
+                if self.headers.get("Range"):
+                    start = int(self.headers["Range"].split("=")[1].split("-")[0])
+                    if start >= len(content):
+                        self.send_error(416)
+                        return
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{len(content) - 1}/{len(content)}")
+                else:
+                    self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", FakeHttpServer.LAST_MODIFIED)
+                self.send_header("Content-Length", str(len(content) - start))
+                self.end_headers()
+                self.wfile.write(content[start:])
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def paths(self):
+        return [path for path, _ in self.requests]
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+Determines if the artifact_cache module downloads each artifact once, verifies checksums, resumes interrupted
+downloads, evicts the least recently used artifacts and falls back to a mirror. Downloads come from a local
+FakeHttpServer.
+"""
+
+import hashlib
+import os
+import time
+
+import pytest
+
+from components.utils.artifact_cache import ArtifactCache
+from tests.pytest_utils import FakeHttpServer
+
+TARBALL = bytes(range(256)) * 400
+TARBALL_SHA256 = hashlib.sha256(TARBALL).hexdigest()
+
+
+# Test functions
+
+def test_artifact_is_downloaded_once(tmp_path):
+    cache = ArtifactCache(str(tmp_path / "artifacts"))
+    with FakeHttpServer({"/Python-3.12.1.tar.xz": TARBALL}) as server:
+        url = server.url + "/Python-3.12.1.tar.xz"
+        path = cache.fetch(url, TARBALL_SHA256)
+        assert path == cache.object_path(TARBALL_SHA256)
+        assert open(path, "rb").read() == TARBALL
+        assert cache.fetch(url, TARBALL_SHA256) == path
+        assert server.paths() == ["/Python-3.12.1.tar.xz"]
+
+def test_checksum_mismatch_is_rejected(tmp_path):
+    cache = ArtifactCache(str(tmp_path / "artifacts"))
+    with FakeHttpServer({"/tampered.tar.xz": TARBALL[:-1] + b"!"}) as server:
+        with pytest.raises(ValueError, match="Checksum mismatch"):
+            cache.fetch(server.url + "/tampered.tar.xz", TARBALL_SHA256)
+    assert not os.path.exists(cache.object_path(TARBALL_SHA256))
+
+def test_interrupted_download_resumes(tmp_path):
+    cache = ArtifactCache(str(tmp_path / "artifacts"))
+    with FakeHttpServer({"/Python-3.12.1.tar.xz": TARBALL}) as server:
+        url = server.url + "/Python-3.12.1.tar.xz"
+        partial = cache.partial_path(url, TARBALL_SHA256)
+        os.makedirs(os.path.dirname(partial))
+        with open(partial, "wb") as f:
+            f.write(TARBALL[:40000])
+        path = cache.fetch(url, TARBALL_SHA256)
+        assert open(path, "rb").read() == TARBALL
+        assert server.requests[0][1]["Range"] == "bytes=40000-"
+
+def test_unpinned_download_is_reused_until_max_age(tmp_path):
+    cache = ArtifactCache(str(tmp_path / "artifacts"))
+    with FakeHttpServer({"/install.sh": b"#!/bin/bash\necho v1\n"}) as server:
+        url = server.url + "/install.sh"
+        first = cache.fetch(url, max_age=60)
+        assert cache.fetch(url, max_age=60) == first
+        server.files["/install.sh"] = b"#!/bin/bash\necho v2\n"
+        assert open(cache.fetch(url), "rb").read().endswith(b"v2\n")
+        assert len(server.requests) == 2
+
+def test_least_recently_used_artifact_is_evicted(tmp_path):
+    files = {f"/{name}": name.encode() * 1000 for name in ("a", "b", "c")}
+    cache = ArtifactCache(str(tmp_path / "artifacts"), max_bytes=2500)
+    with FakeHttpServer(files) as server:
+        paths = {}
+        for name in ("a", "b"):
+            paths[name] = cache.fetch(server.url + "/" + name, hashlib.sha256(files["/" + name]).hexdigest())
+        old = time.time() - 100
+        os.utime(paths["a"], (old, old - 10))
+        os.utime(paths["b"], (old, old))
+        # Using 'a' again makes 'b' the least recently used artifact.
+        cache.fetch(server.url + "/a", hashlib.sha256(files["/a"]).hexdigest())
+        cache.fetch(server.url + "/c", hashlib.sha256(files["/c"]).hexdigest())
+    assert os.path.exists(paths["a"])
+    assert not os.path.exists(paths["b"])
+
+def test_mirror_is_tried_first(tmp_path):
+    with FakeHttpServer({"/" + TARBALL_SHA256: TARBALL}) as mirror, FakeHttpServer() as origin:
+        cache = ArtifactCache(str(tmp_path / "artifacts"), mirror=mirror.url)
+        path = cache.fetch(origin.url + "/Python-3.12.1.tar.xz", TARBALL_SHA256)
+        assert open(path, "rb").read() == TARBALL
+        assert origin.requests == []
+
+        env = cache.build_env({})
+        assert env["PYTHON_BUILD_MIRROR_URL"] == mirror.url
+        assert os.path.isdir(env["RUBY_BUILD_CACHE_PATH"])
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+Determines if version specs resolve against the version index, if the asdf catalog runs 'asdf list all' only when
+its cached list is missing or expired, and if plugin installs use the resolved version.
+
+Helper Functions:
+    - make_asdf_stub() writes an 'asdf' that lists versions and logs every call.
+"""
+
+import time
+
+import pytest
+
+from components.asdf import Asdf
+from components.asdf_catalog import AsdfCatalog
+from components.utils.version import Version
+from components.utils.version_index import VersionIndex
+from tests.pytest_utils import make_stub
+
+PYTHON_VERSIONS = ["2.7.18", "3.9.18", "3.10.14", "3.11.9", "3.11.10", "3.12.0", "3.12.7", "3.13.0rc1", "pypy3.10-7.3.12"]
+
+
+# Helper functions
+def make_asdf_stub(tmp_path, monkeypatch, fail=False):
+    calls = tmp_path / "asdf.calls"
+    listing = "\n".join(PYTHON_VERSIONS)
+    script = f"echo \"$*\" >> '{calls}'\n"
+    script += "exit 1\n" if fail else f"[ \"$1 $2\" = 'list all' ] && printf '%s\\n' '{listing}'\nexit 0\n"
+    make_stub(tmp_path, monkeypatch, "asdf", script)
+    return calls
+
+def call_lines(calls):
+    return calls.read_text().splitlines() if calls.exists() else []
+
+
+# Test functions
+
+@pytest.mark.parametrize("spec, expected", [
+    ("latest", "3.12.7"),
+    ("latest:3.11", "3.11.10"),
+    ("latest:3.1", None),
+    (">=3.10,<3.12", "3.11.10"),
+    (">3.11,!=3.12.7", "3.12.0"),
+    ("3.11", "3.11.10"),
+    ("3.11.9", "3.11.9"),
+    ("latest:3.13", "3.13.0rc1"),
+    ("pypy3.10-7.3.12", "pypy3.10-7.3.12"),
+])
+def test_version_index_resolve(spec, expected):
+    assert VersionIndex(PYTHON_VERSIONS).resolve(spec) == expected
+
+def test_version_index_rejects_bad_specs():
+    index = VersionIndex(PYTHON_VERSIONS)
+    with pytest.raises(ValueError):
+        index.resolve("~3.12")
+    assert [str(version) for version in index.select(">=3.12")] == ["3.12.0", "3.12.7", "3.13.0rc1"]
+
+@pytest.mark.parametrize("versions", [
+    ["3.11.9", "3.12.0a1", "3.12.0a2", "3.12.0b1", "3.12.0rc1", "3.12.0rc2", "3.12.0", "3.12.0.1", "3.12.1rc1", "3.12.1"],
+    ["1.0.0-dev", "1.0.0-alpha.1", "1.0.0-alpha.2", "1.0.0-beta", "1.0.0-rc.1", "1.0.0", "1.0.1"],
+    ["2.0", "2.0.0-rc1", "2.0.0"],
+])
+def test_pre_releases_sort_below_their_release(versions):
+    assert sorted(reversed(versions), key=Version) == versions
+    assert sorted(reversed(versions), key=lambda text: Version.sort_text(Version(text).key)) == versions
+    assert Version("3.12.0rc1") == Version("3.12.0-rc1")
+
+def test_version_index_orders_pre_releases_before_release():
+    index = VersionIndex(["3.11.9", "3.12.0", "3.12.0b1", "3.12.0rc1", "3.12.1"])
+    assert [str(version) for version in index.select("<3.12.0")] == ["3.11.9", "3.12.0b1", "3.12.0rc1"]
+    assert [str(version) for version in index.select("latest:3.12")] == ["3.12.0b1", "3.12.0rc1", "3.12.0", "3.12.1"]
+    assert VersionIndex(["3.11.9", "3.12.0rc1"]).resolve(">=3.12") == "3.12.0rc1"
+    assert VersionIndex(["3.12.0a1", "3.12.0rc1"]).resolve("<3.12.0") == "3.12.0rc1"
+
+def test_catalog_lists_versions_once(tmp_path, monkeypatch):
+    calls = make_asdf_stub(tmp_path, monkeypatch)
+    assert AsdfCatalog().resolve("python", "latest:3.12").stdout == "3.12.7"
+    # A new process loads the catalog file instead of running asdf again.
+    AsdfCatalog.indexes.clear()
+    assert AsdfCatalog().resolve("python", "<3.10").stdout == "3.9.18"
+    assert call_lines(calls) == ["list all python"]
+
+    AsdfCatalog(ttl=0).resolve("python", "latest")
+    assert len(call_lines(calls)) == 2
+
+def test_expired_catalog_is_used_when_listing_fails(tmp_path, monkeypatch):
+    make_asdf_stub(tmp_path, monkeypatch)
+    AsdfCatalog().resolve("python", "latest")
+    make_asdf_stub(tmp_path, monkeypatch, fail=True)
+    AsdfCatalog.indexes.clear()
+    assert AsdfCatalog(ttl=0).resolve("python", "latest").stdout == "3.12.7"
+
+    # The expired list is kept in memory for a short while only; then the next call fetches again.
+    real_time = time.time
+    monkeypatch.setattr(time, "time", lambda: real_time() + 7200)
+    calls = make_asdf_stub(tmp_path, monkeypatch, fail=True)
+    calls.unlink()
+    catalog = AsdfCatalog(ttl=3600)
+    assert catalog.resolve("python", "latest").stdout == "3.12.7"
+    make_asdf_stub(tmp_path, monkeypatch)
+    catalog.resolve("python", "latest")
+    assert len(call_lines(calls)) == 1
+    monkeypatch.setattr(time, "time", lambda: real_time() + 7200 + AsdfCatalog.RETRY_AFTER_FAILURE + 1)
+    catalog.resolve("python", "latest")
+    assert len(call_lines(calls)) == 2
+
+    make_asdf_stub(tmp_path, monkeypatch, fail=True)
+    AsdfCatalog.indexes.clear()
+    result = AsdfCatalog(path=str(tmp_path / "empty.json")).resolve("python", "latest")
+    assert result.success is False
+    assert "asdf list all python" in result.stderr
+
+def test_install_plugin_resolves_version(tmp_path, monkeypatch):
+    calls = make_asdf_stub(tmp_path, monkeypatch)
+    assert Asdf.install_plugin("python", "latest:3.11").success is True
+    assert call_lines(calls)[-1] == "install python 3.11.10"
+
+    result = Asdf.install_plugin("python", "latest:4")
+    assert result.success is False
+    assert "No available python version matches 'latest:4'" in result.stderr
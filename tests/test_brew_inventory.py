@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+Determines if the brew_inventory module indexes recorded 'brew info --json=v2 --installed' and 'brew outdated --json=v2' output.
+
+Helper Functions:
+    - read_fixture() loads a recorded JSON file from tests/fixtures.
+"""
+
+import os
+
+import pytest
+
+from components.brew import Brew
+from components.brew_inventory import BrewInventory
+from components.utils.command_result import CommandResult
+
+
+# Helper functions
+def read_fixture(name):
+    with open(os.path.join(os.path.dirname(__file__), "fixtures", name), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+# Test functions
+
+def test_parse_installed_formulae_and_casks():
+    inventory = BrewInventory.parse(read_fixture("brew_info_installed.json"))
+    assert len(inventory) == 4
+    assert inventory.version("asdf") == "0.16.7"
+    assert inventory.version("direnv") == "2.35.0"
+    assert inventory.get("visual-studio-code")["kind"] == BrewInventory.CASK
+    assert inventory.version("visual-studio-code") == "1.98.2"
+
+def test_lookup_by_alias_and_full_name():
+    inventory = BrewInventory.parse(read_fixture("brew_info_installed.json"))
+    assert inventory.version("openssl") == "3.4.1"
+    assert inventory.is_installed("homebrew/cask/visual-studio-code")
+    assert inventory.missing(["asdf", "python@3.12", "openssl", "ollama"]) == ["python@3.12", "ollama"]
+
+def test_outdated_flags_merged():
+    inventory = BrewInventory.parse(read_fixture("brew_info_installed.json"), read_fixture("brew_outdated.json"))
+    assert inventory.is_outdated("openssl@3")
+    assert inventory.is_outdated("direnv")
+    assert inventory.get("direnv")["latest"] == "2.36.0"
+    assert inventory.is_outdated("visual-studio-code")
+    assert not inventory.is_outdated("asdf")
+    assert not inventory.is_outdated("ollama")
+
+def test_parse_rejects_invalid_json():
+    with pytest.raises(ValueError):
+        BrewInventory.parse("Error: Homebrew is not installed")
+
+def test_get_inventory_costs_two_commands(monkeypatch):
+    calls = []
+
+    async def fake_run_command_async(command, timeout=None):
+        calls.append(command)
+        fixture = "brew_info_installed.json" if command[1] == "info" else "brew_outdated.json"
+        return CommandResult.ok(read_fixture(fixture).encode())
+
+    monkeypatch.setattr("components.utils.subproc.Subproc.run_command_async", fake_run_command_async)
+    result = Brew.get_inventory()
+    assert result["success"] is True
+    assert len(calls) == 2
+    inventory = result.value
+    assert [Brew.is_plugin_installed(name, inventory) for name in Brew.PLUGINS] == [True, True]
+    assert len(calls) == 2
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+Determines if Homebrew plugins are installed with one command, asdf plugins in parallel, and results are reported per package.
+"""
+
+import time
+
+from components.brew import Brew
+from components.asdf import Asdf
+from components.install_scheduler import InstallScheduler, InstallStep
+from components.utils.command_result import CommandResult
+from tests.pytest_utils import make_stub
+
+
+# Test functions
+
+def test_brew_install_plugins_single_command(tmp_path, monkeypatch):
+    calls = tmp_path / "calls"
+    make_stub(tmp_path, monkeypatch, "brew", f'echo "$@" >> "{calls}"\necho "installed $*"\n')
+    results = Brew.install_plugins(["asdf", "direnv", "asdf"])
+    assert calls.read_text().splitlines() == ["install asdf direnv"]
+    assert list(results) == ["asdf", "direnv"]
+    assert all(result["success"] for result in results.values())
+
+def test_brew_install_plugins_reports_per_package(tmp_path, monkeypatch):
+    def fake_inventory():
+        class Inventory:
+            def is_installed(self, name):
+                return name == "asdf"
+        return CommandResult.ok(value=Inventory())
+
+    make_stub(tmp_path, monkeypatch, "brew", 'echo "Error: direnv: download failed" >&2\nexit 1\n')
+    monkeypatch.setattr(Brew, "get_inventory", fake_inventory)
+    results = Brew.install_plugins(["asdf", "direnv", "ollama"])
+    assert results["asdf"]["success"] is True
+    assert results["direnv"]["success"] is False
+    assert "download failed" in results["direnv"]["stderr"]
+    assert results["ollama"]["success"] is False
+    assert "not found" in results["ollama"]["stderr"]
+
+def test_asdf_install_plugins_in_parallel(tmp_path, monkeypatch):
+    make_stub(tmp_path, monkeypatch, "asdf", 'sleep 0.5\n[ "$2" != ruby ]\n')
+    start = time.monotonic()
+    results = Asdf.install_plugins(["python", "nodejs", "ruby"], max_workers=3)
+    assert time.monotonic() - start < 1.4
+    assert results["python"]["success"] is True
+    assert results["nodejs"]["success"] is True
+    assert results["ruby"]["success"] is False
+
+def test_scheduler_batches_ready_steps():
+    batches = []
+
+    def batch_install(names):
+        batches.append(names)
+        return {name: CommandResult.ok() for name in names}
+
+    batch = ("brew install", batch_install)
+    steps = {
+        "brew": InstallStep("brew", [], lambda: CommandResult.ok()),
+        "asdf": InstallStep("asdf", ["brew"], None, resource="brew", batch=batch),
+        "direnv": InstallStep("direnv", ["brew"], None, resource="brew", batch=batch),
+        "ollama": InstallStep("ollama", ["brew"], None, check=lambda: True, resource="brew", batch=batch),
+    }
+    results = InstallScheduler.run(["asdf", "direnv", "ollama"], steps)
+    assert batches == [["asdf", "direnv"]]
+    assert results["asdf"]["status"] == InstallScheduler.INSTALLED
+    assert results["ollama"]["status"] == InstallScheduler.ALREADY_INSTALLED
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+Determines if CommandResult keeps raw output until it is read, stays immutable, and if Version parses and orders tool versions.
+"""
+
+import pytest
+
+from components.utils.command_result import CommandResult
+from components.utils.subproc import Subproc
+from components.utils.version import Version
+
+
+# Test functions
+
+def test_output_is_decoded_on_first_read():
+    result = Subproc.run_command(["sh", "-c", "echo '  Homebrew 4.4.24  '; echo warn >&2"])
+    assert result.raw_stdout == b"  Homebrew 4.4.24  \n"
+    assert result.stdout == "Homebrew 4.4.24"
+    assert result.stdout is result.stdout
+    assert result.returncode == 0
+    assert result.duration > 0
+    assert result.version == Version("4.4.24")
+
+def test_result_is_immutable_and_compact():
+    result = CommandResult.ok("asdf version 0.16.7")
+    with pytest.raises(AttributeError):
+        result.returncode = 1
+    assert not hasattr(result, "__dict__")
+    changed = result.replace(returncode=2, stderr=b"boom")
+    assert (changed.success, changed.stderr, result.success) == (False, "boom", True)
+
+def test_failure_message_and_dict_compatibility():
+    result = CommandResult(None, b"", b"partial output", timed_out=True, message="Command 'x' timed out after 1 seconds")
+    assert result["success"] is False
+    assert result["stderr"] == "partial output\nCommand 'x' timed out after 1 seconds"
+    assert result.get("timed_out") is True
+    assert result.get("no-such-key", "default") == "default"
+    with pytest.raises(KeyError):
+        result["no-such-key"]
+    assert result.version is None
+
+def test_round_trip_through_dict():
+    result = CommandResult(0, b"xcode-select version 2409.\n", duration=0.25)
+    assert CommandResult.from_dict(result.to_dict()) == result
+    assert CommandResult.from_dict({"success": False, "stdout": "", "stderr": "old"}).returncode == 1
+
+@pytest.mark.parametrize("output, expected", [
+    ("Homebrew 4.4.24", "4.4.24"),
+    ("v0.14.1", "0.14.1"),
+    ("asdf version 0.16.7", "0.16.7"),
+    ("xcode-select version 2409.", "2409"),
+    ("Command Line Tools version 16.2.0.0.1.1733547573", "16.2.0.0.1.1733547573"),
+    ("macOS 15.3.1", "15.3.1"),
+    ("no version here", None),
+])
+def test_version_parse(output, expected):
+    version = Version.parse(output)
+    assert (str(version) if version else None) == expected
+
+def test_version_ordering():
+    assert Version("3.9.18") < Version("3.10.0") < "3.12.1"
+    assert sorted(["3.12.1", "3.9.18", "3.11.11"], key=Version) == ["3.9.18", "3.11.11", "3.12.1"]
+    assert Version("v1.2") == Version("1.2")
+    assert Version("3.12.1-rc1").release == (3, 12, 1)
+    assert len({Version("1.0"), Version("1.0")}) == 1
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+Determines if the daemon answers requests over its socket, refuses requests from another environment, if a client gives
+up on a daemon that does not answer, and if the CLI uses it when it runs and falls back to running in-process when it
+does not.
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from components.daemon import Daemon
+from components.utils.probe_cache import ProbeCache
+from tests.pytest_utils import make_stub
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Fixtures
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    """Serves a Daemon with test handlers on a thread."""
+    monkeypatch.setenv("BEEZEEBOT_DAEMON_SOCKET", str(tmp_path / "d.sock"))
+    monkeypatch.setattr(ProbeCache, "resident", None)
+    calls = []
+
+    def echo(args):
+        calls.append(args)
+        return f"echo {args['text']}"
+
+    def broken(args):
+        raise RuntimeError("broken handler")
+
+    def slow(args):
+        time.sleep(args["seconds"])
+        return "slow"
+
+    server = Daemon({"echo": echo, "broken": broken, "slow": slow}, watch=False)
+    server.bind()
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+    yield calls
+    if thread.is_alive():
+        server.server.shutdown()
+    thread.join(5)
+
+
+# Test functions
+
+def test_daemon_answers_requests(daemon):
+    assert Daemon.is_running()
+    assert Daemon.request("echo", {"text": "hi"}) == "echo hi"
+    assert daemon == [{"text": "hi"}]
+    # Unknown commands and failing handlers leave the command to the client.
+    assert Daemon.request("missing") is None
+    assert Daemon.request("broken") is None
+    with pytest.raises(OSError):
+        Daemon({}).bind()
+    assert os.stat(Daemon.socket_path()).st_mode & 0o777 == 0o600
+
+def test_client_gives_up_on_hanging_daemon(daemon, monkeypatch):
+    monkeypatch.setattr(Daemon, "REQUEST_TIMEOUT", 0.2)
+    start = time.monotonic()
+    assert Daemon.request("slow", {"seconds": 2}) is None
+    assert time.monotonic() - start < 1
+    assert Daemon.request("slow", {"seconds": 0}) == "slow"
+
+def test_daemon_refuses_other_environments(daemon, monkeypatch):
+    monkeypatch.setenv("PATH", "/nowhere")
+    assert Daemon.request("echo", {"text": "hi"}) is None
+    assert daemon == []
+
+def test_daemon_refuses_other_tool_settings(daemon, monkeypatch):
+    # asdf and Homebrew read many variables, e.g. a per-shell version override.
+    monkeypatch.setenv("ASDF_PYTHON_VERSION", "3.11.9")
+    assert Daemon.request("echo", {"text": "hi"}) is None
+    monkeypatch.delenv("ASDF_PYTHON_VERSION")
+    assert Daemon.request("echo", {"text": "hi"}) == "echo hi"
+
+def test_daemon_stops(daemon):
+    assert Daemon.stop() is True
+    deadline = time.monotonic() + 5
+    while os.path.exists(Daemon.socket_path()) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not os.path.exists(Daemon.socket_path())
+    assert Daemon.request("echo", {"text": "hi"}) is None
+
+def test_cli_uses_running_daemon(tmp_path, monkeypatch):
+    calls = tmp_path / "brew.calls"
+    make_stub(tmp_path, monkeypatch, "brew", f"echo \"$*\" >> '{calls}'\necho 'Homebrew 4.4.24'\n")
+    monkeypatch.setenv("BEEZEEBOT_DAEMON_SOCKET", str(tmp_path / "d.sock"))
+    cli = [sys.executable, os.path.join(PROJECT_ROOT, "beezeebot_cli.py")]
+
+    # Without a daemon, the CLI answers by itself.
+    assert subprocess.run(cli + ["--daemon", "status"], capture_output=True, text=True).stdout.strip() == "The daemon is not running."
+    assert subprocess.run(cli + ["-v", "brew", "--refresh"], capture_output=True, text=True).stdout.strip() == "version: Homebrew 4.4.24"
+
+    server = subprocess.Popen(cli + ["--daemon", "run"], stdout=subprocess.PIPE, text=True)
+    try:
+        assert server.stdout.readline().startswith("Listening on")
+        assert "running" in subprocess.run(cli + ["--daemon", "status"], capture_output=True, text=True).stdout
+        for _ in range(2):
+            result = subprocess.run(cli + ["-v", "brew", "--refresh"], capture_output=True, text=True)
+            assert result.stdout.strip() == "version: Homebrew 4.4.24"
+        # The daemon probed brew once per request, the first in-process run once.
+        assert calls.read_text().splitlines() == ["--version"] * 3
+        result = subprocess.run(cli + ["--daemon", "stop"], capture_output=True, text=True)
+        assert result.stdout.strip() == "The daemon stopped."
+        assert server.wait(5) == 0
+    finally:
+        server.kill()
+        server.wait()
+
+def test_daemon_reports_current_versions_of_client_directory(tmp_path, monkeypatch):
+    # The stub logs which directory 'asdf current' ran in, and whether the daemon (DAEMON_MARK=yes) ran it.
+    calls = tmp_path / "asdf.calls"
+    make_stub(tmp_path, monkeypatch, "asdf", (
+        'case "$1" in\n'
+        f'  current) echo "$PWD $DAEMON_MARK" >> \'{calls}\'; echo "python $(cut -d" " -f2 .tool-versions) $PWD/.tool-versions" ;;\n'
+        '  list) echo 3.12.1 ;;\n'
+        'esac\n'
+    ))
+    (tmp_path / "asdf-data" / "installs" / "python" / "3.12.1").mkdir(parents=True)
+    monkeypatch.setenv("ASDF_DATA_DIR", str(tmp_path / "asdf-data"))
+    monkeypatch.setenv("BEEZEEBOT_DAEMON_SOCKET", str(tmp_path / "d.sock"))
+    projects = {}
+    for name, version in [("old", "3.11.9"), ("new", "3.12.1")]:
+        projects[name] = tmp_path / name
+        projects[name].mkdir()
+        (projects[name] / ".tool-versions").write_text(f"python {version}\n")
+    cli = [sys.executable, os.path.join(PROJECT_ROOT, "beezeebot_cli.py")]
+
+    server = subprocess.Popen(cli + ["--daemon", "run"], stdout=subprocess.PIPE, text=True, cwd=str(tmp_path),
+                              env=dict(os.environ, DAEMON_MARK="yes"))
+    try:
+        assert server.stdout.readline().startswith("Listening on")
+        for name, version in [("old", "3.11.9"), ("new", "3.12.1")]:
+            result = subprocess.run(cli + ["-v", "asdf:python"], capture_output=True, text=True, cwd=str(projects[name]))
+            assert f"current: {version}" in result.stdout.splitlines()
+        assert calls.read_text().splitlines() == [f"{projects['old']} yes", f"{projects['new']} yes"]
+        subprocess.run(cli + ["--daemon", "stop"], capture_output=True)
+        assert server.wait(5) == 0
+    finally:
+        server.kill()
+        server.wait()
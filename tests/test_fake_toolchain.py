@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+Determines if the fake toolchain stubs honor their latency, output size and failure rate, and drive the component modules with real processes.
+"""
+
+import time
+
+from benchmarks.fake_toolchain import FakeToolchain
+from benchmarks.bench_toolchain import install_all
+from components.install_scheduler import InstallScheduler
+from components.scanner import Scanner
+from components.utils.subproc import Subproc
+
+
+# Test functions
+
+def test_stubs_answer_probes(tmp_path):
+    with FakeToolchain(tmp_path, brew_packages=3, installed=["direnv"]).activate():
+        assert Subproc.run_command(["brew", "--version"])["stdout"] == "Homebrew 4.4.24"
+        assert Subproc.run_command(["softwareupdate", "--history"])["stdout"].startswith("Display Name")
+        assert Subproc.run_command(["asdf", "python", "list"])["stdout"] == "3.12.1"
+        inventory = Subproc.run_command(["brew", "info", "--json=v2", "--installed"])["stdout"]
+        assert inventory.count('"name"') == 4
+
+def test_latency_output_and_failure_rate(tmp_path):
+    with FakeToolchain(tmp_path / "slow", latency=0.3, output_bytes=10000).activate():
+        start = time.monotonic()
+        result = Subproc.run_command(["brew", "install", "direnv"])
+        assert time.monotonic() - start >= 0.3
+        assert 10000 <= len(result["stdout"]) < 10200
+    with FakeToolchain(tmp_path / "failing", failure_rate=1.0).activate():
+        result = Subproc.run_command(["asdf", "--version"])
+        assert result["success"] is False
+        assert "simulated asdf failure" in result["stderr"]
+
+def test_scan_and_install_spawn_stubs(tmp_path):
+    with FakeToolchain(tmp_path).activate() as toolchain:
+        results = Scanner.scan(refresh=True)
+        assert results["brew"]["stdout"] == "Homebrew 4.4.24"
+        assert len(toolchain.calls()) == 6
+
+        toolchain.reset_calls()
+        results = install_all()
+        assert all(result["success"] for result in results.values())
+        assert results["direnv"]["status"] == InstallScheduler.INSTALLED
+        assert "brew install asdf direnv" in toolchain.calls()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+Determines if the fleet_store module ingests snapshots of many hosts, keeps the newest snapshot of each host,
+and answers version queries in version order. Files that cannot be read count as invalid snapshots.
+
+Helper Functions:
+    - make_snapshot() builds the snapshot of one host.
+"""
+
+import json
+
+import pytest
+
+from beezeebot_cli import get_ingest_msg
+from components.fleet_store import FleetStore
+from components.inventory_snapshot import InventorySnapshot
+from components.utils.command_result import CommandResult
+from components.utils.version import Version
+
+
+# Helper functions
+def make_snapshot(host, created, brew="4.4.24", pythons=("3.12.1",)):
+    snapshot = InventorySnapshot(host=host, created=created)
+    snapshot.add("brew", ["brew", "--version"], None, CommandResult.ok(f"Homebrew {brew}"))
+    python_list = CommandResult.ok("\n".join(f"  {version}" for version in pythons)) if pythons else CommandResult(1, "", "No such plugin")
+    snapshot.add("asdf:python", ["asdf", "python", "list"], None, python_list)
+    return snapshot.to_dict()
+
+
+# Test functions
+
+def test_sort_text_sorts_like_versions():
+    versions = ["3.9.18", "3.10.0", "3.11", "3.11.0", "3.11.11", "3.12.1-rc1", "3.12.1", "16.2.0.0.1.1733547573"]
+    assert sorted(versions, key=lambda text: Version.sort_text(Version(text).key)) == sorted(versions, key=Version)
+
+def test_ingest_and_query(tmp_path):
+    (tmp_path / "snapshots").mkdir()
+    (tmp_path / "snapshots" / "alpha.json").write_text(json.dumps(make_snapshot("alpha", 1, "4.4.23", ("3.9.18", "*3.12.1"))))
+    (tmp_path / "snapshots" / "broken.json").write_text("{")
+    with open(tmp_path / "fleet.jsonl", "w") as f:
+        f.write(json.dumps(make_snapshot("beta", 1, "4.4.24", ("3.10.4",))) + "\n")
+        f.write(json.dumps(make_snapshot("gamma", 1, "4.4.24", ())) + "\n")
+        f.write(json.dumps({"format": 1, "entries": {}}) + "\n")
+    store = FleetStore(str(tmp_path / "fleet.sqlite3"))
+    counts = store.ingest([str(tmp_path / "snapshots"), str(tmp_path / "fleet.jsonl")])
+    assert counts == {"ingested": 3, "skipped": 0, "invalid": 2}
+
+    assert store.query("hosts asdf:python < 3.11") == ("hosts", [("alpha", "3.9.18"), ("beta", "3.10.4")])
+    assert store.hosts("asdf:python", ">=", "3.12") == [("alpha", "3.12.1")]
+    assert store.query("histogram brew") == ("histogram", [("4.4.23", 1), ("4.4.24", 2)])
+    assert store.missing("asdf:python") == [("gamma", "missing")]
+    assert store.missing("asdf:ruby") == [("alpha", "not scanned"), ("beta", "not scanned"), ("gamma", "not scanned")]
+    store.close()
+
+def test_newest_snapshot_of_each_host_wins(tmp_path):
+    path = tmp_path / "fleet.jsonl"
+    path.write_text("\n".join(json.dumps(snapshot) for snapshot in [
+        make_snapshot("alpha", 10, "4.4.20"),
+        make_snapshot("alpha", 30, "4.4.24"),
+        make_snapshot("alpha", 20, "4.4.22"),
+        make_snapshot("beta", 10, "4.4.20"),
+    ]))
+    store = FleetStore(str(tmp_path / "fleet.sqlite3"))
+    # A batch of one snapshot writes every snapshot separately, so newer ones replace stored rows.
+    assert store.ingest([str(path)], batch_size=1) == {"ingested": 3, "skipped": 1, "invalid": 0}
+    assert store.histogram("brew") == [("4.4.20", 1), ("4.4.24", 1)]
+
+    # Ingesting the same snapshots again changes nothing.
+    assert store.ingest([str(path)]) == {"ingested": 0, "skipped": 4, "invalid": 0}
+    assert store.host_count() == 2
+    store.close()
+
+def test_query_errors(tmp_path):
+    store = FleetStore(str(tmp_path / "fleet.sqlite3"))
+    with pytest.raises(ValueError):
+        store.query("which hosts")
+    with pytest.raises(ValueError):
+        store.query("hosts brew ~ 4.4")
+    store.close()
+
+def test_unreadable_files_are_invalid(tmp_path):
+    (tmp_path / "latin1.json").write_bytes(b'{"host": "caf\xe9"}')
+    paths = [str(tmp_path / "missing.json"), str(tmp_path / "latin1.json"), str(tmp_path / "missing.jsonl")]
+    store = FleetStore(str(tmp_path / "fleet.sqlite3"))
+    errors = []
+    assert store.ingest(paths, errors=errors) == {"ingested": 0, "skipped": 0, "invalid": 3}
+    assert errors == [
+        f"Cannot read {paths[0]}: No such file or directory",
+        f"Cannot read {paths[1]}: not UTF-8 text",
+        f"Cannot read {paths[2]}: No such file or directory",
+    ]
+    store.close()
+
+    msg = get_ingest_msg([str(tmp_path / "missing.json")], str(tmp_path / "fleet.sqlite3"))
+    assert msg.splitlines()[0] == f"Cannot read {tmp_path / 'missing.json'}: No such file or directory"
+    assert "1 invalid" in msg
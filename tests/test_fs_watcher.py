@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+Determines if both file system watchers report changes in temporary directories, and if the cache invalidator drops
+exactly the probe cache and snapshot entries of an executable that was replaced or shadowed on PATH, or of Homebrew
+when its repository was updated.
+
+Helper Functions:
+    - write_tool() writes an executable that prints a version.
+    - wait_dropped() polls the invalidator until it drops something.
+"""
+
+import os
+import time
+
+import pytest
+
+from components.cache_invalidator import CacheInvalidator
+from components.inventory_snapshot import InventorySnapshot
+from components.utils.fs_watcher import FsWatcher, InotifyWatcher
+from components.utils.probe_cache import ProbeCache
+from components.utils.subproc import Subproc
+
+WATCHERS = [
+    pytest.param("inotify", marks=pytest.mark.skipif(not InotifyWatcher.is_available(), reason="inotify is not available")),
+    "polling",
+]
+
+
+# Helper functions
+def make_watcher(kind):
+    return FsWatcher.create(polling=True, interval=0.05) if kind == "polling" else FsWatcher.create()
+
+def write_tool(directory, name, version):
+    path = directory / name
+    path.write_text(f"#!/bin/sh\necho '{name} {version}'\n")
+    path.chmod(0o755)
+    return path
+
+def wait_dropped(invalidator, timeout=3):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        dropped = invalidator.poll(0.2)
+        if dropped:
+            return dropped
+    return []
+
+
+# Test functions
+
+@pytest.mark.parametrize("kind", WATCHERS)
+def test_watcher_reports_changes(tmp_path, kind):
+    watched = tmp_path / "watched"
+    watched.mkdir()
+    with make_watcher(kind) as watcher:
+        assert watcher.watch(str(watched))
+        assert watcher.read(0.1) == []
+        (watched / "new-file").write_text("x")
+        changes = watcher.read(2)
+        assert changes and all(path == str(watched) for path, _ in changes)
+        if kind == "inotify":
+            assert "new-file" in {name for _, name in changes}
+
+        watcher.unwatch(str(watched))
+        (watched / "other-file").write_text("x")
+        assert watcher.read(0.2) == []
+
+@pytest.mark.parametrize("kind", WATCHERS)
+def test_invalidator_drops_changed_entries(tmp_path, monkeypatch, kind):
+    shadow, bin_dir = tmp_path / "shadow", tmp_path / "bin"
+    shadow.mkdir()
+    bin_dir.mkdir()
+    write_tool(bin_dir, "tool", "1.0")
+    write_tool(bin_dir, "other", "2.0")
+    monkeypatch.setenv("PATH", f"{shadow}{os.pathsep}{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    cache = ProbeCache(str(tmp_path / "probes.json"), track_file=True)
+    snapshot = InventorySnapshot()
+    for name in ("tool", "other"):
+        command = [name, "--version"]
+        result = Subproc.run_command(command)
+        cache.put(command, result)
+        snapshot.add(name, command, InventorySnapshot.fingerprint(command), result)
+    cache.save()
+    snapshot_path = str(tmp_path / "snapshot.json")
+    snapshot.save(snapshot_path)
+    tool_key = ProbeCache.make_key(["tool", "--version"])
+
+    invalidator = CacheInvalidator(make_watcher(kind), cache, snapshot_path)
+    try:
+        invalidator.refresh()
+        # An upgrade rewrites the executable in place.
+        write_tool(bin_dir, "tool", "1.1")
+        dropped = wait_dropped(invalidator)
+        assert dropped[0] == "tool"
+        assert tool_key in dropped
+        assert "other" in InventorySnapshot.load(snapshot_path).entries
+        assert cache.get(["other", "--version"]).stdout == "other 2.0"
+
+        # A new executable earlier on PATH shadows the cached one.
+        cache.put(["other", "--version"], Subproc.run_command(["other", "--version"]))
+        cache.save()
+        write_tool(shadow, "other", "3.0")
+        assert "other" in wait_dropped(invalidator)
+        assert "other" not in InventorySnapshot.load(snapshot_path).entries
+    finally:
+        invalidator.stop()
+
+@pytest.mark.parametrize("kind", WATCHERS)
+def test_invalidator_drops_homebrew_version_after_update(tmp_path, monkeypatch, kind):
+    repository = tmp_path / "homebrew"
+    (repository / "bin").mkdir(parents=True)
+    (repository / ".git" / "refs" / "tags").mkdir(parents=True)
+    (repository / ".git" / "HEAD").write_text("a" * 40 + "\n")
+    write_tool(repository / "bin", "brew", "4.4.0")
+    monkeypatch.setenv("PATH", f"{repository / 'bin'}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("HOMEBREW_REPOSITORY", str(repository))
+
+    cache = ProbeCache(str(tmp_path / "probes.json"), track_file=True)
+    cache.put(["brew", "--version"], Subproc.run_command(["brew", "--version"]))
+    cache.save()
+    brew_key = ProbeCache.make_key(["brew", "--version"])
+
+    invalidator = CacheInvalidator(make_watcher(kind), cache, str(tmp_path / "snapshot.json"))
+    try:
+        invalidator.refresh()
+        # 'brew update' checks out the new release tag without rewriting bin/brew.
+        (repository / ".git" / "refs" / "tags" / "4.4.1").write_text("b" * 40 + "\n")
+        (repository / ".git" / "HEAD").write_text("b" * 40 + "\n")
+        assert brew_key in wait_dropped(invalidator)
+    finally:
+        invalidator.stop()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+Determines if the http_fetcher module reuses connections, follows redirects and reports errors, and if the artifact
+cache revalidates with conditional requests and downloads independent artifacts in parallel. Requests go to a local
+FakeHttpServer.
+"""
+
+import time
+import urllib.error
+
+import pytest
+
+from components.utils.artifact_cache import ArtifactCache
+from components.utils.http_fetcher import HttpFetcher
+from tests.pytest_utils import FakeHttpServer
+
+
+# Test functions
+
+def test_connection_is_reused():
+    fetcher = HttpFetcher()
+    with FakeHttpServer({f"/{n}": b"x" * n for n in range(1, 6)}) as server:
+        bodies = [fetcher.read(f"{server.url}/{n}") for n in range(1, 6)]
+        assert bodies == [b"x" * n for n in range(1, 6)]
+        assert fetcher.connections_opened == 1
+        assert len(server.connections) == 1
+    fetcher.close()
+
+def test_redirect_and_errors():
+    fetcher = HttpFetcher()
+    with FakeHttpServer({"/install.sh": b"echo hi\n"}, redirects={"/latest": "/install.sh"}) as server:
+        assert fetcher.read(server.url + "/latest") == b"echo hi\n"
+        # The redirect is followed on the same connection.
+        assert fetcher.connections_opened == 1
+        with pytest.raises(urllib.error.HTTPError) as error:
+            fetcher.read(server.url + "/missing")
+        assert error.value.code == 404
+        # The server closes the connection after an error, so the next request opens a new one.
+        assert fetcher.read(server.url + "/install.sh") == b"echo hi\n"
+    fetcher.close()
+
+def test_unchanged_artifact_costs_a_304(tmp_path):
+    cache = ArtifactCache(str(tmp_path / "artifacts"), fetcher=HttpFetcher())
+    with FakeHttpServer({"/install.sh": b"#!/bin/bash\necho v1\n"}) as server:
+        url = server.url + "/install.sh"
+        first = cache.fetch(url)
+        assert cache.fetch(url) == first
+        headers = server.requests[1][1]
+        assert headers["If-None-Match"].startswith('"')
+        assert headers["If-Modified-Since"] == FakeHttpServer.LAST_MODIFIED
+
+        server.files["/install.sh"] = b"#!/bin/bash\necho v2\n"
+        changed = cache.fetch(url)
+        assert changed != first
+        assert open(changed, "rb").read().endswith(b"v2\n")
+        assert cache.fetcher.connections_opened == 1
+
+def test_fetch_all_downloads_in_parallel(tmp_path):
+    files = {f"/artifact-{n}.tar.gz": bytes([n]) * 10000 for n in range(4)}
+    cache = ArtifactCache(str(tmp_path / "artifacts"), fetcher=HttpFetcher())
+    with FakeHttpServer(files, delay=0.4) as server:
+        start = time.monotonic()
+        paths = cache.fetch_all([server.url + path for path in files] + [server.url + "/missing"])
+        elapsed = time.monotonic() - start
+    assert [open(path, "rb").read() for path in paths[:4]] == list(files.values())
+    assert isinstance(paths[4], urllib.error.HTTPError)
+    # One after the other, the five requests would take at least 2 seconds.
+    assert elapsed < 1.5
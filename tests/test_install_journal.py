@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+Determines if an install run that crashed or had a failed step is continued by the next run without redoing the
+steps it completed, if changed inputs redo a step and the steps after it, and if steps that fail with a network
+error are retried.
+
+Helper Functions:
+    - make_steps() builds a chain of install steps that count their runs and fail or crash on demand.
+"""
+
+import pytest
+
+from components.install_journal import InstallJournal
+from components.install_scheduler import InstallScheduler, InstallStep
+from components.utils.command_result import CommandResult
+
+
+# Helper functions
+def make_steps(runs, outcomes=None, python_version="3.12.1"):
+    outcomes = outcomes or {}
+
+    def action(name):
+        def run():
+            runs.append(name)
+            outcome = outcomes.get(name)
+            if isinstance(outcome, list):
+                outcome = outcome.pop(0) if outcome else None
+            if outcome == "crash":
+                raise KeyboardInterrupt()
+            if outcome is not None:
+                return CommandResult(1, "", outcome)
+            return CommandResult.ok(f"{name} ok")
+        return run
+
+    return {
+        "xcode-select": InstallStep("xcode-select", [], action("xcode-select")),
+        "brew": InstallStep("brew", ["xcode-select"], action("brew")),
+        "asdf": InstallStep("asdf", ["brew"], action("asdf")),
+        "asdf:python": InstallStep("asdf:python", ["asdf"], action("asdf:python"), inputs=python_version),
+    }
+
+
+# Test functions
+
+def test_crashed_run_resumes_at_first_incomplete_step(tmp_path):
+    journal_path = str(tmp_path / "journal.jsonl")
+    runs = []
+    with pytest.raises(KeyboardInterrupt):
+        InstallScheduler.run(["asdf:python"], make_steps(runs, {"asdf": "crash"}), journal=InstallJournal(journal_path))
+    assert runs == ["xcode-select", "brew", "asdf"]
+
+    runs.clear()
+    results = InstallScheduler.run(["asdf:python"], make_steps(runs), journal=InstallJournal(journal_path))
+    assert runs == ["asdf", "asdf:python"]
+    assert results["brew"]["status"] == InstallScheduler.RESUMED
+    assert all(result["success"] for result in results.values())
+
+    # The run finished, so the next one starts afresh.
+    runs.clear()
+    InstallScheduler.run(["asdf:python"], make_steps(runs), journal=InstallJournal(journal_path))
+    assert runs == ["xcode-select", "brew", "asdf", "asdf:python"]
+
+def test_changed_inputs_redo_step(tmp_path):
+    journal_path = str(tmp_path / "journal.jsonl")
+    runs = []
+    InstallScheduler.run(["asdf:python"], make_steps(runs, {"asdf:python": "build failed"}), journal=InstallJournal(journal_path))
+    runs.clear()
+    results = InstallScheduler.run(["asdf:python"], make_steps(runs, python_version="3.11.9"), journal=InstallJournal(journal_path))
+    assert runs == ["asdf:python"]
+    assert results["asdf:python"]["status"] == InstallScheduler.INSTALLED
+
+    hashes = InstallJournal.input_hashes(["xcode-select", "brew"], make_steps([]))
+    changed = make_steps([])
+    changed["xcode-select"].inputs = "16.0"
+    assert InstallJournal.input_hashes(["xcode-select", "brew"], changed)["brew"] != hashes["brew"]
+
+def test_journal_ignores_cut_short_lines(tmp_path):
+    journal = InstallJournal(str(tmp_path / "journal.jsonl"))
+    assert journal.begin(["brew"]) == {}
+    journal.record_step("xcode-select", "abc")
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"format": 1, "event": "step", "st')
+    assert InstallJournal(journal.path).begin(["brew"]) == {"xcode-select": "abc"}
+
+def test_transient_failures_are_retried(tmp_path):
+    runs = []
+    outcomes = {
+        "brew": ["curl: (7) Failed to connect to raw.githubusercontent.com port 443", None],
+        "asdf": ["Error: asdf: no bottle available!"],
+    }
+    results = InstallScheduler.run(["asdf"], make_steps(runs, outcomes), retry_delay=0.01)
+    assert runs == ["xcode-select", "brew", "brew", "asdf"]
+    assert results["brew"]["status"] == InstallScheduler.INSTALLED
+    assert results["asdf"]["status"] == InstallScheduler.FAILED
+
+    runs.clear()
+    results = InstallScheduler.run(["brew"], make_steps(runs, {"brew": "Could not resolve host: github.com"}), retries=2, retry_delay=0.01)
+    assert runs == ["xcode-select", "brew", "brew", "brew"]
+    assert results["brew"]["status"] == InstallScheduler.FAILED
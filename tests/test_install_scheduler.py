@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+Determines if the install_scheduler module orders, parallelizes and skips install steps correctly.
+
+Helper Functions:
+    - make_steps() builds a small install graph whose actions record when they ran.
+"""
+
+import threading
+import time
+
+import pytest
+
+from components.install_scheduler import InstallScheduler, InstallStep
+from components.utils.command_result import CommandResult
+
+
+# Helper functions
+def make_steps(log, failing=(), delay=0.0, resource=None):
+    lock = threading.Lock()
+
+    def action(name):
+        def run():
+            with lock:
+                log.append(("start", name))
+            time.sleep(delay)
+            with lock:
+                log.append(("end", name))
+            if name in failing:
+                return CommandResult(1, "", f"{name} broke")
+            return CommandResult.ok(f"{name} ok")
+        return run
+
+    graph = {
+        "xcode-select": [],
+        "brew": ["xcode-select"],
+        "asdf": ["brew"],
+        "direnv": ["brew"],
+        "asdf:python": ["asdf"],
+        "asdf:nodejs": ["asdf"],
+    }
+    return {
+        name: InstallStep(name, dependencies, action(name), resource=resource if name in ("asdf", "direnv") else None)
+        for name, dependencies in graph.items()
+    }
+
+
+# Test functions
+
+def test_plan_adds_prerequisites_in_order():
+    steps = make_steps([])
+    assert InstallScheduler.plan(["asdf:python"], steps) == ["xcode-select", "brew", "asdf", "asdf:python"]
+
+def test_plan_rejects_unknown_target():
+    with pytest.raises(ValueError):
+        InstallScheduler.plan(["no-such-app"], make_steps([]))
+
+def test_plan_rejects_cycles():
+    steps = {
+        "a": InstallStep("a", ["b"], lambda: None),
+        "b": InstallStep("b", ["a"], lambda: None),
+    }
+    with pytest.raises(ValueError):
+        InstallScheduler.plan(["a"], steps)
+
+def test_run_respects_dependencies():
+    log = []
+    results = InstallScheduler.run(["asdf:python", "direnv"], make_steps(log))
+    assert all(result['status'] == InstallScheduler.INSTALLED for result in results.values())
+    finished = [name for event, name in log if event == "end"]
+    started = [name for event, name in log if event == "start"]
+    assert finished.index("brew") < started.index("asdf")
+    assert finished.index("asdf") < started.index("asdf:python")
+
+def test_run_parallelizes_independent_steps():
+    log = []
+    steps = make_steps(log, delay=0.3)
+    start = time.monotonic()
+    InstallScheduler.run(["asdf:python", "asdf:nodejs"], steps, max_workers=4)
+    elapsed = time.monotonic() - start
+    # xcode-select, brew and asdf are serial; both plugins run at the same time.
+    assert elapsed < 1.5
+
+def test_run_serializes_shared_resource():
+    log = []
+    steps = make_steps(log, delay=0.1, resource="brew")
+    InstallScheduler.run(["asdf", "direnv"], steps, max_workers=4)
+    events = [(event, name) for event, name in log if name in ("asdf", "direnv")]
+    assert events[0][0] == "start" and events[1][0] == "end"
+
+def test_failure_skips_only_dependents():
+    log = []
+    results = InstallScheduler.run(["asdf:python", "direnv"], make_steps(log, failing=("asdf",)))
+    assert results["asdf"]['status'] == InstallScheduler.FAILED
+    assert results["asdf"]['stderr'] == "asdf broke"
+    assert results["asdf:python"]['status'] == InstallScheduler.SKIPPED
+    assert results["direnv"]['status'] == InstallScheduler.INSTALLED
+
+def test_check_marks_step_already_installed():
+    steps = {"brew": InstallStep("brew", [], lambda: pytest.fail("should not install"), check=lambda: True)}
+    results = InstallScheduler.run(["brew"], steps)
+    assert results["brew"]['status'] == InstallScheduler.ALREADY_INSTALLED
+    assert results["brew"]['success'] is True
+
+def test_default_steps_follow_component_dependencies():
+    plan = InstallScheduler.plan(["asdf:ruby"])
+    assert plan == ["xcode-select", "brew", "asdf", "asdf:ruby"]
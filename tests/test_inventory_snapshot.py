@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+Determines if the inventory_snapshot module lets a scan reuse results whose fingerprint is unchanged, re-probes
+changed components, and reports the differences between two scans.
+"""
+
+import os
+
+from components.inventory_snapshot import InventorySnapshot
+from components.scanner import Scanner
+from components.utils.command_result import CommandResult
+from components.utils.probe_cache import ProbeCache
+from tests.pytest_utils import make_stub_tool, run_count
+
+
+# Test functions
+
+def test_unchanged_probe_is_reused_from_snapshot(tmp_path, monkeypatch):
+    tool, counter = make_stub_tool(tmp_path, monkeypatch)
+    probes = [("stubtool", ["stubtool", "--version"], None)]
+    Scanner.scan(probes)
+    # Without the probe cache, only the snapshot can answer the second scan.
+    os.remove(ProbeCache.default_path())
+    inventory = Scanner.scan(probes)
+    assert inventory["stubtool"].stdout == "stubtool 1.0"
+    assert run_count(counter) == 1
+
+    Scanner.scan(probes, refresh=True)
+    assert run_count(counter) == 2
+
+def test_changed_binary_is_probed_again(tmp_path, monkeypatch):
+    tool, counter = make_stub_tool(tmp_path, monkeypatch)
+    probes = [("stubtool", ["stubtool", "--version"], None)]
+    Scanner.scan(probes)
+    make_stub_tool(tmp_path, monkeypatch, version="2.0.0")
+    inventory = Scanner.scan(probes)
+    assert inventory["stubtool"].stdout == "stubtool 2.0.0"
+    assert InventorySnapshot.load().entries["stubtool"]["version"] == "2.0.0"
+
+def test_fingerprints(tmp_path, monkeypatch):
+    make_stub_tool(tmp_path, monkeypatch, name="asdf")
+    monkeypatch.setenv("ASDF_DATA_DIR", str(tmp_path / "asdf"))
+    assert InventorySnapshot.fingerprint(["sh", "-c", "echo hi"]) is None
+
+    command = ["asdf", "python", "list"]
+    before = InventorySnapshot.fingerprint(command)
+    assert before[-1] == [str(tmp_path / "asdf" / "installs" / "python"), None]
+    (tmp_path / "asdf" / "installs" / "python" / "3.12.1").mkdir(parents=True)
+    assert InventorySnapshot.fingerprint(command) != before
+
+def test_timed_out_probe_is_not_reused(tmp_path):
+    snapshot = InventorySnapshot()
+    command = ["stubtool", "--version"]
+    snapshot.add("stubtool", command, ["fingerprint"], CommandResult.failure("Timed out.", timed_out=True))
+    assert snapshot.reuse("stubtool", command, ["fingerprint"]) is None
+    snapshot.add("stubtool", command, ["fingerprint"], CommandResult.ok("stubtool 1.0"))
+    assert snapshot.reuse("stubtool", command, ["fingerprint"]).stdout == "stubtool 1.0"
+    assert snapshot.reuse("stubtool", command, ["other"]) is None
+
+def test_save_and_diff(tmp_path):
+    old = InventorySnapshot(host="mac")
+    old.add("brew", ["brew", "--version"], None, CommandResult.ok("Homebrew 4.4.23"))
+    old.add("asdf:ruby", ["asdf", "ruby", "list"], None, CommandResult.ok("3.3.0"))
+    old.add("xcode-select", ["xcode-select", "--version"], None, CommandResult.ok("xcode-select version 2409."))
+    path = str(tmp_path / "snapshot.json")
+    old.save(path)
+    old = InventorySnapshot.load(path)
+    assert old.host == "mac"
+    assert old.results()["brew"].version == "4.4.23"
+
+    new = InventorySnapshot()
+    new.add("brew", ["brew", "--version"], None, CommandResult.ok("Homebrew 4.4.24"))
+    new.add("xcode-select", ["xcode-select", "--version"], None, CommandResult.ok("xcode-select version 2409."))
+    new.add("asdf:python", ["asdf", "python", "list"], None, CommandResult(1, "", "No such plugin"))
+    assert InventorySnapshot.diff(old, new) == [
+        ("brew", "Homebrew 4.4.23", "Homebrew 4.4.24"),
+        ("asdf:python", None, "not installed"),
+        ("asdf:ruby", "3.3.0", None),
+    ]
+
+def test_load_ignores_other_formats(tmp_path):
+    path = tmp_path / "snapshot.json"
+    path.write_text('{"format": 0, "entries": {}}')
+    assert InventorySnapshot.load(str(path)) is None
+    assert InventorySnapshot.load(str(tmp_path / "missing.json")) is None
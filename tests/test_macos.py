@@ -20,10 +20,10 @@ Inline Functions:
 
 """
 
-import subprocess
+import sys
 import pytest
 
-import pytest_utils
+from tests.pytest_utils import FakeCompletedProcessOutput, fake_run_failure, patch_subprocess_run
 
 from components.xcode import Xcode
 from components.mac_platform import MacPlatform
@@ -37,7 +37,7 @@ def test_get_command_line_tools_version_success(monkeypatch):
         return FakeCompletedProcessOutput("xcode-select version 2395", "")
 
     # Replace subprocess.run with our fake success function.
-    monkeypatch.setattr(subprocess, "run", fake_run_success)
+    patch_subprocess_run(monkeypatch, fake_run_success)
     result = Xcode.get_command_line_tools_version()
     assert result["success"] is True
     assert result["stdout"] == "xcode-select version 2395"
@@ -45,7 +45,7 @@ def test_get_command_line_tools_version_success(monkeypatch):
 
 def test_get_command_line_tools_version_failure(monkeypatch):
     # Replace subprocess.run with our fake failure function.
-    monkeypatch.setattr(subprocess, "run", fake_run_failure)
+    patch_subprocess_run(monkeypatch, fake_run_failure)
     result = Xcode.get_command_line_tools_version()
     assert result["success"] is False
     assert result["stdout"] == ""
@@ -59,7 +59,7 @@ def test_install_command_line_tools_success(monkeypatch):
         return FakeCompletedProcessOutput("xcode-select version 2395", "")
 
     # Test installation method with a simulated successful execution.
-    monkeypatch.setattr(subprocess, "run", fake_run_success)
+    patch_subprocess_run(monkeypatch, fake_run_success)
     result = Xcode.install_command_line_tools()
     assert result["success"] is True
     assert result["stdout"] == "xcode-select version 2395"
@@ -67,7 +67,7 @@ def test_install_command_line_tools_success(monkeypatch):
 
 def test_install_command_line_tools_failure(monkeypatch):
     # Test installation method with a simulated failure.
-    monkeypatch.setattr(subprocess, "run", fake_run_failure)
+    patch_subprocess_run(monkeypatch, fake_run_failure)
     result = Xcode.install_command_line_tools()
     assert result["success"] is False
     assert result["stdout"] == ""
@@ -80,7 +80,7 @@ def test_list_software_updates_success_no_updates(monkeypatch):
         return FakeCompletedProcessOutput("Software Update Tool\n\nFinding available software", "No new software available.")
 
     # Simulate a successful software update list with no updates.
-    monkeypatch.setattr(subprocess, "run", fake_run_success)
+    patch_subprocess_run(monkeypatch, fake_run_success)
     result = Xcode.list_software_updates()
     # Note: The fake success function returns the same output as for xcode-select.
     assert result["success"] is True
@@ -95,7 +95,7 @@ def test_list_software_updates_success_updates(monkeypatch):
         return FakeCompletedProcessOutput("Software Update Tool\n\nFinding available software", "???TBD???")
 
     # Simulate a successful software update list with one or more updates.
-    monkeypatch.setattr(subprocess, "run", fake_run_success)
+    patch_subprocess_run(monkeypatch, fake_run_success)
     result = Xcode.list_software_updates()
     # Note: The fake success function returns the same output as for xcode-select.
     assert result["success"] is True
@@ -105,7 +105,7 @@ def test_list_software_updates_success_updates(monkeypatch):
 
 def test_list_software_updates_failure(monkeypatch):       
     # Simulate a failure in checking software updates.
-    monkeypatch.setattr(subprocess, "run", fake_run_failure)
+    patch_subprocess_run(monkeypatch, fake_run_failure)
     result = Xcode.list_software_updates()
     assert result["success"] is False
     assert result["stdout"] == ""
@@ -117,7 +117,7 @@ def test_list_software_updates_history_success(monkeypatch):
         return FakeCompletedProcessOutput("Display Name                                       Version    Date                  \n------------                                       -------    ----                  \nmacOS Sonoma 14.5                                  14.5       05/21/2024, 18:55:51  \nCommand Line Tools for Xcode                       15.3       06/20/2024, 22:46:56  \nmacOS Sonoma 14.6.1                                14.6.1     08/15/2024, 14:55:24  \nmacOS Sequoia 15.0.1                               15.0.1     10/07/2024, 01:33:24  \nCommand Line Tools for Xcode                       16.0       10/09/2024, 20:29:31  \nCommand Line Tools for Xcode                       16.1       11/05/2024, 16:39:56  \nmacOS Sequoia 15.1                                 15.1       11/05/2024, 16:41:08  \nmacOS Sequoia 15.1.1                               15.1.1     11/22/2024, 09:44:22  \nCommand Line Tools for Xcode                       16.2       12/30/2024, 14:14:11  \nmacOS Sequoia 15.2                                 15.2       12/30/2024, 14:15:27  \nmacOS Sequoia 15.3                                 15.3       02/07/2025, 12:31:47  \nmacOS Sequoia 15.3.1                               15.3.1     02/20/2025, 02:19:30", "")
 
     # Simulate a successful software update check.
-    monkeypatch.setattr(subprocess, "run", fake_run_success)
+    patch_subprocess_run(monkeypatch, fake_run_success)
     result = Xcode.list_software_updates_history()
     # Note: The fake success function returns the same output as for xcode-select.
     assert result["success"] is True
@@ -126,12 +126,13 @@ def test_list_software_updates_history_success(monkeypatch):
 
 def test_list_software_updates_history_failure(monkeypatch):
     # Simulate a failure in checking software updates.
-    monkeypatch.setattr(subprocess, "run", fake_run_failure)
+    patch_subprocess_run(monkeypatch, fake_run_failure)
     result = Xcode.list_software_updates_history()
     assert result["success"] is False
     assert result["stdout"] == ""
     assert "Command failed" in result["stderr"]
 
+@pytest.mark.skipif(sys.platform != "darwin", reason="platform.mac_ver() only reports a version on macOS")
 def test_get_macos_version():
     version = MacPlatform.get_macos_version()
     assert version
\ No newline at end of file
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+Determines if a TOML manifest is read into install targets and versions, if the plan tells satisfied steps from missing
+ones with checks that read the disk, and if converging installs only the missing steps. Stub 'xcode-select', 'brew'
+and 'asdf' commands, a temporary Cellar and a temporary asdf data directory stand in for the real ones.
+
+Helper Functions:
+    - make_machine() builds a machine with Homebrew and asdf installed, but not direnv or nodejs 20.1.0.
+"""
+
+import pytest
+
+from beezeebot_cli import converge_manifest, get_plan_msg
+from components.install_scheduler import InstallStep
+from components.manifest import Manifest
+from tests.pytest_utils import make_stub
+
+MANIFEST = """
+components = ["brew"]
+
+[plugins]
+brew = ["direnv"]
+
+[plugins.asdf]
+python = "3.12.1"
+nodejs = "20.1.0"
+ruby = ""
+"""
+
+
+# Helper functions
+def make_machine(tmp_path, monkeypatch):
+    calls = tmp_path / "calls"
+    make_stub(tmp_path, monkeypatch, "xcode-select", "echo 'xcode-select version 2409.'\n")
+    make_stub(tmp_path, monkeypatch, "brew", f'[ "$1" = --version ] && echo "Homebrew 4.4.0" && exit 0\necho "brew $*" >> "{calls}"\n')
+    make_stub(tmp_path, monkeypatch, "asdf", f'case "$1" in\n  list) printf "20.1.0\\n3.12.1\\n" ;;\n  install) echo "asdf $*" >> "{calls}" ;;\nesac\n')
+    cellar = tmp_path / "Cellar"
+    (cellar / "asdf" / "0.16.7").mkdir(parents=True)
+    monkeypatch.setenv("HOMEBREW_CELLAR", str(cellar))
+    data_dir = tmp_path / "asdf-data"
+    (data_dir / "installs" / "python" / "3.12.1").mkdir(parents=True)
+    monkeypatch.setenv("ASDF_DATA_DIR", str(data_dir))
+    manifest = tmp_path / "beezeebot.toml"
+    manifest.write_text(MANIFEST)
+    return manifest, calls
+
+
+# Test functions
+
+def test_parse_targets_and_versions():
+    manifest = Manifest.parse({
+        "components": ["xcode-select", "asdf"],
+        "plugins": {"brew": ["direnv", "asdf"], "asdf": {"python": "latest:3.12", "ruby": ""}},
+    })
+    assert manifest.targets == ["xcode-select", "asdf", "direnv", "asdf:python", "asdf:ruby"]
+    assert manifest.versions == {"asdf:python": "latest:3.12"}
+    assert manifest.install_targets()[-2:] == ["asdf:python@latest:3.12", "asdf:ruby"]
+
+@pytest.mark.parametrize("data", [
+    {"component": ["brew"]},
+    {"components": ["no-such-app"]},
+    {"plugins": {"asdf": ["cobol"]}},
+    {"plugins": {"brew": {"direnv": "2.34.0"}}},
+    {"plugins": {"xcode-select": ["anything"]}},
+])
+def test_parse_rejects_invalid_manifests(data):
+    with pytest.raises(ValueError):
+        Manifest.parse(data)
+
+def test_load_reports_bad_files(tmp_path):
+    path = tmp_path / "broken.toml"
+    path.write_text("components = [\n")
+    with pytest.raises(ValueError, match="Could not parse"):
+        Manifest.load(str(path))
+    with pytest.raises(ValueError, match="Could not read"):
+        Manifest.load(str(tmp_path / "missing.toml"))
+
+def test_plan_marks_satisfied_steps():
+    steps = {
+        "brew": InstallStep("brew", [], lambda: None, check=lambda: True),
+        "direnv": InstallStep("direnv", ["brew"], lambda: None, check=lambda: False),
+        "asdf:ruby": InstallStep("asdf:ruby", ["brew"], lambda: None),
+    }
+    planned = Manifest(["direnv", "asdf:ruby"]).plan(steps)
+    assert [(name, action) for name, action, _ in planned] == [
+        ("brew", Manifest.KEEP), ("direnv", Manifest.INSTALL), ("asdf:ruby", Manifest.INSTALL)
+    ]
+
+def test_plan_checks_the_machine(tmp_path, monkeypatch):
+    path, calls = make_machine(tmp_path, monkeypatch)
+    msg = get_plan_msg(str(path))
+    assert msg.splitlines() == [
+        f"3 of 7 steps to run for {path}:",
+        "  keep     xcode-select: installed",
+        "  keep     brew: installed",
+        "  install  direnv: not installed",
+        "  keep     asdf: installed",
+        "  keep     asdf:python: 3.12.1 installed",
+        "  install  asdf:nodejs: 20.1.0 not installed",
+        "  install  asdf:ruby: cannot be checked, so it always runs",
+    ]
+    # Planning never installs anything.
+    assert not calls.exists()
+
+def test_converge_installs_only_missing_steps(tmp_path, monkeypatch):
+    path, calls = make_machine(tmp_path, monkeypatch)
+    converge_manifest(str(path))
+    assert sorted(calls.read_text().splitlines()) == [
+        "asdf install nodejs 20.1.0", "asdf install ruby", "brew install direnv"
+    ]
+
+def test_partial_version_is_satisfied_by_installed_patch(tmp_path, monkeypatch):
+    path, calls = make_machine(tmp_path, monkeypatch)
+    path.write_text('[plugins.asdf]\npython = "3.12"\n')
+    assert get_plan_msg(str(path)).splitlines()[-1] == "  keep     asdf:python: 3.12 installed"
+    converge_manifest(str(path))
+    assert not calls.exists()
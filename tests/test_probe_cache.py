@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+Determines if the probe_cache module reuses '--version' results until the binary changes, the entry expires, or a refresh is requested.
+"""
+
+import time
+
+from components.utils.command_result import CommandResult
+from components.utils.probe_cache import ProbeCache
+from components.utils.subproc import Subproc
+from components.scanner import Scanner
+from tests.pytest_utils import make_stub_tool, run_count
+
+
+# Test functions
+
+def test_version_command_is_cached(tmp_path, monkeypatch):
+    tool, counter = make_stub_tool(tmp_path, monkeypatch)
+    first = Subproc.run_version_command(["stubtool", "--version"])
+    second = Subproc.run_version_command(["stubtool", "--version"])
+    assert first == second
+    assert first["stdout"] == "stubtool 1.0"
+    assert run_count(counter) == 1
+
+def test_refresh_bypasses_cache(tmp_path, monkeypatch):
+    tool, counter = make_stub_tool(tmp_path, monkeypatch)
+    Subproc.run_version_command(["stubtool", "--version"])
+    Subproc.run_version_command(["stubtool", "--version"], refresh=True)
+    assert run_count(counter) == 2
+
+def test_changed_binary_invalidates_entry(tmp_path, monkeypatch):
+    tool, counter = make_stub_tool(tmp_path, monkeypatch)
+    Subproc.run_version_command(["stubtool", "--version"])
+    make_stub_tool(tmp_path, monkeypatch, version="2.0.0")
+    result = Subproc.run_version_command(["stubtool", "--version"])
+    assert result["stdout"] == "stubtool 2.0.0"
+    assert run_count(counter) == 2
+
+def test_expired_entry_is_not_used(tmp_path, monkeypatch):
+    tool, counter = make_stub_tool(tmp_path, monkeypatch)
+    cache = ProbeCache(ttl=60)
+    cache.put(["stubtool", "--version"], CommandResult.ok("stubtool 0.1"))
+    key = ProbeCache.make_key(["stubtool", "--version"])
+    cache.entries[key]["time"] = time.time() - 120
+    assert cache.get(["stubtool", "--version"]) is None
+
+def test_only_version_commands_are_cacheable(tmp_path, monkeypatch):
+    make_stub_tool(tmp_path, monkeypatch)
+    assert ProbeCache.make_key(["stubtool", "--version"]) is not None
+    assert ProbeCache.make_key(["stubtool", "python", "list"]) is None
+    assert ProbeCache.make_key(["beezeebot-no-such-command", "--version"]) is None
+
+def test_scan_uses_cache(tmp_path, monkeypatch):
+    tool, counter = make_stub_tool(tmp_path, monkeypatch)
+    probes = [("stubtool", ["stubtool", "--version"], None)]
+    Scanner.scan(probes)
+    inventory = Scanner.scan(probes)
+    assert inventory["stubtool"]["stdout"] == "stubtool 1.0"
+    assert run_count(counter) == 1
+    Scanner.scan(probes, refresh=True)
+    assert run_count(counter) == 2
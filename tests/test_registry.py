@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+Determines if the registry module loads components only when they are used and drives the CLI dispatch.
+
+Helper Functions:
+    - register_fake_component() writes a component module to a temporary directory and registers it.
+"""
+
+import sys
+
+import pytest
+
+import beezeebot_cli
+from components.registry import ComponentRegistry
+from components.utils.installable_component import InstallableComponent
+
+
+# Helper functions
+def register_fake_component(tmp_path, monkeypatch):
+    (tmp_path / "fake_component_module.py").write_text(
+        "from components.utils.command_result import CommandResult\n"
+        "from components.utils.installable_component import InstallableComponent\n"
+        "class FakeComponent(InstallableComponent):\n"
+        "    NOT_INSTALLED_MSG = 'fake is not installed.'\n"
+        "    def install(self):\n"
+        "        return CommandResult.ok()\n"
+        "    def uninstall(self):\n"
+        "        return InstallableComponent.not_supported('Uninstalling fake')\n"
+        "    def check_version(self, refresh=False):\n"
+        "        return CommandResult.ok('fake 1.2.3')\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(ComponentRegistry, "COMPONENTS", dict(ComponentRegistry.COMPONENTS))
+    monkeypatch.setattr(ComponentRegistry, "instances", {})
+    monkeypatch.delitem(sys.modules, "fake_component_module", raising=False)
+    ComponentRegistry.register("fake", "fake_component_module", "FakeComponent", "a fake component")
+
+
+# Test functions
+
+def test_component_module_loaded_on_first_use(tmp_path, monkeypatch):
+    register_fake_component(tmp_path, monkeypatch)
+    assert "fake" in ComponentRegistry.names()
+    assert ComponentRegistry.description("fake") == "a fake component"
+    assert "fake_component_module" not in sys.modules
+
+    component = ComponentRegistry.get("fake")
+    assert "fake_component_module" in sys.modules
+    assert isinstance(component, InstallableComponent)
+    assert ComponentRegistry.get("fake") is component
+
+def test_unknown_component():
+    assert not ComponentRegistry.is_registered("no-such-component")
+    with pytest.raises(KeyError):
+        ComponentRegistry.get("no-such-component")
+
+def test_cli_dispatch_uses_registry(tmp_path, monkeypatch):
+    register_fake_component(tmp_path, monkeypatch)
+    # --options only needs the descriptions, so the module stays unloaded.
+    assert "  fake: a fake component" in beezeebot_cli.get_options_msg()
+    assert "fake_component_module" not in sys.modules
+    assert beezeebot_cli.get_version_msg("fake") == "version: fake 1.2.3"
+    assert beezeebot_cli.get_version_msg("no-such-component") == "Version function for 'no-such-component' is not supported."
+
+def test_plugins_default_to_not_supported(tmp_path, monkeypatch):
+    register_fake_component(tmp_path, monkeypatch)
+    results = ComponentRegistry.get("fake").install_plugins(["a", "b"])
+    assert [result["success"] for result in results.values()] == [False, False]
+
+def test_registered_components_implement_interface():
+    for component in ComponentRegistry.load_all():
+        assert isinstance(component, InstallableComponent)
+        assert component.NOT_INSTALLED_MSG
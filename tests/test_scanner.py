@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+Determines if the scanner module runs its probes concurrently and honors per-probe timeouts.
+The probes are small shell commands, so these tests run on any POSIX system.
+"""
+
+import time
+
+from components.scanner import Scanner
+
+
+# Test functions
+
+def test_scan_runs_probes_concurrently():
+    probes = [
+        ("first", ["sh", "-c", "sleep 0.5; echo first 1.0"], None),
+        ("second", ["sh", "-c", "sleep 0.5; echo second 2.0"], None),
+        ("third", ["sh", "-c", "sleep 0.5; echo third 3.0"], None),
+    ]
+    start = time.monotonic()
+    inventory = Scanner.scan(probes, timeout=5)
+    elapsed = time.monotonic() - start
+
+    assert list(inventory) == ["first", "second", "third"]
+    assert inventory["second"]["success"] is True
+    assert inventory["second"]["stdout"] == "second 2.0"
+    # A serial scan would take at least 1.5 seconds.
+    assert elapsed < 1.2
+
+def test_scan_probe_timeout():
+    probes = [
+        ("slow", ["sleep", "5"], 0.2),
+        ("fast", ["echo", "fast"], None),
+    ]
+    start = time.monotonic()
+    inventory = Scanner.scan(probes, timeout=5)
+    elapsed = time.monotonic() - start
+
+    assert inventory["slow"]["success"] is False
+    assert "timed out" in inventory["slow"]["stderr"]
+    assert inventory["fast"]["success"] is True
+    assert elapsed < 2
+
+def test_scan_missing_and_failing_commands():
+    probes = [
+        ("missing", ["beezeebot-no-such-command", "--version"], None),
+        ("failing", ["sh", "-c", "echo oops >&2; exit 3"], None),
+    ]
+    inventory = Scanner.scan(probes, timeout=5)
+
+    assert inventory["missing"]["success"] is False
+    assert inventory["missing"]["stdout"] == ""
+    assert inventory["failing"]["success"] is False
+    assert inventory["failing"]["stderr"] == "oops"
+
+def test_default_probes_cover_components():
+    names = [name for name, _, _ in Scanner.get_probes()]
+    assert names[:3] == ["xcode-select", "brew", "asdf"]
+    assert "asdf:python" in names
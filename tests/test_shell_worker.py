@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+Determines if the shell worker keeps the output and exit status of batched commands apart, runs them all in one
+shell, starts a new shell after a command ends it or a batch times out, and if Subproc.run_batch() follows changes
+to the environment.
+"""
+
+import time
+
+from components.asdf import Asdf
+from components.utils.shell_worker import ShellWorker
+from components.utils.subproc import Subproc
+from tests.pytest_utils import make_stub
+
+
+# Test functions
+
+def test_batch_keeps_results_apart():
+    with ShellWorker() as worker:
+        results = worker.run_batch([
+            "command -v sh",
+            ["echo", "two words"],
+            "printf 'no newline'",
+            "echo oops >&2; false",
+            ["sh", "-c", "exit 3"],
+            "yes | head -c 200000",
+        ])
+        assert results[0].success and results[0].stdout.endswith("/sh")
+        assert results[1].stdout == "two words"
+        assert results[2].raw_stdout == b"no newline"
+        assert (results[3].returncode, results[3].stdout, results[3].stderr) == (1, "", "oops")
+        assert results[4].returncode == 3
+        assert len(results[5].raw_stdout) == 200000
+        # Every command ran in the same shell.
+        pids = worker.run_batch(["echo $$", "echo $$"])
+        assert pids[0].stdout == pids[1].stdout == str(worker.process.pid)
+        assert worker.starts == 1
+
+def test_shell_restarts_after_exit(tmp_path):
+    with ShellWorker(cwd=str(tmp_path)) as worker:
+        results = worker.run_batch(["echo before", "echo dying >&2; exit 7", "pwd; cd /", "pwd"])
+        assert results[0].stdout == "before"
+        assert (results[1].returncode, results[1].stderr) == (7, "dying")
+        # The rest of the batch ran in a new shell, and each command starts in the worker's directory.
+        assert results[2].stdout == results[3].stdout == str(tmp_path)
+        assert worker.starts == 2
+
+def test_batch_timeout():
+    with ShellWorker() as worker:
+        start = time.monotonic()
+        results = worker.run_batch(["echo quick", "sleep 5", "echo never"], timeout=0.3)
+        assert time.monotonic() - start < 3
+        assert results[0].stdout == "quick"
+        assert [result.timed_out for result in results] == [False, True, True]
+        assert worker.run_batch(["echo again"])[0].stdout == "again"
+
+def test_run_batch_follows_environment(tmp_path, monkeypatch):
+    make_stub(tmp_path, monkeypatch, "asdf", "echo \"$2          3.12.1          $HOME/.tool-versions\"\n")
+    results = Asdf.get_current_versions(["python", "nodejs"])
+    assert results["python"].stdout.split()[:2] == ["python", "3.12.1"]
+    assert results["nodejs"].stdout.split()[:2] == ["nodejs", "3.12.1"]
+
+    monkeypatch.setenv("BEEZEEBOT_TEST_VALUE", "changed")
+    assert Subproc.run_batch(["echo $BEEZEEBOT_TEST_VALUE"])[0].stdout == "changed"
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+Determines if identical commands running at the same time share one process, on threads and in asyncio, while
+different environments start their own, and if a caller that joins a running command keeps its own timeout.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from components.utils.single_flight import SingleFlight
+from components.utils.subproc import Subproc
+from tests.pytest_utils import make_stub
+
+
+# Helper functions
+def make_slow_stub(tmp_path, monkeypatch, seconds=0.3):
+    calls = tmp_path / "tool.calls"
+    make_stub(tmp_path, monkeypatch, "slow-tool", f"echo \"$*\" >> '{calls}'\nsleep {seconds}\necho 'slow-tool 1.0'\n")
+    return calls
+
+
+# Test functions
+
+def test_threads_share_one_process(tmp_path, monkeypatch):
+    calls = make_slow_stub(tmp_path, monkeypatch)
+    merged = Subproc.flights.merged
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        results = list(pool.map(lambda _: Subproc.run_command(["slow-tool", "--version"]), range(5)))
+    assert calls.read_text().splitlines() == ["--version"]
+    assert all(result.stdout == "slow-tool 1.0" for result in results)
+    assert Subproc.flights.merged - merged == 4
+
+    # Calls that do not overlap run again.
+    Subproc.run_command(["slow-tool", "--version"])
+    assert len(calls.read_text().splitlines()) == 2
+
+def test_tasks_share_one_process(tmp_path, monkeypatch):
+    calls = make_slow_stub(tmp_path, monkeypatch)
+
+    async def probe_all():
+        return await asyncio.gather(
+            *[Subproc.run_command_async(["slow-tool", "--version"]) for _ in range(5)],
+            Subproc.run_command_async(["slow-tool", "--other"]),
+        )
+
+    results = asyncio.run(probe_all())
+    assert sorted(calls.read_text().splitlines()) == ["--other", "--version"]
+    assert [result.stdout for result in results] == ["slow-tool 1.0"] * 6
+
+def test_key_includes_environment_and_cwd():
+    key = SingleFlight.key(["brew", "--version"], {"PATH": "/usr/bin"}, "/")
+    assert key == SingleFlight.key(["brew", "--version"], {"PATH": "/usr/bin"}, "/")
+    assert key != SingleFlight.key(["brew", "--version"], {"PATH": "/opt/homebrew/bin"}, "/")
+    assert key != SingleFlight.key(["brew", "--version"], {"PATH": "/usr/bin"}, "/tmp")
+
+def test_joined_call_keeps_its_own_timeout(tmp_path, monkeypatch):
+    make_slow_stub(tmp_path, monkeypatch, seconds=1)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        leader = pool.submit(Subproc.run_command, ["slow-tool", "--version"], 5)
+        time.sleep(0.2)
+        start = time.monotonic()
+        follower = Subproc.run_command(["slow-tool", "--version"], 0.2)
+        assert time.monotonic() - start < 0.6
+        assert follower.timed_out is True
+        assert leader.result().stdout == "slow-tool 1.0"
+
+def test_cancelled_task_leaves_command_to_others(tmp_path, monkeypatch):
+    calls = make_slow_stub(tmp_path, monkeypatch)
+
+    async def cancel_one():
+        first = asyncio.ensure_future(Subproc.run_command_async(["slow-tool", "--version"]))
+        second = asyncio.ensure_future(Subproc.run_command_async(["slow-tool", "--version"]))
+        await asyncio.sleep(0.1)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(cancel_one()).stdout == "slow-tool 1.0"
+    assert calls.read_text().splitlines() == ["--version"]
+
+def test_timed_out_task_gets_the_command_result(tmp_path, monkeypatch):
+    finished = tmp_path / "finished"
+    make_stub(tmp_path, monkeypatch, "slow-tool", f"sleep 2\ntouch '{finished}'\n")
+    start = time.monotonic()
+    result = asyncio.run(Subproc.run_command_async(["slow-tool", "--version"], 0.3))
+    assert time.monotonic() - start < 1.5
+    assert result.timed_out is True
+    # The command's own timeout killed the process and measured it, rather than a waiter giving up.
+    assert result.returncode is not None and result.duration is not None
+    time.sleep(2)
+    assert not finished.exists()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+Determines if 'softwareupdate -l' output is parsed into update records, and if the background check returns at once,
+saves its result for the next call and reports how old that result is. A stub 'softwareupdate' stands in for the
+real one.
+
+Helper Functions:
+    - wait_for_job() waits until the background check has finished.
+"""
+
+import time
+
+from beezeebot_cli import get_updates_msg
+from components.software_updates import SoftwareUpdates
+from tests.pytest_utils import make_stub
+
+UPDATES_OUTPUT = """Software Update Tool
+
+Finding available software
+Software Update found the following new or updated software:
+* Label: Command Line Tools for Xcode-16.0
+\tTitle: Command Line Tools for Xcode, Version: 16.0, Size: 709316KiB, Recommended: YES,
+* Label: macOS Sequoia 15.1-24B83
+\tTitle: macOS Sequoia 15.1, Version: 15.1, Size: 3040677KiB, Recommended: YES, Action: restart,
+"""
+
+OLD_UPDATES_OUTPUT = """Software Update Tool
+
+Finding available software
+Software Update found the following new or updated software:
+   * Safari11.0.3Sierra-11.0.3
+\tSafari (11.0.3), 60953K [recommended]
+"""
+
+
+# Helper functions
+def wait_for_job(updates, timeout=5):
+    deadline = time.monotonic() + timeout
+    while updates.job_pid() is not None and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+
+# Test functions
+
+def test_parse_update_records():
+    updates = SoftwareUpdates.parse(UPDATES_OUTPUT)
+    assert [update["label"] for update in updates] == ["Command Line Tools for Xcode-16.0", "macOS Sequoia 15.1-24B83"]
+    assert updates[1] == {"label": "macOS Sequoia 15.1-24B83", "title": "macOS Sequoia 15.1", "version": "15.1",
+                          "size_kib": 3040677, "recommended": True, "restart": True}
+    assert updates[0]["restart"] is False
+
+    old = SoftwareUpdates.parse(OLD_UPDATES_OUTPUT)
+    assert old == [{"label": "Safari11.0.3Sierra-11.0.3", "title": "Safari", "version": "11.0.3",
+                    "size_kib": 60953, "recommended": True, "restart": False}]
+    assert SoftwareUpdates.parse("Software Update Tool\n\nFinding available software\nNo new software available.\n") == []
+
+def test_check_runs_in_background(tmp_path, monkeypatch):
+    make_stub(tmp_path, monkeypatch, "softwareupdate", f"sleep 0.5\ncat <<'EOF'\n{UPDATES_OUTPUT}EOF\n")
+    updates = SoftwareUpdates()
+
+    start = time.monotonic()
+    first = updates.check()
+    assert time.monotonic() - start < 0.4
+    assert first == {"age": None, "running": True}
+    assert "in the background" in get_updates_msg()
+
+    wait_for_job(updates)
+    second = updates.check()
+    assert [update["version"] for update in second["updates"]] == ["16.0", "15.1"]
+    assert second["running"] is False
+    assert second["age"] < 5
+    msg = get_updates_msg()
+    assert msg.startswith("2 software updates available (checked just now):")
+    assert "  macOS Sequoia 15.1 (15.1, 2.9 GiB, recommended, restart required)" in msg
+
+    # A fresh result does not start another check, unless asked to.
+    assert updates.check()["running"] is False
+    assert updates.check(refresh=True)["running"] is True
+    wait_for_job(updates)
+
+def test_failed_check_keeps_last_result(tmp_path, monkeypatch):
+    make_stub(tmp_path, monkeypatch, "softwareupdate", f"cat <<'EOF'\n{UPDATES_OUTPUT}EOF\n")
+    updates = SoftwareUpdates()
+    updates.check()
+    wait_for_job(updates)
+
+    make_stub(tmp_path, monkeypatch, "softwareupdate", "echo 'Could not connect to the catalog.' >&2\nexit 1\n")
+    updates.check(refresh=True)
+    wait_for_job(updates)
+    result = updates.check(max_age=0)
+    assert len(result["updates"]) == 2
+    assert result["error"] == "Could not connect to the catalog."
+    # A check that just failed is not retried on every call.
+    assert result["running"] is False
+    assert "The last check failed just now: Could not connect to the catalog." in get_updates_msg()
+
+def test_failed_first_check_reports_retry(tmp_path, monkeypatch):
+    make_stub(tmp_path, monkeypatch, "softwareupdate", "echo 'Could not connect to the catalog.' >&2\nexit 1\n")
+    updates = SoftwareUpdates()
+    updates.check()
+    wait_for_job(updates)
+    msg = get_updates_msg()
+    # Nothing runs in the background until the retry is allowed.
+    assert "in the background" not in msg
+    assert msg.splitlines() == [
+        "No software update check has succeeded yet.",
+        "The last check failed just now: Could not connect to the catalog.",
+        "The next check starts automatically in 60 minutes; run --updates --refresh to check now.",
+    ]
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+Determines if the CLI starts without its heavy imports, builds as a runnable zipapp, and if the start-up benchmark flags regressions.
+"""
+
+import os
+import subprocess
+import sys
+
+from benchmarks.baseline import compare
+from utils.build_zipapp import build
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Test functions
+
+def test_cli_import_skips_heavy_modules():
+    code = "import sys, beezeebot_cli; print(sorted(set(sys.modules) & {'asyncio', 'plistlib', 'components.brew', 'components.scanner'}))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+def test_zipapp_runs(tmp_path):
+    archive = build(str(tmp_path / "beezeebot_cli.pyz"))
+    result = subprocess.run([sys.executable, archive, "-o"], capture_output=True, text=True)
+    assert result.returncode == 0
+    assert "brew: Homebrew package manager" in result.stdout
+
+def test_compare_flags_regressions():
+    baseline = {"metrics": {"help": {"median_ms": 50.0}, "import": {"median_ms": 40.0}}}
+    results = {"help": {"median_ms": 60.0}, "import": {"median_ms": 70.0}, "first_probe": {"median_ms": 500.0}}
+    regressions = compare(results, baseline, 0.25)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("import:")
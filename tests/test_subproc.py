@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+Determines if the subproc module runs real commands correctly. The commands are small shell scripts, so these tests run on any POSIX system.
+"""
+
+import os
+import pty
+import sys
+import time
+
+from components.utils.subproc import Subproc
+from components.scanner import Scanner
+
+
+# Helper functions
+def grandchild_command(pid_file):
+    # A shell that starts a long-running grandchild and waits for it.
+    return ["sh", "-c", f"sleep 30 & echo $! > '{pid_file}'; wait"]
+
+def is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # A killed process may linger as a zombie until its parent (init) reaps it.
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().split()[2] != "Z"
+    except OSError:
+        return True
+
+def wait_until_dead(pid, limit=3.0):
+    end = time.monotonic() + limit
+    while is_alive(pid) and time.monotonic() < end:
+        time.sleep(0.05)
+    return not is_alive(pid)
+
+
+# Test functions
+
+def test_stream_yields_lines_as_they_arrive():
+    stream = Subproc.stream_command(["sh", "-c", "echo first; sleep 1; echo second"])
+    start = time.monotonic()
+    lines = iter(stream)
+    assert next(lines) == "first"
+    assert time.monotonic() - start < 0.8
+    assert list(lines) == ["second"]
+    assert stream.result["success"] is True
+    assert stream.result["stdout"] == "first\nsecond"
+
+def test_stream_keeps_bounded_tail_and_full_log(tmp_path):
+    log_path = tmp_path / "install.log"
+    seen = []
+    result = Subproc.run_command_streaming(
+        ["sh", "-c", "i=1; while [ $i -le 1000 ]; do echo line $i; i=$((i+1)); done; echo boom >&2; exit 2"],
+        on_line=seen.append,
+        log_path=str(log_path),
+        tail_lines=3
+    )
+    assert len(seen) == 1001
+    assert result["success"] is False
+    assert result["stdout"] == "line 999\nline 1000\nboom"
+    assert result["stderr"] == result["stdout"]
+    assert len(log_path.read_text().splitlines()) == 1001
+
+def test_stream_unwritable_log_starts_nothing(tmp_path):
+    marker = tmp_path / "started"
+    result = Subproc.run_command_streaming(["sh", "-c", f"touch '{marker}'; sleep 5"], log_path=str(tmp_path / "missing" / "x.log"))
+    assert result["success"] is False
+    assert "log file" in result["stderr"]
+    assert not marker.exists()
+
+def test_stream_missing_command():
+    result = Subproc.run_command_streaming(["beezeebot-no-such-command"])
+    assert result["success"] is False
+    assert result["stdout"] == ""
+    assert result["stderr"]
+
+def test_run_command_success_and_failure():
+    result = Subproc.run_command(["sh", "-c", "echo out; echo err >&2"])
+    assert (result.success, result.timed_out, result.stdout, result.stderr) == (True, False, "out", "err")
+    assert result.returncode == 0
+    result = Subproc.run_command(["sh", "-c", "exit 4"])
+    assert result["success"] is False
+    assert result.returncode == 4
+    assert "exit status 4" in result["stderr"]
+
+def test_run_command_missing_command():
+    result = Subproc.run_command(["beezeebot-no-such-command"])
+    assert result["success"] is False
+    assert result["timed_out"] is False
+
+def test_run_command_timeout_kills_process_group(tmp_path):
+    pid_file = tmp_path / "grandchild.pid"
+    start = time.monotonic()
+    result = Subproc.run_command(grandchild_command(pid_file), timeout=0.5)
+    assert time.monotonic() - start < 5
+    assert result["success"] is False
+    assert result["timed_out"] is True
+    assert "timed out" in result["stderr"]
+    assert wait_until_dead(int(pid_file.read_text()))
+
+def test_stream_timeout_kills_process_group(tmp_path):
+    pid_file = tmp_path / "grandchild.pid"
+    result = Subproc.run_command_streaming(grandchild_command(pid_file), timeout=0.5)
+    assert result["timed_out"] is True
+    assert wait_until_dead(int(pid_file.read_text()))
+
+def test_async_timeout_kills_process_group(tmp_path):
+    pid_file = tmp_path / "grandchild.pid"
+    inventory = Scanner.scan([("stuck", grandchild_command(pid_file), 0.5)])
+    assert inventory["stuck"]["timed_out"] is True
+    assert wait_until_dead(int(pid_file.read_text()))
+
+def test_streaming_install_keeps_terminal_session():
+    script = "import os; print(os.getsid(0), os.getpgrp())"
+    result = Subproc.run_command_streaming([sys.executable, "-c", script])
+    session, group = map(int, result["stdout"].split())
+    # The install can still reach the terminal (e.g. for sudo), but has its own group so a timeout kills all of it.
+    assert session == os.getsid(0)
+    assert group != os.getpgrp()
+
+    probe = Subproc.run_command([sys.executable, "-c", script])
+    assert int(probe["stdout"].split()[0]) != os.getsid(0)
+
+def test_streaming_install_holds_the_terminal():
+    # In a pseudo-terminal, the install's group is the foreground group while it runs, and this process's afterwards.
+    script = (
+        "import os, sys; sys.path.insert(0, os.getcwd())\n"
+        "from components.utils.subproc import Subproc\n"
+        "check = 'import os; print(os.tcgetpgrp(0) == os.getpgrp())'\n"
+        "result = Subproc.run_command_streaming([sys.executable, '-c', check])\n"
+        "print(result['stdout'], os.tcgetpgrp(0) == os.getpgrp())\n"
+    )
+    pid, fd = pty.fork()
+    if pid == 0:
+        os.execv(sys.executable, [sys.executable, "-c", script])
+    output = b""
+    while True:
+        try:
+            chunk = os.read(fd, 1024)
+        except OSError:
+            break
+        if not chunk:
+            break
+        output += chunk
+    os.waitpid(pid, 0)
+    os.close(fd)
+    assert output.decode().split() == ["True", "True"]
+
+def test_global_deadline_caps_timeouts():
+    Subproc.set_deadline(0.5)
+    try:
+        start = time.monotonic()
+        result = Subproc.run_command(["sleep", "10"], timeout=60)
+        assert result["timed_out"] is True
+        assert time.monotonic() - start < 5
+        # Once the deadline has passed, nothing else is started.
+        assert Subproc.run_command(["echo", "late"])["timed_out"] is True
+    finally:
+        Subproc.set_deadline(None)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+Determines if the tracing module records a span with exit code and resource usage for every command, and exports them.
+
+Fixtures:
+    - tracer: enables tracing for one test and disables it afterwards.
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.fake_toolchain import FakeToolchain
+from components.install_scheduler import InstallScheduler, InstallStep
+from components.utils.subproc import Subproc
+from components.utils.tracing import Tracer
+
+
+# Fixtures
+
+@pytest.fixture
+def tracer():
+    Tracer.enable()
+    yield Tracer
+    Tracer.disable()
+
+
+# Test functions
+
+def test_disabled_tracer_records_nothing():
+    Tracer.enable()
+    Tracer.disable()
+    Subproc.run_command(["true"])
+    assert Tracer.spans == []
+
+def test_command_span_has_exit_code_and_rusage(tracer):
+    Subproc.run_command(["sh", "-c", "exit 3"])
+    Subproc.run_command_streaming([sys.executable, "-c", "sum(range(3000000))"])
+    failed, streamed = tracer.spans
+    assert failed["name"] == "sh -c"
+    assert failed["argv"] == ["sh", "-c", "exit 3"]
+    assert failed["exit_code"] == 3
+    assert failed["max_rss_kib"] > 0
+    assert streamed["exit_code"] == 0
+    assert streamed["user_time"] + streamed["system_time"] > 0
+    assert streamed["duration"] > 0
+
+def test_traced_command_output_is_complete(tracer):
+    # The traced path reads the pipes itself before reaping the child with wait4().
+    result = Subproc.run_command(["sh", "-c", "yes | head -c 300000; echo done >&2"])
+    assert len(result.raw_stdout) == 300000
+    assert result.stderr == "done"
+    assert tracer.spans[0]["max_rss_kib"] > 0
+
+    result = Subproc.run_command(["sh", "-c", "echo early; sleep 5"], timeout=0.3)
+    assert result.timed_out is True
+    assert result.stdout == "early"
+
+    # A child that closes its pipes and keeps running times out while it is reaped.
+    result = Subproc.run_command(["sh", "-c", "echo early; echo warning >&2; exec >&- 2>&-; sleep 5"], timeout=0.3)
+    assert result.timed_out is True
+    assert (result.stdout, result.raw_stderr.strip()) == ("early", b"warning")
+
+def test_timed_out_and_async_spans(tracer):
+    Subproc.run_command(["sleep", "5"], timeout=0.2)
+    asyncio.run(Subproc.run_command_async(["true"]))
+    timed_out, async_span = tracer.spans
+    assert timed_out["timed_out"] is True
+    assert timed_out["exit_code"] < 0
+    assert async_span["exit_code"] == 0
+    assert "user_time" not in async_span
+
+def test_scheduler_step_spans(tracer):
+    steps = {"a": InstallStep("a", [], lambda: Subproc.run_command(["true"]), check=lambda: False)}
+    InstallScheduler.run(["a"], steps)
+    assert [span["name"] for span in tracer.spans] == ["check a", "true", "install a"]
+
+def test_chrome_trace_and_timings(tracer):
+    Subproc.run_command(["true"])
+    Subproc.run_command(["true"])
+    with Tracer.span("step"):
+        pass
+    events = Tracer.chrome_trace()["traceEvents"]
+    assert [event["ph"] for event in events] == ["X", "X", "X"]
+    assert events[0]["args"]["argv"] == ["true"]
+    assert events[0]["tid"] != events[1]["tid"]
+    summary = Tracer.summarize()
+    assert [(group["name"], group["count"]) for group in summary] == [("true", 2)]
+    assert "true" in Tracer.format_timings().splitlines()[1]
+
+def test_cli_trace_option(tmp_path):
+    toolchain = FakeToolchain(tmp_path).create()
+    trace = tmp_path / "trace.json"
+    result = subprocess.run(
+        [sys.executable, "beezeebot_cli.py", "-v", "brew", "--refresh", "--trace", str(trace), "--timings"],
+        env=toolchain.env(), cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), capture_output=True, text=True
+    )
+    assert "version: Homebrew 4.4.24" in result.stdout
+    assert "brew --version" in result.stdout
+    events = json.loads(trace.read_text())["traceEvents"]
+    assert events[0]["args"]["argv"] == ["brew", "--version"]
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+Determines if the version_files module reads versions from fixture directory trees that mimic Homebrew, the Xcode
+command-line tools receipts and asdf, and falls back to running the tool when the files are missing.
+
+Helper Functions:
+    - make_homebrew_repository() builds the .git metadata of a Homebrew checkout.
+    - fail_if_run() replaces Subproc.run_version_command when no command may run.
+"""
+
+import os
+import plistlib
+
+from components.version_files import VersionFiles
+from components.brew import Brew
+from components.asdf import Asdf
+
+
+# Helper functions
+def make_homebrew_repository(root, head, loose_tags=None, packed_refs=""):
+    git_dir = root / "Homebrew" / ".git"
+    (git_dir / "refs" / "tags").mkdir(parents=True)
+    (git_dir / "HEAD").write_text(head + "\n")
+    (git_dir / "packed-refs").write_text(packed_refs)
+    for name, sha in (loose_tags or {}).items():
+        (git_dir / "refs" / "tags" / name).write_text(sha + "\n")
+    return str(root / "Homebrew")
+
+def fail_if_run(command, refresh=False):
+    raise AssertionError(f"{command} should not run")
+
+
+# Test functions
+
+def test_homebrew_version_from_loose_tag(tmp_path):
+    repository = make_homebrew_repository(tmp_path, "a" * 40, {"4.4.23": "b" * 40, "4.4.24": "a" * 40})
+    assert VersionFiles.homebrew_version(repository)["stdout"] == "Homebrew 4.4.24"
+
+def test_homebrew_version_from_peeled_packed_tag(tmp_path):
+    packed = (
+        "# pack-refs with: peeled fully-peeled sorted\n"
+        + "c" * 40 + " refs/tags/4.3.9\n"
+        + "^" + "a" * 40 + "\n"
+        + "d" * 40 + " refs/tags/4.4.0\n"
+        + "^" + "e" * 40 + "\n"
+    )
+    repository = make_homebrew_repository(tmp_path, "a" * 40, packed_refs=packed)
+    assert VersionFiles.homebrew_version(repository)["stdout"] == "Homebrew 4.3.9"
+
+def test_homebrew_version_between_releases_is_unknown(tmp_path):
+    repository = make_homebrew_repository(tmp_path, "f" * 40, {"4.4.24": "a" * 40})
+    assert VersionFiles.homebrew_version(repository) is None
+    assert VersionFiles.homebrew_version(str(tmp_path / "missing")) is None
+
+def test_command_line_tools_version_from_receipt(tmp_path):
+    receipt = tmp_path / "com.apple.pkg.CLTools_Executables.plist"
+    with open(receipt, "wb") as f:
+        plistlib.dump({"PackageIdentifier": "com.apple.pkg.CLTools_Executables", "PackageVersion": "16.2.0.0.1.1733547573"}, f)
+    result = VersionFiles.command_line_tools_version([str(tmp_path / "missing.plist"), str(receipt)])
+    assert result["stdout"] == "16.2.0.0.1.1733547573"
+    assert VersionFiles.command_line_tools_version([str(tmp_path / "missing.plist")]) is None
+    # The receipt does not answer for 'xcode-select --version', which prints the version of xcode-select itself.
+    assert VersionFiles.read(["xcode-select", "--version"]) is None
+
+def test_asdf_version_from_cellar_and_git_install(tmp_path):
+    assert VersionFiles.asdf_version("/opt/homebrew/Cellar/asdf/0.16.7_1/bin/asdf")["stdout"] == "asdf version 0.16.7"
+    (tmp_path / "bin").mkdir()
+    (tmp_path / "version.txt").write_text("v0.14.1\n")
+    assert VersionFiles.asdf_version(str(tmp_path / "bin" / "asdf"))["stdout"] == "v0.14.1"
+    os.remove(tmp_path / "version.txt")
+    assert VersionFiles.asdf_version(str(tmp_path / "bin" / "asdf")) is None
+
+def test_asdf_plugin_versions_sorted_numerically(tmp_path, monkeypatch):
+    for version in ["3.9.18", "3.12.1", "3.11.11"]:
+        (tmp_path / "installs" / "python" / version).mkdir(parents=True)
+    monkeypatch.setenv("ASDF_DATA_DIR", str(tmp_path))
+    result = Asdf.get_plugin_versions("python")
+    assert result["stdout"] == "3.9.18\n  3.11.11\n  3.12.1"
+    assert VersionFiles.read(["asdf", "ruby", "list"]) is None
+
+def test_homebrew_formula_versions_from_cellar(tmp_path):
+    for version in ["2.9.0", "2.34.0"]:
+        (tmp_path / "Cellar" / "direnv" / version).mkdir(parents=True)
+    cellar = str(tmp_path / "Cellar")
+    assert VersionFiles.homebrew_formula_versions("direnv", cellar)["stdout"] == "direnv 2.9.0 2.34.0"
+    assert VersionFiles.homebrew_formula_versions("asdf", cellar)["stdout"] == ""
+    assert VersionFiles.homebrew_formula_versions("asdf", str(tmp_path / "missing")) is None
+
+def test_brew_version_falls_back_to_command(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setenv("HOMEBREW_REPOSITORY", str(tmp_path / "missing"))
+    monkeypatch.setattr("components.utils.subproc.Subproc.run_version_command",
+                        lambda command, refresh=False: calls.append(command) or {'success': True, 'stdout': "Homebrew 4.0.0", 'stderr': ""})
+    assert Brew.get_homebrew_version()["stdout"] == "Homebrew 4.0.0"
+    assert calls == [["brew", "--version"]]
+
+def test_brew_version_read_from_disk(tmp_path, monkeypatch):
+    repository = make_homebrew_repository(tmp_path, "a" * 40, {"4.4.24": "a" * 40})
+    monkeypatch.setenv("HOMEBREW_REPOSITORY", repository)
+    monkeypatch.setattr("components.utils.subproc.Subproc.run_version_command",
+                        fail_if_run)
+    assert Brew.get_homebrew_version()["stdout"] == "Homebrew 4.4.24"
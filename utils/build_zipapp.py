@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Copyright (c) 2025 Pointmatic, (https://www.pointmatic.com)
+
+This source code is licensed under the Mozilla Public License Version 2.0 found in the
+LICENSE file in the root directory of this source tree.
+
+============================================================================================================================================================================================
+
+This is the utils.build_zipapp module that packages the CLI as a single-file zipapp: dist/beezeebot_cli.pyz.
+
+The archive holds precompiled .pyc files only, so every start skips compiling the sources and writing __pycache__
+directories. The bytecode is tied to the interpreter that built it, so the shebang names that interpreter's version
+(e.g. python3.11) and the archive must be run with the same version.
+
+Usage:
+    python utils/build_zipapp.py [--output dist/beezeebot_cli.pyz] [--optimize 2] [--keep-sources]
+"""
+
+import argparse
+import compileall
+import os
+import shutil
+import sys
+import tempfile
+import zipapp
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGES = ["components"]
+
+MAIN = """from beezeebot_cli import parse_command_line_args
+
+parse_command_line_args()
+"""
+
+def stage(staging_dir):
+    """Copies the CLI module and its packages into the staging directory and writes the archive's __main__.py."""
+    shutil.copy2(os.path.join(PROJECT_ROOT, "beezeebot_cli.py"), staging_dir)
+    for package in PACKAGES:
+        shutil.copytree(os.path.join(PROJECT_ROOT, package), os.path.join(staging_dir, package),
+                        ignore=shutil.ignore_patterns("__pycache__", "*.pyc"))
+    with open(os.path.join(staging_dir, "__main__.py"), "w", encoding="utf-8") as f:
+        f.write(MAIN)
+
+def compile_sources(staging_dir, optimize, keep_sources):
+    """
+    Compiles every module to a legacy .pyc file next to its source (the layout zipimport can load) and, unless
+    keep_sources is set, removes the sources. __main__.py always stays, since zipapp requires it.
+
+    Raises:
+        RuntimeError: if a module does not compile.
+    """
+    if not compileall.compile_dir(staging_dir, quiet=1, legacy=True, optimize=optimize):
+        raise RuntimeError("Compilation failed.")
+    if keep_sources:
+        return
+    for directory, _, files in os.walk(staging_dir):
+        for name in files:
+            path = os.path.join(directory, name)
+            if name.endswith(".py") and path != os.path.join(staging_dir, "__main__.py"):
+                os.remove(path)
+
+def build(output, optimize=2, keep_sources=False):
+    """Builds the zipapp and returns its path."""
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    interpreter = f"/usr/bin/env python{sys.version_info.major}.{sys.version_info.minor}"
+    with tempfile.TemporaryDirectory() as staging_dir:
+        stage(staging_dir)
+        compile_sources(staging_dir, optimize, keep_sources)
+        zipapp.create_archive(staging_dir, output, interpreter=interpreter, compressed=False)
+    return output
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the beezeebot CLI as a single-file zipapp.")
+    parser.add_argument('--output', default=os.path.join(PROJECT_ROOT, "dist", "beezeebot_cli.pyz"), help="The archive to write (default: dist/beezeebot_cli.pyz).")
+    parser.add_argument('--optimize', type=int, choices=[0, 1, 2], default=2, help="Bytecode optimization level (default: 2, which drops asserts and docstrings).")
+    parser.add_argument('--keep-sources', action='store_true', help="Keep the .py sources next to the bytecode (for readable tracebacks).")
+    args = parser.parse_args()
+    print(f"Built {build(args.output, args.optimize, args.keep_sources)}")
+
+if __name__ == '__main__':
+    main()